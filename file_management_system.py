@@ -1,10 +1,925 @@
 import os
+import bisect
+import ctypes
+import ctypes.util
+import errno
+import glob
+import hashlib
+import itertools
+import json
 import shutil
-from tkinter import Tk, filedialog, StringVar, Frame, Button, Label, Entry, Listbox, END, DISABLED, NORMAL
+import queue
+import struct
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from tkinter import Tk, filedialog, StringVar, Frame, Button, Label, Entry, Listbox, Scrollbar, END, DISABLED, NORMAL
+from tkinter.messagebox import askyesno
 from tkinter.ttk import Treeview
 from pathlib import Path
 from datetime import datetime
 
+PAGE_SIZE = 500  # Tree rows inserted per page of a directory listing
+INDEX_PATH = os.path.join(Path.home(), ".file_management_index.sqlite3")
+RESCAN_INTERVAL = 60  # Seconds between incremental index rescans
+SEARCH_LIMIT = 1000  # Maximum number of search results shown
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Threads used for bulk file operations
+ITEM_LOG_LIMIT = 20  # Batches up to this size log every item, larger ones log a summary
+COPY_CHUNK = 64 * 1024 * 1024  # Bytes handed to a single zero-copy system call
+TRANSFER_STATE_DIR = os.path.join(Path.home(), ".file_management_transfers")  # One resume state file per job
+HASH_BLOCK = 64 * 1024  # Bytes hashed at each end of a file in the quick duplicate check
+JOURNAL_PATH = os.path.join(Path.home(), ".file_management_journal.jsonl")
+JOURNAL_MAX_BYTES = 8 * 1024 * 1024  # Size at which the journal is rotated
+JOURNAL_BACKUPS = 50  # Rotated journal files kept next to the current one
+LOG_PAGE_SIZE = 200  # Journal entries shown per page in the log panel
+POLL_INTERVAL = 1.0  # Seconds between checks of the polling directory watcher
+
+
+class DirectoryLister:
+    def __init__(self, on_page, page_size=PAGE_SIZE):
+        """
+        Read directory entries page by page on a background thread.
+        :param on_page: Called from the worker as on_page(generation, node, entries, has_more, error).
+        :param page_size: Maximum number of entries per page.
+        """
+        self.on_page = on_page
+        self.page_size = page_size
+        self.generation = 0
+        self.requests = queue.Queue()
+        self.iterators = {}  # Open os.scandir iterators keyed by tree node, only touched by the worker
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    def request_page(self, node, path):
+        """Queue the next page of entries of path for a tree node."""
+        self.requests.put((self.generation, node, path))
+
+    def reset(self):
+        """Discard every open listing, e.g. after the root directory changed."""
+        self.generation += 1
+        self.requests.put((self.generation, None, None))
+
+    def run(self):
+        """Worker loop serving page requests in order."""
+        while True:
+            generation, node, path = self.requests.get()
+            if node is None:
+                for iterator in self.iterators.values():
+                    iterator.close()
+                self.iterators.clear()
+                continue
+            if generation != self.generation:
+                continue
+            self.read_page(generation, node, path)
+
+    def read_page(self, generation, node, path):
+        """Read up to page_size entries, keeping the iterator open for the next page."""
+        iterator = self.iterators.get(node)
+        entries = []
+        try:
+            if iterator is None:
+                iterator = self.iterators[node] = os.scandir(path)
+            for entry in iterator:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((entry.name, entry.path, is_dir))
+                if len(entries) >= self.page_size:
+                    break
+        except OSError as e:
+            self.close(node)
+            self.on_page(generation, node, entries, False, e)
+            return
+        has_more = len(entries) >= self.page_size
+        if not has_more:
+            self.close(node)
+        self.on_page(generation, node, entries, has_more, None)
+
+    def close(self, node):
+        """Close the scandir iterator of a node, if any."""
+        iterator = self.iterators.pop(node, None)
+        if iterator is not None:
+            iterator.close()
+
+
+def scan_subtree(index_path, top, recursive=True):
+    """
+    Walk a folder for the file index, re-listing only folders whose mtime changed since the last scan.
+    The entries of unchanged folders are re-stat'ed, since a file rewritten in place leaves its folder's mtime alone.
+    Runs in a worker process, so it opens its own read-only connection to the index.
+    :return: (visited folders, [(folder, mtime, entries)] for changed folders,
+        [(size, mtime, path)] for entries of unchanged folders whose size or mtime changed, folders left to visit)
+    """
+    connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    visited, changed, updated, stack = [], [], [], [top]
+    try:
+        while stack:
+            folder = stack.pop()
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                continue
+            visited.append(folder)
+            row = connection.execute("SELECT mtime FROM folders WHERE path = ?", (folder,)).fetchone()
+            if row and row[0] == mtime:
+                subfolders = []
+                for path, size, file_mtime, is_dir in connection.execute(
+                        "SELECT path, size, mtime, is_dir FROM files WHERE parent = ?", (folder,)):
+                    if is_dir:
+                        subfolders.append(path)
+                    try:
+                        stat = os.lstat(path)
+                    except OSError:
+                        continue  # Removed, which changes the folder's mtime; the next scan re-lists it
+                    if (stat.st_size, stat.st_mtime) != (size, file_mtime):
+                        updated.append((stat.st_size, stat.st_mtime, path))
+            else:
+                entries, subfolders = [], []
+                try:
+                    with os.scandir(folder) as iterator:
+                        for entry in iterator:
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False)
+                                stat = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            entries.append((entry.path, folder, entry.name, stat.st_size, stat.st_mtime, is_dir))
+                            if is_dir:
+                                subfolders.append(entry.path)
+                except OSError:
+                    continue
+                changed.append((folder, mtime, entries))
+            if recursive:
+                stack.extend(subfolders)
+            elif folder == top:
+                return visited, changed, updated, subfolders
+    finally:
+        connection.close()
+    return visited, changed, updated, []
+
+
+class InotifyWatcher:
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ONLYDIR = 0x1000000
+    IN_ISDIR = 0x40000000
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, on_change):
+        """
+        Report changes in watched folders using Linux inotify.
+        :param on_change: Called from the watcher thread as on_change(kind, path, new_path, is_dir) with kind
+            "add", "remove", "rename" or "reset" (events were lost and the view should be rebuilt).
+        """
+        self.on_change = on_change
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.lock = threading.Lock()
+        self.folders = {}  # watch descriptor -> folder
+        self.descriptors = {}  # folder -> watch descriptor
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def watch(self, folder):
+        mask = self.IN_CREATE | self.IN_DELETE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_ONLYDIR
+        with self.lock:
+            if folder in self.descriptors:
+                return
+            descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), mask)
+            if descriptor >= 0:
+                self.folders[descriptor] = folder
+                self.descriptors[folder] = descriptor
+
+    def unwatch(self, folder):
+        with self.lock:
+            descriptor = self.descriptors.pop(folder, None)
+            if descriptor is not None:
+                self.folders.pop(descriptor, None)
+                self.libc.inotify_rm_watch(self.fd, descriptor)
+
+    def clear(self):
+        for folder in list(self.descriptors):
+            self.unwatch(folder)
+
+    def run(self):
+        """Read events, pairing IN_MOVED_FROM/IN_MOVED_TO by cookie into renames."""
+        while True:
+            data = os.read(self.fd, 64 * 1024)
+            moved = {}  # cookie -> (path, is_dir) of moves without their second half yet
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, cookie, length = self.EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0"))
+                offset += self.EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    self.on_change("reset", None, None, False)
+                    continue
+                with self.lock:
+                    folder = self.folders.get(descriptor)
+                    if mask & self.IN_IGNORED:
+                        self.folders.pop(descriptor, None)
+                        self.descriptors.pop(folder, None)
+                if folder is None or mask & self.IN_IGNORED:
+                    continue
+                path, is_dir = os.path.join(folder, name), bool(mask & self.IN_ISDIR)
+                if mask & self.IN_MOVED_FROM:
+                    moved[cookie] = path
+                elif mask & self.IN_MOVED_TO and cookie in moved:
+                    self.on_change("rename", moved.pop(cookie), path, is_dir)
+                elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.on_change("add", path, None, is_dir)
+                elif mask & self.IN_DELETE:
+                    self.on_change("remove", path, None, is_dir)
+            for path in moved.values():
+                self.on_change("remove", path, None, False)
+
+
+class PollingWatcher:
+    def __init__(self, on_change, interval=POLL_INTERVAL):
+        """
+        Portable fallback for InotifyWatcher: re-list a watched folder when its mtime changes and diff
+        the entries, matching removed and added names by inode to detect renames.
+        """
+        self.on_change = on_change
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.snapshots = {}  # folder -> (mtime, {name: (inode, is_dir)})
+        threading.Thread(target=self.run, daemon=True).start()
+
+    @staticmethod
+    def snapshot(folder):
+        mtime = os.stat(folder).st_mtime_ns
+        entries = {}
+        with os.scandir(folder) as iterator:
+            for entry in iterator:
+                try:
+                    entries[entry.name] = (entry.inode(), entry.is_dir(follow_symlinks=False))
+                except OSError:
+                    continue
+        return mtime, entries
+
+    def watch(self, folder):
+        try:
+            snapshot = self.snapshot(folder)
+        except OSError:
+            return
+        with self.lock:
+            self.snapshots.setdefault(folder, snapshot)
+
+    def unwatch(self, folder):
+        with self.lock:
+            self.snapshots.pop(folder, None)
+
+    def clear(self):
+        with self.lock:
+            self.snapshots.clear()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                folders = list(self.snapshots.items())
+            for folder, (mtime, old) in folders:
+                try:
+                    if os.stat(folder).st_mtime_ns == mtime:
+                        continue
+                    new_mtime, new = self.snapshot(folder)
+                except OSError:
+                    self.unwatch(folder)
+                    continue
+                with self.lock:
+                    if folder not in self.snapshots:
+                        continue
+                    self.snapshots[folder] = (new_mtime, new)
+                self.diff(folder, old, new)
+
+    def diff(self, folder, old, new):
+        removed = {old[name][0]: name for name in old.keys() - new.keys()}
+        for name in new.keys() - old.keys():
+            inode, is_dir = new[name]
+            if inode in removed:
+                self.on_change("rename", os.path.join(folder, removed.pop(inode)), os.path.join(folder, name), is_dir)
+            else:
+                self.on_change("add", os.path.join(folder, name), None, is_dir)
+        for name in removed.values():
+            self.on_change("remove", os.path.join(folder, name), None, old[name][1])
+
+
+def format_size(size):
+    """Format a byte count for display, e.g. 1.5 GB."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+class DiskUsageScanner:
+    def __init__(self, max_workers=MAX_WORKERS):
+        """
+        Compute recursive folder sizes with parallel os.scandir calls.
+        Listings are cached by (device, inode) and reused while the folder's mtime is unchanged,
+        so repeated scans only re-list folders whose entries changed. File sizes are never cached:
+        a file growing in place does not change its folder's mtime, so cached files are stat'ed again.
+        """
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.cache = {}  # (device, inode) -> (mtime_ns, file paths, subfolders)
+
+    def list_folder(self, folder):
+        """Return (bytes of the files directly in folder, subfolders, whether the cached listing was used)."""
+        stat = os.stat(folder)
+        key = (stat.st_dev, stat.st_ino)
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns:
+            size = 0
+            for path in cached[1]:
+                try:
+                    size += os.lstat(path).st_size
+                except OSError:
+                    continue
+            return size, cached[2], True
+        size, files, subfolders = 0, [], []
+        with os.scandir(folder) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    else:
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files.append(entry.path)
+                except OSError:
+                    continue
+        self.cache[key] = (stat.st_mtime_ns, files, subfolders)
+        return size, subfolders, False
+
+    def scan(self, root, on_result, cancelled=lambda: False):
+        """
+        Compute the recursive size of every subfolder of root, listing folders on the thread pool.
+        :param on_result: Called as on_result(subfolder, size, folders re-listed) as soon as a subfolder is done.
+        :return: Bytes of the files directly in root.
+        """
+        root_size, tops, _ = self.list_folder(root)
+        totals = dict.fromkeys(tops, 0)
+        pending = dict.fromkeys(tops, 1)
+        relisted = dict.fromkeys(tops, 0)
+        futures = {self.pool.submit(self.list_folder, top): (top, top) for top in tops}
+        while futures and not cancelled():
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder, top = futures.pop(future)
+                pending[top] -= 1
+                try:
+                    size, subfolders, cached = future.result()
+                except OSError:
+                    size, subfolders, cached = 0, [], True
+                totals[top] += size
+                relisted[top] += not cached
+                for subfolder in subfolders:
+                    pending[top] += 1
+                    futures[self.pool.submit(self.list_folder, subfolder)] = (subfolder, top)
+                if not pending[top]:
+                    on_result(top, totals[top], relisted[top])
+        return root_size
+
+
+def create_watcher(on_change):
+    """Return an InotifyWatcher where inotify is available, a PollingWatcher otherwise."""
+    try:
+        return InotifyWatcher(on_change)
+    except (OSError, AttributeError, TypeError):
+        return PollingWatcher(on_change)
+
+
+class FileIndex:
+    def __init__(self, index_path=INDEX_PATH, on_status=None):
+        """
+        Persistent SQLite index of names, sizes, mtimes and types below a root folder.
+        :param index_path: Location of the index database.
+        :param on_status: Optional callback receiving status messages from the indexing thread.
+        """
+        self.index_path = index_path
+        self.on_status = on_status
+        self.root = None
+        self.wake = threading.Event()
+        self.thread = None
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, parent TEXT, name TEXT, size INTEGER, mtime REAL, is_dir INTEGER)""")
+            connection.execute("CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, mtime INTEGER)")
+            connection.execute("CREATE INDEX IF NOT EXISTS files_parent ON files (parent)")
+            connection.execute("CREATE INDEX IF NOT EXISTS files_name ON files (name)")
+            connection.execute("CREATE INDEX IF NOT EXISTS files_name_lower ON files (lower(name))")
+            self.trigrams = self.create_trigram_index(connection)
+
+    @staticmethod
+    def create_trigram_index(connection):
+        """
+        Keep an FTS5 trigram index of the names in sync with the files table, so substring searches are
+        index lookups instead of table scans.
+        :return: False if this SQLite has no FTS5 trigram tokenizer.
+        """
+        exists = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'names_fts'").fetchone()
+        try:
+            connection.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS names_fts
+                USING fts5(name, content='files', content_rowid='rowid', tokenize='trigram')""")
+        except sqlite3.OperationalError:
+            return False
+        connection.execute("""CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+            INSERT INTO names_fts (rowid, name) VALUES (new.rowid, new.name); END""")
+        connection.execute("""CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+            INSERT INTO names_fts (names_fts, rowid, name) VALUES ('delete', old.rowid, old.name); END""")
+        connection.execute("""CREATE TRIGGER IF NOT EXISTS files_fts_update AFTER UPDATE ON files BEGIN
+            INSERT INTO names_fts (names_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+            INSERT INTO names_fts (rowid, name) VALUES (new.rowid, new.name); END""")
+        if not exists:
+            connection.execute("INSERT INTO names_fts (names_fts) VALUES ('rebuild')")
+        return True
+
+    def connect(self):
+        """Open a new connection; each thread uses its own."""
+        connection = sqlite3.connect(self.index_path, timeout=30)
+        connection.execute("PRAGMA recursive_triggers = ON")  # INSERT OR REPLACE fires the delete trigger
+        return connection
+
+    def start(self, root):
+        """Index root in the background and keep it up to date with periodic rescans."""
+        self.root = os.path.abspath(root)
+        self.wake.set()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop rescanning until start() is called again."""
+        self.root = None
+
+    def run(self):
+        """Background loop: rescan whenever woken up or after RESCAN_INTERVAL seconds."""
+        while True:
+            self.wake.wait(RESCAN_INTERVAL)
+            self.wake.clear()
+            root = self.root
+            if root:
+                try:
+                    self.rescan(root)
+                except (OSError, sqlite3.Error) as e:
+                    self.status(f"Indexing failed: {e}")
+
+    def status(self, message):
+        if self.on_status:
+            self.on_status(message)
+
+    def rescan(self, root):
+        """Incrementally rescan root, walking its top-level folders in parallel worker processes."""
+        started = time.perf_counter()
+        visited, changed, updated, subfolders = scan_subtree(self.index_path, root, recursive=False)
+        if subfolders:
+            with ProcessPoolExecutor() as pool:
+                for sub_visited, sub_changed, sub_updated, _ in pool.map(
+                        scan_subtree, [self.index_path] * len(subfolders), subfolders):
+                    visited.extend(sub_visited)
+                    changed.extend(sub_changed)
+                    updated.extend(sub_updated)
+        with self.connect() as connection:
+            low, high = self.path_range(root)
+            known = {path for (path,) in connection.execute(
+                "SELECT path FROM folders WHERE path = ? OR path BETWEEN ? AND ?", (root, low, high))}
+            removed = known.difference(visited)
+            for folder in removed:
+                connection.execute("DELETE FROM folders WHERE path = ?", (folder,))
+                connection.execute("DELETE FROM files WHERE parent = ?", (folder,))
+            for folder, mtime, entries in changed:
+                connection.execute("DELETE FROM files WHERE parent = ?", (folder,))
+                connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", entries)
+                connection.execute("INSERT OR REPLACE INTO folders VALUES (?, ?)", (folder, mtime))
+            connection.executemany("UPDATE files SET size = ?, mtime = ? WHERE path = ?", updated)
+        if changed or removed or updated:
+            self.status(f"Index updated: {len(changed)} folders rescanned, {len(updated)} files changed, "
+                        f"{len(removed)} removed in {time.perf_counter() - started:.1f}s")
+
+    @staticmethod
+    def path_range(root):
+        """Return the primary key range covering every path below root."""
+        prefix = os.path.join(root, "")
+        return prefix, prefix + "\U0010ffff"
+
+    def search(self, root, query, limit=SEARCH_LIMIT):
+        """
+        Search indexed names below root. Queries containing *, ? or [ are glob patterns, queries of three or
+        more characters are case-insensitive substring matches through the trigram index, and shorter ones
+        match the start of names through the name index.
+        :return: List of (path, size, mtime, is_dir) tuples.
+        """
+        low, high = self.path_range(os.path.abspath(root))
+        with self.connect() as connection:
+            if any(char in query for char in "*?["):
+                condition, parameters = "name GLOB ?", (query,)
+            elif len(query) >= 3 and self.trigrams:
+                return connection.execute(
+                    """SELECT files.path, files.size, files.mtime, files.is_dir FROM names_fts
+                    JOIN files ON files.rowid = names_fts.rowid
+                    WHERE names_fts MATCH ? AND files.path BETWEEN ? AND ? LIMIT ?""",
+                    ('"' + query.replace('"', '""') + '"', low, high, limit)).fetchall()
+            elif len(query) >= 3:
+                escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                condition, parameters = "name LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+            else:
+                condition, parameters = "lower(name) BETWEEN ? AND ?", (query.lower(), query.lower() + "\U0010ffff")
+            return connection.execute(
+                f"SELECT path, size, mtime, is_dir FROM files WHERE {condition} AND path BETWEEN ? AND ? LIMIT ?",
+                (*parameters, low, high, limit)).fetchall()
+
+
+def zero_copy(src_fd, dst_fd, offset, size):
+    """
+    Copy bytes [offset, size) between file descriptors with copy_file_range, falling back to sendfile.
+    :return: Offset reached; lower than size if neither system call is usable.
+    """
+    use_copy_range = hasattr(os, "copy_file_range")
+    use_sendfile = hasattr(os, "sendfile")
+    while offset < size and (use_copy_range or use_sendfile):
+        count = min(COPY_CHUNK, size - offset)
+        try:
+            if use_copy_range:
+                sent = os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+            else:
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                sent = os.sendfile(dst_fd, src_fd, offset, count)
+        except OSError:
+            # Unsupported for this pair of files (e.g. across filesystems); try the next method
+            if use_copy_range:
+                use_copy_range = False
+            else:
+                use_sendfile = False
+            continue
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def copy_file(src, dst, resume=False):
+    """
+    Copy a file's data and metadata, using kernel zero-copy where possible.
+    :param resume: Skip destinations that are already complete and continue partial ones.
+    :return: Number of bytes copied.
+    """
+    src_stat = os.stat(src)
+    offset = 0
+    if resume and os.path.exists(dst):
+        dst_stat = os.stat(dst)
+        if dst_stat.st_size == src_stat.st_size and int(dst_stat.st_mtime) == int(src_stat.st_mtime):
+            return 0
+        if dst_stat.st_size < src_stat.st_size:
+            offset = dst_stat.st_size
+    start = offset
+    with open(src, "rb") as fsrc, open(dst, "r+b" if offset else "wb") as fdst:
+        offset = zero_copy(fsrc.fileno(), fdst.fileno(), offset, src_stat.st_size)
+        if offset < src_stat.st_size:
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    shutil.copystat(src, dst)
+    return src_stat.st_size - start
+
+
+def hash_file(path, partial=False):
+    """
+    Hash a file in streaming chunks. Runs in a worker process.
+    :param partial: Only hash the first and last HASH_BLOCK bytes.
+    :return: (path, hex digest), digest is None if the file could not be read.
+    """
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            if partial:
+                digest.update(f.read(HASH_BLOCK))
+                size = os.fstat(f.fileno()).st_size
+                if size > HASH_BLOCK:
+                    f.seek(max(HASH_BLOCK, size - HASH_BLOCK))
+                    digest.update(f.read(HASH_BLOCK))
+            else:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+    except OSError:
+        return path, None
+    return path, digest.hexdigest()
+
+
+def find_duplicates(root, on_status=None):
+    """
+    Find files with identical content below root in stages: group by size, then by a hash of the
+    first and last blocks, and only fully hash files that still collide. Empty files are not reported.
+    :return: List of (size, [paths]) groups, largest wasted space first.
+    """
+    def status(message):
+        if on_status:
+            on_status(message)
+
+    def regroup(groups, partial):
+        """Split (size -> paths) groups by content hash, computed in a process pool."""
+        sizes = {path: size for size, paths in groups.items() for path in paths}
+        hashed = {}
+        if sizes:
+            with ProcessPoolExecutor() as pool:
+                for path, digest in pool.map(hash_file, sizes, [partial] * len(sizes), chunksize=64):
+                    if digest is not None:
+                        hashed.setdefault((sizes[path], digest), []).append(path)
+        return {key: paths for key, paths in hashed.items() if len(paths) > 1}
+
+    by_size = {}
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            by_size.setdefault(entry.stat(follow_symlinks=False).st_size, []).append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    candidates = {size: paths for size, paths in by_size.items() if len(paths) > 1}
+    status(f"Duplicate scan: {sum(len(paths) for paths in candidates.values())} files share a size")
+
+    candidates.pop(0, None)  # Empty files all match each other but waste no space
+    quick = regroup(candidates, partial=True)
+    status(f"Duplicate scan: {sum(len(paths) for paths in quick.values())} files match on first and last blocks")
+    # Files of up to two blocks were hashed completely by the quick pass
+    groups = [(size, paths) for (size, _), paths in quick.items() if size <= 2 * HASH_BLOCK]
+    large = {}
+    for (size, _), paths in quick.items():
+        if size > 2 * HASH_BLOCK:
+            large.setdefault(size, []).extend(paths)
+    groups.extend((size, paths) for (size, _), paths in regroup(large, partial=False).items())
+    groups = [(size, sorted(paths)) for size, paths in groups]
+    groups.sort(key=lambda group: group[0] * (len(group[1]) - 1), reverse=True)
+    return groups
+
+
+class TransferStats:
+    def __init__(self):
+        """Thread-safe byte and file counters for throughput reporting."""
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.bytes = 0
+        self.files = 0
+
+    def add(self, nbytes):
+        with self.lock:
+            self.bytes += nbytes
+            self.files += 1
+
+    def summary(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        megabytes = self.bytes / (1024 * 1024)
+        return (f"{self.files} files, {megabytes:.1f} MB in {elapsed:.1f}s "
+                f"({megabytes / elapsed:.1f} MB/s, {self.files / elapsed:.1f} files/s)")
+
+
+class OperationJournal:
+    def __init__(self, path=JOURNAL_PATH, max_bytes=JOURNAL_MAX_BYTES, backups=JOURNAL_BACKUPS):
+        """
+        Append-only JSONL journal of log messages and file operations with size-based rotation.
+        Entries are buffered and written by a background thread, which also runs reads queued with query(),
+        so reads see every entry recorded before them without the caller waiting for the disk.
+        :param path: Current journal file; rotated files get the suffixes .1 (newest) to .<backups>.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()  # Held while writing or rotating, so readers see whole files
+        self.line_counts = {}  # (path, mtime, size) -> number of entries of a rotated file
+        self.ids = itertools.count()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def record(self, **entry):
+        """Queue an entry; a time and a unique id are added. Returns the id."""
+        entry.setdefault("time", datetime.now().isoformat(timespec="milliseconds"))
+        entry["id"] = f"{time.time_ns()}-{next(self.ids)}"
+        self.pending.put(entry)
+        return entry["id"]
+
+    def query(self, read, on_result):
+        """
+        Run read() on the writer thread once the entries recorded before have been written, and pass its
+        result, or the OSError or ValueError it raised, to on_result on that thread.
+        """
+        self.pending.put((read, on_result))
+
+    def run(self):
+        """Writer loop: write whatever is queued in one go, running queued reads in order."""
+        while True:
+            items = [self.pending.get()]
+            try:
+                while len(items) < 10000:
+                    items.append(self.pending.get_nowait())
+            except queue.Empty:
+                pass
+            entries = []
+            for item in items:
+                if isinstance(item, dict):
+                    entries.append(item)
+                    continue
+                self.write(entries)
+                entries = []
+                read, on_result = item
+                try:
+                    result = read()
+                except (OSError, ValueError) as e:
+                    result = e
+                on_result(result)
+            self.write(entries)
+
+    def write(self, entries):
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, default=str) + "\n" for entry in entries).encode()
+        try:
+            with self.lock:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                    self.rotate()
+                with open(self.path, "ab") as f:
+                    f.write(data)
+        except OSError:
+            pass  # Never let journal trouble take the file manager down
+
+    def rotate(self):
+        for number in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{number}"):
+                os.replace(f"{self.path}.{number}", f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def files(self):
+        """Journal files from newest to oldest."""
+        paths = [self.path] + [f"{self.path}.{number}" for number in range(1, self.backups + 1)]
+        return [path for path in paths if os.path.exists(path)]
+
+    def read_lines(self, path):
+        with open(path, "rb") as f:
+            return f.read().splitlines()
+
+    def count_lines(self, path):
+        """Number of entries in a journal file, cached for rotated files since they never change."""
+        if path == self.path:
+            return len(self.read_lines(path))
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in self.line_counts:
+            self.line_counts[key] = len(self.read_lines(path))
+        return self.line_counts[key]
+
+    def read_page(self, page, page_size=LOG_PAGE_SIZE):
+        """
+        Return one page of entries, oldest first. Page 0 holds the newest entries.
+        Only the journal files overlapping the page are read. Run it through query().
+        """
+        skip, wanted, lines = page * page_size, page_size, []
+        with self.lock:
+            for path in self.files():
+                count = self.count_lines(path)
+                if skip >= count:
+                    skip -= count
+                    continue
+                file_lines = self.read_lines(path)
+                end = len(file_lines) - skip
+                start = max(0, end - wanted)
+                lines = file_lines[start:end] + lines
+                wanted -= end - start
+                skip = 0
+                if not wanted:
+                    break
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def entries(self):
+        """Iterate over every entry, newest first. Run it through query()."""
+        for path in self.files():
+            with self.lock:
+                lines = self.read_lines(path) if os.path.exists(path) else []
+            for line in reversed(lines):
+                if line.strip():
+                    yield json.loads(line)
+
+    def last_operations(self, count):
+        """Return the newest count successful operations that have not been undone yet, newest first."""
+        undone, operations = set(), []
+        for entry in self.entries():
+            if entry.get("undoes"):
+                undone.add(entry["undoes"])
+            elif entry.get("operation") and entry.get("ok") and entry["id"] not in undone:
+                operations.append(entry)
+                if len(operations) == count:
+                    break
+        return operations
+
+
+class Batch:
+    def __init__(self, description, items, action, done_message, stats=None, operation=None):
+        """
+        A bulk operation applying action to every item.
+        :param items: Iterable of items, or a callable returning one; it is consumed on the queue's thread.
+        :param action: Function called with each item; raising marks the item as failed.
+        :param done_message: Log message prefix for a successful item.
+        :param stats: Optional TransferStats filled by the action.
+        :param operation: Name under which items are journaled, e.g. "rename_file"; None to skip the journal.
+        """
+        self.description = description
+        self.items = items
+        self.action = action
+        self.done_message = done_message
+        self.stats = stats
+        self.operation = operation
+        self.cancelled = threading.Event()
+        self.results = []  # (item, error or None, duration in ms) in completion order
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def failures(self):
+        return [(item, error) for item, error, _ in self.results if error is not None]
+
+
+class BatchOperationQueue:
+    def __init__(self, on_progress, on_done, max_workers=MAX_WORKERS):
+        """
+        Run batches one after another, spreading the items of each batch over a bounded thread pool.
+        :param on_progress: Called from a worker as on_progress(batch, done, total).
+        :param on_done: Called from a worker as on_done(batch) once every item has a result.
+        """
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.batches = queue.Queue()
+        self.pending = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, description, items, action, done_message, stats=None, operation=None):
+        """Queue a new batch and return it."""
+        batch = Batch(description, items, action, done_message, stats, operation)
+        with self.lock:
+            self.pending.append(batch)
+        self.batches.put(batch)
+        return batch
+
+    def cancel(self):
+        """Cancel the running batch and every queued one."""
+        with self.lock:
+            for batch in self.pending:
+                batch.cancel()
+
+    def run(self):
+        while True:
+            batch = self.batches.get()
+            try:
+                self.execute(batch)
+            except Exception as e:  # A failing batch must not stop the worker, or every later batch would hang
+                batch.results.append((batch.description, e, 0.0))
+            finally:
+                with self.lock:
+                    self.pending.remove(batch)
+                self.on_done(batch)
+
+    def execute(self, batch):
+        """Run every item of a batch in parallel, reporting progress as results come in."""
+        try:
+            items = list(batch.items() if callable(batch.items) else batch.items)
+        except Exception as e:
+            batch.results.append((batch.description, e, 0.0))
+            return
+        total = len(items)
+        step = max(1, total // 100)
+        futures = {self.pool.submit(self.run_item, batch, item): item for item in items}
+        for done, future in enumerate(as_completed(futures), 1):
+            batch.results.append((futures[future], *future.result()))
+            if done % step == 0 or done == total:
+                self.on_progress(batch, done, total)
+
+    @staticmethod
+    def run_item(batch, item):
+        """Apply the batch action to one item and return (error or None, duration in ms)."""
+        if batch.cancelled.is_set():
+            return "cancelled", 0.0
+        started = time.perf_counter()
+        try:
+            batch.action(item)
+        except Exception as e:
+            return e, (time.perf_counter() - started) * 1000
+        return None, (time.perf_counter() - started) * 1000
+
+
 class FileManagementSystemGUI:
     def __init__(self, master):
         """
@@ -31,6 +946,16 @@ class FileManagementSystemGUI:
 
         Button(path_frame, text="Logs", command=self.show_logs).pack(side="left")
 
+        Label(path_frame, text="Search:").pack(side="left", padx=(15, 0))
+        self.search_entry = Entry(path_frame, width=25)
+        self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<Return>", lambda event: self.search_files())
+        Button(path_frame, text="Go", command=self.search_files).pack(side="left")
+
+        # Background index used by the search box
+        self.file_index = FileIndex(on_status=lambda message: self.call_in_ui(self.log, message))
+        self.search_generation = 0
+
         # File/Folder Actions Frame
         self.actions_frame = Frame(master)
         self.actions_frame.pack(fill="x", pady=10)
@@ -47,15 +972,54 @@ class FileManagementSystemGUI:
         self.delete_file_button.pack(side="left", padx=5)
         self.rename_file_button = Button(self.actions_frame, text="Rename File", command=self.select_command(self.rename_file), state=DISABLED)
         self.rename_file_button.pack(side="left", padx=5)
+        self.copy_button = Button(self.actions_frame, text="Copy", command=self.select_command(self.copy_items), state=DISABLED)
+        self.copy_button.pack(side="left", padx=5)
+        self.move_button = Button(self.actions_frame, text="Move", command=self.select_command(self.move_items), state=DISABLED)
+        self.move_button.pack(side="left", padx=5)
+        self.resume_button = Button(self.actions_frame, text="Resume Transfer", command=self.resume_transfer, state=DISABLED)
+        self.resume_button.pack(side="left", padx=5)
+        self.find_duplicates_button = Button(self.actions_frame, text="Find Duplicates", command=self.find_duplicates, state=DISABLED)
+        self.find_duplicates_button.pack(side="left", padx=5)
+        self.delete_duplicates_button = Button(self.actions_frame, text="Delete Duplicates", command=self.delete_duplicates, state=DISABLED)
+        self.delete_duplicates_button.pack(side="left", padx=5)
+        self.duplicate_groups = []
+        self.sizes_button = Button(self.actions_frame, text="Sizes", command=self.toggle_sizes, state=DISABLED)
+        self.sizes_button.pack(side="left", padx=5)
+        self.disk_usage = DiskUsageScanner()
+        self.sizes_mode = False
+        self.size_rows = []  # (-size, path) of the rows shown in sizes mode, in display order
 
         self.reset_command_button = Button(self.actions_frame, text="X", command=self.reset_command, state=DISABLED, fg="red")
         self.reset_command_button.pack(side="left", padx=5)
 
-        # Treeview for directory structure
-        self.tree = Treeview(master)
+        # Progress of bulk operations
+        self.progress_label = Label(self.actions_frame, text="", fg="gray")
+        self.progress_label.pack(side="left", padx=5)
+        self.cancel_button = Button(self.actions_frame, text="Cancel", command=self.cancel_operations, state=DISABLED)
+        self.cancel_button.pack(side="left")
+        self.batch_queue = BatchOperationQueue(
+            on_progress=lambda batch, done, total: self.call_in_ui(self.show_progress, batch, done, total),
+            on_done=lambda batch: self.call_in_ui(self.finish_batch, batch))
+
+        # Treeview for directory structure, filled lazily by a background lister
+        self.ui_queue = queue.Queue()
+        self.lister = DirectoryLister(lambda *page: self.call_in_ui(self.insert_page, *page))
+        self.loading_nodes = set()
+        self.watcher = create_watcher(lambda *change: self.call_in_ui(self.apply_change, *change))
+
+        self.tree_frame = Frame(master)
+        self.tree_frame.pack(fill="both", expand=True)
+        self.tree_scrollbar = Scrollbar(self.tree_frame, orient="vertical")
+        self.tree = Treeview(self.tree_frame, columns=("path", "size"), displaycolumns=(), yscrollcommand=self.on_tree_scroll)
+        self.tree_scrollbar.config(command=self.tree.yview)
+        self.tree_scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
 
         self.tree.heading("#0", text="Directory Structure", anchor="w")
+        self.tree.heading("size", text="Size", anchor="e")
+        self.tree.column("size", width=120, stretch=False, anchor="e")
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         self.populate_tree()
 
         # Input Panel below the Treeview
@@ -72,20 +1036,190 @@ class FileManagementSystemGUI:
         self.active_command = None
         self.using_double_input = False
 
-        # Log Panel
+        # Log Panel, paging through the on-disk journal
+        self.journal = OperationJournal()
+        self.log_page = 0
         self.log_frame = Frame(master)
         self.log_listbox = Listbox(self.log_frame, height=15)
-        Button(self.log_frame, text="Back", command=self.hide_logs).pack(side="top", anchor="w")
+        log_controls = Frame(self.log_frame)
+        log_controls.pack(side="top", fill="x")
+        Button(log_controls, text="Back", command=self.hide_logs).pack(side="left")
+        Button(log_controls, text="Newer", command=lambda: self.show_log_page(self.log_page - 1)).pack(side="left", padx=5)
+        Button(log_controls, text="Older", command=lambda: self.show_log_page(self.log_page + 1)).pack(side="left")
+        self.log_page_label = Label(log_controls, text="")
+        self.log_page_label.pack(side="left", padx=5)
+        Label(log_controls, text="Last N operations:").pack(side="left", padx=(15, 0))
+        self.history_entry = Entry(log_controls, width=5)
+        self.history_entry.insert(0, "1")
+        self.history_entry.pack(side="left", padx=5)
+        Button(log_controls, text="Undo", command=self.undo_operations).pack(side="left")
+        Button(log_controls, text="Replay", command=self.replay_operations).pack(side="left", padx=5)
         Label(self.log_frame, text="Logs:").pack(anchor="w")
         self.log_listbox.pack(fill="both", expand=True)
 
         # Footer
         Label(master, text="AZD", fg="gray").pack(side="bottom")
 
-    def log(self, message, level="info"):
-        """Log a message in the log panel."""
-        self.log_listbox.insert(END, f"[{level.upper()}] {message}")
+        self.process_ui_queue()
+
+    def call_in_ui(self, func, *args):
+        """Schedule func(*args) on the Tk thread; safe to call from worker threads."""
+        self.ui_queue.put((func, args))
+
+    def process_ui_queue(self):
+        """Run callbacks posted by worker threads, then reschedule itself."""
+        try:
+            for _ in range(50):
+                func, args = self.ui_queue.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        self.master.after(20, self.process_ui_queue)
+
+    def log(self, message, level="info", **fields):
+        """Write a message to the journal and show it if the newest log page is open."""
+        entry = dict(level=level, message=message, **fields)
+        self.journal.record(**entry)
+        if self.log_page == 0:
+            self.log_listbox.insert(END, self.format_entry(entry))
+            if self.log_listbox.size() > LOG_PAGE_SIZE:
+                self.log_listbox.delete(0)
+            self.log_listbox.see(END)
+
+    def format_entry(self, entry):
+        """Render a journal entry as one log line."""
+        if "undoes" in entry:
+            return f"[UNDO] Reverted operation {entry['undoes']}"
+        if "operation" in entry:
+            status = "OK" if entry.get("ok") else f"ERROR {entry.get('error')}"
+            return (f"[{entry['operation'].upper()}] {' -> '.join(entry['paths'])} "
+                    f"{status} ({entry.get('duration_ms', 0):.1f} ms)")
+        return f"[{entry.get('level', 'info').upper()}] {entry.get('message', '')}"
+
+    def show_log_page(self, page):
+        """Load one page of the journal into the log panel; page 0 is the newest."""
+        if page < 0:
+            return
+        self.journal.query(lambda: self.journal.read_page(page),
+                           lambda entries: self.call_in_ui(self.show_log_entries, page, entries))
+
+    def show_log_entries(self, page, entries):
+        if isinstance(entries, Exception):
+            self.log(f"Failed to read the journal: {entries}", "error")
+            return
+        if not entries and page > 0:
+            return
+        self.log_page = page
+        self.log_listbox.delete(0, END)
+        for entry in entries:
+            self.log_listbox.insert(END, self.format_entry(entry))
         self.log_listbox.see(END)
+        self.log_page_label.config(text=f"Page {page + 1}")
+
+    def journal_batch(self, batch):
+        """Record every item of a finished batch in the journal, with its latency."""
+        if not batch.operation:
+            return
+        for item, error, duration in batch.results:
+            paths = list(item) if isinstance(item, tuple) else [item]
+            self.journal.record(operation=batch.operation, paths=paths, ok=error is None,
+                                error=None if error is None else str(error), duration_ms=round(duration, 3))
+
+    def inverse_action(self, entry):
+        """Return a function undoing a journaled operation, or None if it cannot be undone."""
+        paths = entry["paths"]
+        operation = entry["operation"]
+        if operation == "create_folder":
+            return lambda: os.rmdir(paths[0])  # Only succeeds while the folder is still empty
+        if operation == "create_file":
+            return lambda: os.remove(paths[0])
+        if operation in ("rename_folder", "rename_file"):
+            return lambda: os.rename(paths[1], paths[0])
+        if operation == "copy":
+            return lambda: os.remove(paths[1])
+        if operation == "move":
+            return lambda: (os.makedirs(os.path.dirname(paths[0]), exist_ok=True), shutil.move(paths[1], paths[0]))
+        return None
+
+    def replay_action(self, entry):
+        """Return a function performing a journaled operation again."""
+        paths = entry["paths"]
+        actions = {
+            "create_folder": lambda: os.makedirs(paths[0]),
+            "create_file": lambda: open(paths[0], "w").close(),
+            "delete_folder": lambda: shutil.rmtree(paths[0]),
+            "delete_file": lambda: os.remove(paths[0]),
+            "rename_folder": lambda: os.rename(*paths),
+            "rename_file": lambda: os.rename(*paths),
+            "copy": lambda: copy_file(*paths),
+            "move": lambda: shutil.move(*paths),
+        }
+        return actions.get(entry["operation"])
+
+    def history_count(self):
+        try:
+            return max(1, int(self.history_entry.get()))
+        except ValueError:
+            self.log("Enter the number of operations as a whole number.", "error")
+            return None
+
+    def undo_operations(self):
+        """Undo the last N journaled operations, newest first."""
+        count = self.history_count()
+        if count is not None:
+            self.journal.query(lambda: self.journal.last_operations(count),
+                               lambda entries: self.call_in_ui(self.start_undo, entries))
+
+    def start_undo(self, entries):
+        if isinstance(entries, Exception):
+            self.log(f"Failed to read the journal: {entries}", "error")
+            return
+        steps = []
+        for entry in entries:
+            action = self.inverse_action(entry)
+            if action is None:
+                self.log(f"Cannot undo {entry['operation']} of {' -> '.join(entry['paths'])}", "warning")
+                continue
+            steps.append((entry["id"], action))
+
+        def undo(step):
+            entry_id, action = step
+            action()
+            self.journal.record(undoes=entry_id)
+
+        # Undo steps depend on each other, so they run as one item, one after another
+        self.run_batch("Undo", [f"last {len(steps)} operations"], lambda _: [undo(step) for step in steps], "Undone")
+
+    def replay_operations(self):
+        """Perform the last N journaled operations again, oldest first."""
+        count = self.history_count()
+        if count is not None:
+            self.journal.query(lambda: self.journal.last_operations(count),
+                               lambda entries: self.call_in_ui(self.start_replay, entries))
+
+    def start_replay(self, entries):
+        if isinstance(entries, Exception):
+            self.log(f"Failed to read the journal: {entries}", "error")
+            return
+        steps = [(entry, self.replay_action(entry)) for entry in reversed(entries)]
+        steps = [(entry, action) for entry, action in steps if action]
+
+        def replay(step):
+            # Replayed operations are journaled like any other, so they can be undone
+            entry, action = step
+            started = time.perf_counter()
+            error = None
+            try:
+                action()
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.journal.record(operation=entry["operation"], paths=entry["paths"], ok=error is None,
+                                    error=None if error is None else str(error),
+                                    duration_ms=round((time.perf_counter() - started) * 1000, 3))
+
+        self.run_batch("Replay", [f"last {len(steps)} operations"], lambda _: [replay(step) for step in steps], "Replayed")
 
     def browse_directory(self):
         """Open a dialog to select a directory."""
@@ -95,6 +1229,7 @@ class FileManagementSystemGUI:
             self.is_path_set = True
             self.enable_buttons()
             self.populate_tree()
+            self.file_index.start(selected_directory)
             self.reset_browse_button.config(state=NORMAL)
             self.log(f"Changed directory to {selected_directory}")
 
@@ -104,6 +1239,7 @@ class FileManagementSystemGUI:
         self.current_path.set("")
         self.is_path_set = False
         self.disable_buttons()
+        self.file_index.stop()
         self.populate_tree()
         self.reset_browse_button.config(state=DISABLED)
         self.log("Reset directory selection.")
@@ -127,6 +1263,11 @@ class FileManagementSystemGUI:
         self.create_file_button.config(state=NORMAL)
         self.delete_file_button.config(state=NORMAL)
         self.rename_file_button.config(state=NORMAL)
+        self.copy_button.config(state=NORMAL)
+        self.move_button.config(state=NORMAL)
+        self.resume_button.config(state=NORMAL if self.unfinished_transfers() else DISABLED)
+        self.find_duplicates_button.config(state=NORMAL)
+        self.sizes_button.config(state=NORMAL)
 
     def disable_buttons(self):
         """Disable action buttons when no directory is selected."""
@@ -136,18 +1277,153 @@ class FileManagementSystemGUI:
         self.create_file_button.config(state=DISABLED)
         self.delete_file_button.config(state=DISABLED)
         self.rename_file_button.config(state=DISABLED)
+        self.copy_button.config(state=DISABLED)
+        self.move_button.config(state=DISABLED)
+        self.resume_button.config(state=DISABLED)
+        self.find_duplicates_button.config(state=DISABLED)
+        self.sizes_button.config(state=DISABLED)
 
     def populate_tree(self):
-        """Populate the tree view with the directory structure."""
-        self.tree.delete(*self.tree.get_children())
+        """Populate the tree view with the first page of the current directory."""
+        self.clear_tree()
         root_path = self.current_path.get()
         if root_path:
-            for item in os.listdir(root_path):
-                item_path = os.path.join(root_path, item)
-                if os.path.isdir(item_path):
-                    self.tree.insert("", END, text=item, values=[item_path])
-                elif os.path.isfile(item_path):
-                    self.tree.insert("", END, text=item, values=[item_path])
+            self.request_page("", root_path)
+            self.watcher.watch(root_path)
+
+    def clear_tree(self):
+        """Empty the tree and drop pending listings, searches and duplicate results."""
+        self.search_generation += 1
+        self.duplicate_groups = []
+        self.sizes_mode = False
+        self.size_rows = []
+        self.sizes_button.config(text="Sizes")
+        self.tree.configure(displaycolumns=())
+        self.delete_duplicates_button.config(state=DISABLED)
+        self.lister.reset()
+        self.loading_nodes.clear()
+        self.watcher.clear()
+        self.tree.delete(*self.tree.get_children())
+
+    def search_files(self):
+        """Search the index below the current directory; an empty query restores the directory view."""
+        query = self.search_entry.get().strip()
+        root_path = self.current_path.get()
+        self.search_generation += 1
+        if not query or not root_path:
+            self.populate_tree()
+            return
+        generation = self.search_generation
+
+        def run_search():
+            started = time.perf_counter()
+            try:
+                results = self.file_index.search(root_path, query)
+            except sqlite3.Error as e:
+                self.call_in_ui(self.log, f"Search failed: {e}", "error")
+                return
+            elapsed = time.perf_counter() - started
+            self.call_in_ui(self.show_search_results, generation, query, results, elapsed)
+
+        threading.Thread(target=run_search, daemon=True).start()
+
+    def show_search_results(self, generation, query, results, elapsed):
+        """Replace the tree contents with search results."""
+        if generation != self.search_generation:
+            return
+        self.clear_tree()
+        root_path = self.current_path.get()
+        for path, size, mtime, is_dir in results:
+            self.tree.insert("", END, iid=path, text=os.path.relpath(path, root_path), values=[path])
+        self.log(f"Search for '{query}' returned {len(results)} results in {elapsed * 1000:.0f} ms")
+
+    def request_page(self, node, path):
+        """Ask the lister for the next page of a node unless one is already on its way."""
+        if node not in self.loading_nodes:
+            self.loading_nodes.add(node)
+            self.lister.request_page(node, path)
+
+    def insert_page(self, generation, node, entries, has_more, error):
+        """Insert a page of entries below node. Folders get a placeholder child so they can be expanded."""
+        if generation != self.lister.generation:
+            return
+        self.loading_nodes.discard(node)
+        if node and not self.tree.exists(node):
+            return
+        for child in self.tree.get_children(node):
+            if self.tree.tag_has("placeholder", child) or self.tree.tag_has("more", child):
+                self.tree.delete(child)
+        if error:
+            self.log(f"Failed to list directory: {error}", "error")
+        for name, path, is_dir in entries:
+            if self.tree.exists(path):
+                continue
+            self.tree.insert(node, END, iid=path, text=name, values=[path])
+            if is_dir:
+                self.tree.insert(path, END, text="Loading...", tags=("placeholder",))
+        if has_more:
+            self.tree.insert(node, END, text="Load more...", tags=("more",))
+            self.load_visible_pages()
+
+    def node_path(self, node):
+        """Return the filesystem path of a tree node ("" is the current directory)."""
+        return node if node else self.current_path.get()
+
+    def on_tree_open(self, event):
+        """Start listing a folder the first time it is expanded."""
+        node = self.tree.focus()
+        children = self.tree.get_children(node)
+        if children and self.tree.tag_has("placeholder", children[0]):
+            self.request_page(node, self.node_path(node))
+            self.watcher.watch(self.node_path(node))
+
+    def apply_change(self, kind, path, new_path, is_dir):
+        """Apply one change reported by the directory watcher to the affected rows only."""
+        if kind == "reset":
+            self.populate_tree()
+            return
+        if kind in ("remove", "rename") and self.tree.exists(path):
+            self.tree.delete(path)
+            self.watcher.unwatch(path)
+        if kind == "add" or kind == "rename":
+            target = new_path or path
+            parent = os.path.dirname(target)
+            node = "" if parent == self.current_path.get() else parent
+            if node and not self.tree.exists(node) or self.tree.exists(target):
+                return
+            children = self.tree.get_children(node)
+            if children and self.tree.tag_has("placeholder", children[0]):
+                return  # Not listed yet, it will show up when the folder is expanded
+            self.tree.insert(node, END, iid=target, text=os.path.basename(target), values=[target])
+            if is_dir:
+                self.tree.insert(target, END, text="Loading...", tags=("placeholder",))
+
+    def prune_missing_rows(self, batch):
+        """Drop rows of paths a batch removed; covers search and duplicate views, which are not watched."""
+        for item, error, _ in batch.results:
+            for path in item if isinstance(item, tuple) else (item,):
+                if isinstance(path, str) and self.tree.exists(path) and not os.path.lexists(path):
+                    self.tree.delete(path)
+
+    def on_tree_select(self, event):
+        """Load the next page when a "Load more..." row is selected."""
+        for item in self.tree.selection():
+            if self.tree.tag_has("more", item):
+                parent = self.tree.parent(item)
+                self.request_page(parent, self.node_path(parent))
+
+    def on_tree_scroll(self, first, last):
+        """Keep the scrollbar in sync and fetch more rows once the end of a listing scrolls into view."""
+        self.tree_scrollbar.set(first, last)
+        if float(last) >= 1.0:
+            self.load_visible_pages()
+
+    def load_visible_pages(self):
+        """Request the next page for every visible "Load more..." row."""
+        for item in self.tree.tag_has("more"):
+            if self.tree.bbox(item):
+                parent = self.tree.parent(item)
+                self.request_page(parent, self.node_path(parent))
 
     def select_command(self, func):
         """Wrap a command to handle selection and disable other buttons."""
@@ -165,12 +1441,13 @@ class FileManagementSystemGUI:
 
             self.input_frame.pack(fill="x", pady=10)  # Show input panel
 
-            if func == self.rename_file or func == self.rename_folder:
+            if func in (self.rename_file, self.rename_folder, self.copy_items, self.move_items):
+                is_transfer = func in (self.copy_items, self.move_items)
                 self.using_double_input = True
-                self.input_label_1.config(text="Current Name:")
+                self.input_label_1.config(text="Source Names:" if is_transfer else "Current Name:")
                 self.input_label_1.pack(side="left", padx=5)
                 self.input_entry_1.pack(side="left", padx=5)
-                self.input_label_2.config(text="New Name:")
+                self.input_label_2.config(text="Destination Folder:" if is_transfer else "New Name:")
                 self.input_label_2.pack(side="left", padx=5)
                 self.input_entry_2.pack(side="left", padx=5)
             else:
@@ -196,87 +1473,337 @@ class FileManagementSystemGUI:
                 self.active_command(input_value_1)
             self.reset_command()  # Reset after handling input
 
+    def split_names(self, text):
+        """Split comma separated input into names."""
+        return [name.strip() for name in text.split(",") if name.strip()]
+
+    def expand_targets(self, root, text, kind):
+        """
+        Yield paths for comma separated names in root, expanding glob patterns.
+        :param kind: "dir", "file" or "any"; glob matches of another kind are skipped.
+        """
+        for name in self.split_names(text):
+            if not any(char in name for char in "*?["):
+                yield os.path.join(root, name)
+                continue
+            for path in glob.iglob(os.path.join(glob.escape(root), name)):
+                if kind == "any" or (os.path.isdir(path) if kind == "dir" else os.path.isfile(path)):
+                    yield path
+
+    def rename_pairs(self, old_names, new_names):
+        """Pair comma separated old and new names by position."""
+        root = self.current_path.get()
+        old_names, new_names = self.split_names(old_names), self.split_names(new_names)
+        if len(old_names) != len(new_names):
+            raise ValueError(f"{len(old_names)} current names but {len(new_names)} new names")
+        return [(os.path.join(root, old), os.path.join(root, new)) for old, new in zip(old_names, new_names)]
+
+    def run_batch(self, description, items, action, done_message, stats=None, operation=None):
+        """Queue a bulk operation; it runs in the background and reports back through finish_batch."""
+        batch = self.batch_queue.submit(description, items, action, done_message, stats, operation)
+        self.cancel_button.config(state=NORMAL)
+        self.progress_label.config(text=f"{description}...")
+        return batch
+
+    def show_progress(self, batch, done, total):
+        self.progress_label.config(text=f"{batch.description}: {done}/{total}")
+
+    def cancel_operations(self):
+        """Cancel running and queued bulk operations."""
+        self.batch_queue.cancel()
+        self.log("Cancelling pending operations.", "warning")
+
+    def finish_batch(self, batch):
+        """Log the result of a finished batch and refresh the tree."""
+        self.journal_batch(batch)
+        failures = batch.failures
+        if len(batch.results) <= ITEM_LOG_LIMIT:
+            for item, error, _ in batch.results:
+                target = " -> ".join(item) if isinstance(item, tuple) else item
+                if error is None:
+                    self.log(f"{batch.done_message}: {target}")
+                else:
+                    self.log(f"{batch.description} failed for {target}: {error}", "error")
+        else:
+            for item, error in failures[:ITEM_LOG_LIMIT]:
+                self.log(f"{batch.description} failed for {item}: {error}", "error")
+            succeeded = len(batch.results) - len(failures)
+            self.log(f"{batch.description}: {succeeded} of {len(batch.results)} items succeeded",
+                     "error" if failures else "info")
+        if batch.stats:
+            self.log(f"{batch.description} throughput: {batch.stats.summary()}")
+        if not self.batch_queue.pending:
+            self.progress_label.config(text="")
+            self.cancel_button.config(state=DISABLED)
+        self.prune_missing_rows(batch)
+
     def create_folder(self, folder_name):
-        """Create a new folder in the current directory."""
+        """Create new folders in the current directory; accepts comma separated names."""
         if folder_name:
-            new_path = os.path.join(self.current_path.get(), folder_name)
-            try:
-                os.makedirs(new_path)
-                self.log(f"Folder created: {new_path}")
-                self.populate_tree()
-            except Exception as e:
-                self.log(f"Failed to create folder: {e}", "error")
+            paths = [os.path.join(self.current_path.get(), name) for name in self.split_names(folder_name)]
+            self.run_batch("Create folder", paths, os.makedirs, "Folder created", operation="create_folder")
 
     def delete_folder(self, folder_name):
-        """Delete a selected folder."""
+        """Delete folders; accepts comma separated names and glob patterns."""
         if folder_name:
-            target_path = os.path.join(self.current_path.get(), folder_name)
-            try:
-                shutil.rmtree(target_path)
-                self.log(f"Folder deleted: {target_path}")
-                self.populate_tree()
-            except Exception as e:
-                self.log(f"Failed to delete folder: {e}", "error")
+            root, folders = self.current_path.get(), []
+
+            def files_to_delete():
+                # Remove the files of large trees in parallel first, then the emptied folders. A symlink to a
+                # folder is removed itself; its target's files are never walked.
+                for target in self.expand_targets(root, folder_name, "dir"):
+                    if os.path.islink(target):
+                        yield target
+                        continue
+                    folders.append(target)
+                    for dirpath, _, filenames in os.walk(target, followlinks=False):
+                        for filename in filenames:
+                            yield os.path.join(dirpath, filename)
+
+            def remove(path):
+                # Windows removes directory symlinks with rmdir
+                (os.rmdir if os.name == "nt" and os.path.isdir(path) else os.remove)(path)
+
+            self.run_batch("Delete folder contents", files_to_delete, remove, "File deleted", operation="delete_file")
+            self.run_batch("Delete folder", lambda: folders, shutil.rmtree, "Folder deleted", operation="delete_folder")
 
     def rename_folder(self, old_name, new_name):
-        """Rename a selected folder."""
+        """Rename folders; accepts comma separated names paired by position."""
         if old_name and new_name:
-            old_path = os.path.join(self.current_path.get(), old_name)
-            new_path = os.path.join(self.current_path.get(), new_name)
             try:
-                os.rename(old_path, new_path)
-                self.log(f"Folder renamed from {old_name} to {new_name}")
-                self.populate_tree()
-            except Exception as e:
+                pairs = self.rename_pairs(old_name, new_name)
+            except ValueError as e:
                 self.log(f"Failed to rename folder: {e}", "error")
+                return
+            self.run_batch("Rename folder", pairs, lambda pair: os.rename(*pair), "Folder renamed",
+                           operation="rename_folder")
 
     def create_file(self, file_name):
-        """Create a new file in the current directory."""
+        """Create new empty files in the current directory; accepts comma separated names."""
         if file_name:
-            new_path = os.path.join(self.current_path.get(), file_name)
-            try:
-                with open(new_path, 'w') as f:
+            paths = [os.path.join(self.current_path.get(), name) for name in self.split_names(file_name)]
+
+            def create(path):
+                with open(path, 'w') as f:
                     f.write("")
-                self.log(f"File created: {new_path}")
-                self.populate_tree()
-            except Exception as e:
-                self.log(f"Failed to create file: {e}", "error")
+
+            self.run_batch("Create file", paths, create, "File created", operation="create_file")
 
     def delete_file(self, file_name):
-        """Delete a selected file."""
+        """Delete files; accepts comma separated names and glob patterns."""
         if file_name:
-            target_path = os.path.join(self.current_path.get(), file_name)
-            try:
-                os.remove(target_path)
-                self.log(f"File deleted: {target_path}")
-                self.populate_tree()
-            except Exception as e:
-                self.log(f"Failed to delete file: {e}", "error")
+            root = self.current_path.get()
+            self.delete_paths(lambda: self.expand_targets(root, file_name, "file"))
+
+    def delete_paths(self, paths):
+        """Queue deletion of files given as paths (or a callable producing them)."""
+        self.run_batch("Delete file", paths, os.remove, "File deleted", operation="delete_file")
 
     def rename_file(self, old_name, new_name):
-        """Rename a selected file."""
+        """Rename files; accepts comma separated names paired by position."""
         if old_name and new_name:
-            old_path = os.path.join(self.current_path.get(), old_name)
-            new_path = os.path.join(self.current_path.get(), new_name)
             try:
-                os.rename(old_path, new_path)
-                self.log(f"File renamed from {old_name} to {new_name}")
-                self.populate_tree()
-            except Exception as e:
+                pairs = self.rename_pairs(old_name, new_name)
+            except ValueError as e:
                 self.log(f"Failed to rename file: {e}", "error")
+                return
+            self.run_batch("Rename file", pairs, lambda pair: os.rename(*pair), "File renamed", operation="rename_file")
+
+    def copy_items(self, source_names, destination):
+        """Copy files and folders (comma separated, globs allowed) into a destination folder."""
+        if source_names and destination:
+            self.start_transfer("copy", source_names, destination, resume=False)
+
+    def move_items(self, source_names, destination):
+        """Move files and folders (comma separated, globs allowed) into a destination folder."""
+        if source_names and destination:
+            self.start_transfer("move", source_names, destination, resume=False)
+
+    @staticmethod
+    def unfinished_transfers():
+        """Resume state files of unfinished transfers, most recently started first."""
+        paths = glob.glob(os.path.join(TRANSFER_STATE_DIR, "*.json"))
+        return sorted(paths, key=lambda path: os.path.getmtime(path), reverse=True)
+
+    def resume_transfer(self):
+        """Restart the last unfinished copy or move, skipping files that were already transferred."""
+        try:
+            with open(self.unfinished_transfers()[0]) as f:
+                state = json.load(f)
+        except IndexError:
+            self.log("No transfer to resume.", "error")
+            return
+        except (OSError, ValueError) as e:
+            self.log(f"No transfer to resume: {e}", "error")
+            return
+        self.current_path.set(state["root"])
+        self.start_transfer(state["operation"], state["sources"], state["destination"], resume=True)
+
+    def start_transfer(self, operation, source_names, destination, resume):
+        """
+        Queue a copy or move. Moves within a filesystem are renames; everything else is copied file by file
+        in parallel, then the sources of a move are removed. The job is recorded so it can be resumed.
+        """
+        root = self.current_path.get()
+        destination = os.path.join(root, destination)
+        state = {"operation": operation, "root": root, "sources": source_names, "destination": destination}
+        # Each job keeps its own state file, named after the job, so concurrent transfers do not clash
+        os.makedirs(TRANSFER_STATE_DIR, exist_ok=True)
+        state_path = os.path.join(TRANSFER_STATE_DIR,
+                                  hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest() + ".json")
+        with open(state_path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(state_path + ".tmp", state_path)
+        copied_sources = []
+        renamed = set()  # Pairs already moved by a rename while the items were listed
+
+        def file_pairs():
+            os.makedirs(destination, exist_ok=True)
+            for path in list(self.expand_targets(root, source_names, "any")):
+                target = os.path.join(destination, os.path.basename(path))
+                if operation == "move":
+                    try:
+                        os.rename(path, target)
+                        renamed.add((path, target))
+                        yield path, target
+                        continue
+                    except OSError as e:
+                        if e.errno != errno.EXDEV:
+                            raise
+                copied_sources.append(path)
+                if not os.path.isdir(path):
+                    yield path, target
+                    continue
+                for dirpath, _, filenames in os.walk(path):
+                    target_dir = os.path.join(target, os.path.relpath(dirpath, path))
+                    os.makedirs(target_dir, exist_ok=True)
+                    for filename in filenames:
+                        yield os.path.join(dirpath, filename), os.path.join(target_dir, filename)
+
+        def transfer(pair):
+            if pair not in renamed:
+                stats.add(copy_file(*pair, resume=resume))
+
+        def check_copied():
+            if copy_batch.failures:
+                raise RuntimeError(f"{len(copy_batch.failures)} files were not copied, use Resume Transfer to retry")
+
+        def remove_source(path):
+            check_copied()
+            shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+
+        def finish(state_path):
+            check_copied()
+            os.remove(state_path)
+
+        stats = TransferStats()
+        description = "Move" if operation == "move" else "Copy"
+        copy_batch = self.run_batch(description, file_pairs, transfer, "Moved" if operation == "move" else "Copied",
+                                    stats, operation)
+        if operation == "move":
+            self.run_batch("Remove moved sources", lambda: copied_sources, remove_source, "Removed")
+        self.run_batch("Finish transfer", [state_path], finish, "Transfer completed")
+
+    def toggle_sizes(self):
+        """Switch between the file listing and the disk usage view of the current directory."""
+        if self.sizes_mode:
+            self.populate_tree()
+        else:
+            self.show_sizes()
+
+    def show_sizes(self):
+        """Compute the recursive size of every subfolder in the background, streaming rows in sorted by size."""
+        root_path = self.current_path.get()
+        if not root_path:
+            return
+        self.clear_tree()
+        self.sizes_mode = True
+        self.sizes_button.config(text="Files")
+        self.tree.configure(displaycolumns=("size",))
+        generation = self.search_generation
+
+        def run_scan():
+            started = time.perf_counter()
+            try:
+                root_size = self.disk_usage.scan(
+                    root_path,
+                    lambda folder, size, relisted: self.call_in_ui(self.insert_size_row, generation, folder, size, relisted),
+                    cancelled=lambda: generation != self.search_generation)
+            except OSError as e:
+                self.call_in_ui(self.log, f"Failed to compute sizes: {e}", "error")
+                return
+            self.call_in_ui(self.log, f"Sizes computed in {time.perf_counter() - started:.1f}s "
+                                      f"({format_size(root_size)} in files directly in {root_path})")
+
+        threading.Thread(target=run_scan, daemon=True).start()
+
+    def insert_size_row(self, generation, folder, size, relisted):
+        """Insert a folder's size row at its place in the size-ordered list."""
+        if generation != self.search_generation or self.tree.exists(folder):
+            return
+        row = (-size, folder)
+        index = bisect.bisect(self.size_rows, row)
+        self.size_rows.insert(index, row)
+        self.tree.insert("", index, iid=folder, text=os.path.basename(folder), values=[folder, format_size(size)])
+        if relisted:
+            self.log(f"Re-listed {relisted} changed folders in {folder}")
+
+    def find_duplicates(self):
+        """Scan the current directory for duplicate files in the background and list them as groups."""
+        root_path = self.current_path.get()
+        if not root_path:
+            return
+        self.find_duplicates_button.config(state=DISABLED)
+        self.log(f"Searching for duplicates in {root_path}")
+
+        def run_scan():
+            started = time.perf_counter()
+            groups = find_duplicates(root_path, on_status=lambda message: self.call_in_ui(self.log, message))
+            self.call_in_ui(self.show_duplicates, groups, time.perf_counter() - started)
+
+        threading.Thread(target=run_scan, daemon=True).start()
+
+    def show_duplicates(self, groups, elapsed):
+        """Show duplicate groups in the tree, one expandable row per group."""
+        self.clear_tree()
+        self.duplicate_groups = groups
+        root_path = self.current_path.get()
+        for number, (size, paths) in enumerate(groups):
+            group = self.tree.insert("", END, iid=f"duplicates:{number}", text=f"{len(paths)} copies of {size} bytes")
+            for path in paths:
+                self.tree.insert(group, END, iid=path, text=os.path.relpath(path, root_path), values=[path])
+        wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+        self.log(f"Found {len(groups)} duplicate groups ({wasted / (1024 * 1024):.1f} MB reclaimable) in {elapsed:.1f}s")
+        self.find_duplicates_button.config(state=NORMAL if self.is_path_set else DISABLED)
+        self.delete_duplicates_button.config(state=NORMAL if groups else DISABLED)
+
+    def delete_duplicates(self):
+        """
+        Delete the selected duplicates, or every copy but the first of each group if nothing is selected,
+        after confirmation. At least one file of every group is always kept.
+        """
+        selected = {item for item in self.tree.selection() if not item.startswith("duplicates:")}
+        paths = []
+        for _, group in self.duplicate_groups:
+            doomed = [path for path in group if path in selected] if selected else group[1:]
+            paths.extend(doomed[:len(group) - 1])
+        if paths and askyesno("Delete duplicates", f"Delete {len(paths)} duplicate files? "
+                                                   "One file of every group is kept."):
+            self.delete_paths(paths)
 
     def show_logs(self):
         """Show the logs panel."""
         self.actions_frame.pack_forget()
-        self.tree.pack_forget()
+        self.tree_frame.pack_forget()
         self.input_frame.pack_forget()
         self.log_frame.pack(fill="both", expand=True)
+        self.show_log_page(0)
 
     def hide_logs(self):
         """Hide the logs panel and go back to the main view."""
         self.log_frame.pack_forget()
         self.actions_frame.pack(fill="x", pady=10)
-        self.tree.pack(fill="both", expand=True)
+        self.tree_frame.pack(fill="both", expand=True)
 
 # Main application entry
 if __name__ == "__main__":
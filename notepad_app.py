@@ -2,16 +2,952 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
 import threading
-import asyncio
 import datetime
+import bisect
+import glob
+import itertools
+import json
+import keyword
+import multiprocessing
+import mmap
 import os
+import queue
+import re
+import stat
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
 from tkinter.filedialog import asksaveasfilename
+from tkinter.messagebox import askyesno
 from docx import Document
 from fpdf import FPDF
 
+try:
+    import fcntl  # Session locks on POSIX
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt  # Session locks on Windows
+except ImportError:
+    msvcrt = None
+
+WINDOW_LINES = 2000  # Lines of the document held in the text widget at a time
+INDEX_STEP = 100000  # Lines indexed per step while the background thread holds the index lock
+SEARCH_BATCH = 1000  # Matches collected before the search thread reports them
+SEARCH_DELAY = 250  # Milliseconds of typing pause before an incremental search starts
+EXPORT_CHUNK = 5000  # Lines sent to the export process at a time
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".notepad_autosave")
+AUTOSAVE_DELAY = 2000  # Milliseconds of editing pause before changes are journaled
+AUTOSAVE_COMPACT_BYTES = 1 << 20  # Journal size at which it is compacted into a snapshot
+BUFFER_CACHE_BYTES = 64 << 20  # Edited text kept in memory for inactive tabs before they are spilled to disk
+HIGHLIGHT_DELAY = 100  # Milliseconds of editing or scrolling pause before the viewport is re-highlighted
+TOKEN_CACHE_LINES = 20000  # Lexed lines memoized by (state, text)
+STYLES = ("bold", "italic")  # Formatting styles, in the order of their ids in sidecar files
+SIDECAR_MAGIC = b"NPFMT1"
+TEXT_ERRORS = "surrogateescape"  # Bytes that are not UTF-8 survive a load and save unchanged
+UMASK = os.umask(0o022)
+os.umask(UMASK)
+
+
+class LineIndex:
+    def __init__(self, data):
+        """
+        Byte offsets of the line starts of a memory-mapped file.
+        The index is extended on demand and completed by a background thread, so opening is instant.
+        :param data: mmap (or bytes) with the file contents.
+        """
+        self.data = data
+        self.offsets = array("Q", [0])
+        self.complete = False
+        self.lock = threading.Lock()
+        threading.Thread(target=self.build, daemon=True).start()
+
+    def build(self):
+        while not self.complete:
+            with self.lock:
+                self.scan(INDEX_STEP)
+
+    def scan(self, count):
+        """Index up to count more lines; the lock must be held."""
+        data, offsets = self.data, self.offsets
+        position = offsets[-1]
+        for _ in range(count):
+            newline = data.find(b"\n", position)
+            if newline < 0:
+                self.complete = True
+                return
+            position = newline + 1
+            offsets.append(position)
+
+    def extend(self, line):
+        """Make sure the start of line is indexed, unless the file is shorter."""
+        with self.lock:
+            while not self.complete and len(self.offsets) <= line:
+                self.scan(min(INDEX_STEP, line + 1 - len(self.offsets)))
+
+    def count(self):
+        """Total number of lines; waits for the index to be complete."""
+        while not self.complete:
+            self.extend(len(self.offsets) + INDEX_STEP)
+        return len(self.offsets)
+
+    def lines(self, start, end):
+        """Decoded lines [start, end); fewer when the file ends earlier."""
+        self.extend(end)
+        offsets, data = self.offsets, self.data
+        result = []
+        for number in range(start, min(end, len(offsets))):
+            stop = offsets[number + 1] - 1 if number + 1 < len(offsets) else len(data)
+            result.append(data[offsets[number]:stop].decode("utf-8", errors=TEXT_ERRORS).rstrip("\r"))
+        return result
+
+
+class PieceTable:
+    def __init__(self, index=None):
+        """
+        Line-based piece table. Pieces are (source, first line, line count) tuples where source is either
+        the LineIndex of the opened file or a list of lines added by edits. Only the last piece may have a
+        count of None, meaning "up to the end of the file", so nothing waits for the whole file to be indexed.
+        """
+        self.pieces = [(index, 0, None)] if index else [([""], 0, 1)]
+        self.version = 0
+        self.edits = []  # (start, end, lines) replacements not yet taken by the autosave journal
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a file and return a table reading lines from it lazily."""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        return cls(LineIndex(data))
+
+    def snapshot(self):
+        """Return a copy that is safe to read from another thread; sources are never modified."""
+        copy = PieceTable()
+        copy.pieces = list(self.pieces)
+        copy.version = self.version
+        return copy
+
+    @staticmethod
+    def fetch(source, start, end):
+        return source[start:end] if isinstance(source, list) else source.lines(start, end)
+
+    def line_count(self):
+        total = 0
+        for source, offset, count in self.pieces:
+            total += count if count is not None else source.count() - offset
+        return total
+
+    def get_lines(self, start, end):
+        """Return lines [start, end) of the document."""
+        result, first = [], 0
+        for source, offset, count in self.pieces:
+            if first >= end:
+                break
+            if count is not None and first + count <= start:
+                first += count
+                continue
+            local_start = max(0, start - first)
+            local_end = end - first if count is None else min(count, end - first)
+            result.extend(self.fetch(source, offset + local_start, offset + local_end))
+            if count is None:
+                break
+            first += count
+        return result
+
+    def iter_lines(self, chunk=10000):
+        """Yield every line of the document, reading the file in chunks."""
+        for source, offset, count in self.pieces:
+            if isinstance(source, list):
+                yield from source[offset:offset + count]
+                continue
+            position, end = offset, None if count is None else offset + count
+            while end is None or position < end:
+                stop = position + chunk if end is None else min(position + chunk, end)
+                lines = source.lines(position, stop)
+                yield from lines
+                if len(lines) < stop - position:
+                    break
+                position = stop
+
+    def split(self, at):
+        """Split pieces so that one starts at line at; return its position in the piece list."""
+        first = 0
+        for position, (source, offset, count) in enumerate(self.pieces):
+            if first == at:
+                return position
+            if count is None or at < first + count:
+                local = at - first
+                rest = None if count is None else count - local
+                self.pieces[position:position + 1] = [(source, offset, local), (source, offset + local, rest)]
+                return position + 1
+            first += count
+        return len(self.pieces)
+
+    def rewritten(self, changes):
+        """
+        Pieces of the document with single lines replaced, from sorted (line, old text, [new lines]) changes.
+        Unchanged runs keep pointing at their sources; all new lines go into one list, and the new lines of
+        adjacent changes share a piece.
+        """
+        pieces, added = [], []
+        changes = iter(changes)
+        change = next(changes, None)
+        first = 0
+        for source, offset, count in self.pieces:
+            local = 0
+            while change is not None and (count is None or change[0] < first + count):
+                line, _, new_lines = change
+                if line - first > local:
+                    pieces.append((source, offset + local, line - first - local))
+                previous = pieces[-1] if pieces else None
+                if previous and previous[0] is added and previous[1] + previous[2] == len(added):
+                    pieces[-1] = (added, previous[1], previous[2] + len(new_lines))
+                else:
+                    pieces.append((added, len(added), len(new_lines)))
+                added.extend(new_lines)
+                local = line - first + 1
+                change = next(changes, None)
+            if count is None:
+                pieces.append((source, offset + local, None))
+                break
+            if local < count:
+                pieces.append((source, offset + local, count - local))
+            first += count
+        return pieces
+
+    def replace_lines(self, start, end, lines):
+        """Replace lines [start, end) with a list of new lines."""
+        lines = list(lines)
+        first = self.split(start)
+        last = self.split(end)
+        self.pieces[first:last] = [(lines, 0, len(lines))] if lines else []
+        self.version += 1
+        self.edits.append((start, end, lines))
+
+
+class PythonLexer:
+    """Tokens of Python source. States: 0 = code, 1 and 2 = inside a triple-quoted string opened with " or '."""
+    TOKEN = re.compile(
+        r"(?P<comment>#.*)"
+        r"""|(?P<triple>[rRbBuUfF]{0,2}(?:"{3}|'{3}))"""
+        r"""|(?P<string>[rRbBuUfF]{0,2}(?:"(?:[^"\\]|\\.)*"?|'(?:[^'\\]|\\.)*'?))"""
+        r"|(?P<number>\b\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?[jJ]?\b)"
+        r"|(?P<keyword>\b(?:" + "|".join(keyword.kwlist) + r")\b)")
+    CLOSERS = {1: re.compile(r'(?:[^\\]|\\.)*?"{3}'), 2: re.compile(r"(?:[^\\]|\\.)*?'{3}")}
+
+    def lex(self, state, line):
+        """Return ([(start, end, tag)], state at the end of the line)."""
+        tokens, position, opened = [], 0, 0
+        while True:
+            if state:
+                match = self.CLOSERS[state].match(line, position)
+                if not match:
+                    tokens.append((opened, len(line), "string"))
+                    return tokens, state
+                tokens.append((opened, match.end(), "string"))
+                position, state = match.end(), 0
+            match = self.TOKEN.search(line, position)
+            if not match:
+                return tokens, state
+            if match.lastgroup == "triple":
+                state = 1 if match.group().endswith('"') else 2
+                opened = match.start()
+            else:
+                tokens.append((match.start(), match.end(), match.lastgroup))
+            position = match.end()
+
+
+LEXERS = {".py": PythonLexer, ".pyw": PythonLexer}
+SYNTAX_TAGS = ("keyword", "string", "comment", "number")
+
+
+class Highlighter:
+    def __init__(self, lexer, on_tokens):
+        """
+        Tokenize a document on a background thread. states[n] is the lexer state at the start of line n and is
+        known up to the lexed point; tokens are memoized by (state, text), so re-lexing after an edit only does
+        real work for lines that changed or whose starting state changed.
+        :param on_tokens: Called from the worker as on_tokens(generation, first line, [tokens per line]).
+        """
+        self.lexer = lexer
+        self.on_tokens = on_tokens
+        self.states = array("B", [0])
+        self.memo = OrderedDict()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def edited(self, start):
+        """Forget line states after an edit starting at line start."""
+        with self.lock:
+            del self.states[start + 1:]
+            self.generation += 1
+
+    def request(self, document, first, last):
+        """Tokenize lines [first, last) of a document snapshot. Returns the generation the result will carry."""
+        with self.lock:
+            self.generation += 1
+            self.requests.put((self.generation, document, first, last))
+            return self.generation
+
+    def lex(self, state, text):
+        key = (state, text)
+        result = self.memo.get(key)
+        if result is None:
+            result = self.memo[key] = self.lexer.lex(state, text)
+            if len(self.memo) > TOKEN_CACHE_LINES:
+                self.memo.popitem(last=False)
+        else:
+            self.memo.move_to_end(key)
+        return result
+
+    def run(self):
+        while True:
+            generation, document, first, last = self.requests.get()
+            with self.lock:
+                if generation != self.generation:
+                    continue
+                number = min(first, len(self.states) - 1)
+            tokens = []
+            while number < last and generation == self.generation:
+                lines = document.get_lines(number, min(last, number + WINDOW_LINES))
+                if not lines:
+                    break
+                for text in lines:
+                    # edited() may truncate states at any time; it also bumps the generation
+                    with self.lock:
+                        if generation != self.generation or number >= len(self.states):
+                            generation = None
+                            break
+                        state = self.states[number]
+                    line_tokens, state = self.lex(state, text)
+                    with self.lock:
+                        if generation != self.generation:
+                            generation = None
+                            break
+                        if number + 1 == len(self.states):
+                            self.states.append(state)
+                    if number >= first:
+                        tokens.append(line_tokens)
+                    number += 1
+            if generation is not None and generation == self.generation:
+                self.on_tokens(generation, first, tokens)
+
+
+def sidecar_path(filepath):
+    """Formatting of a text file is kept next to it, in a hidden .fmt file."""
+    directory, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{name}.fmt")
+
+
+def write_sidecar(filepath, runs):
+    """
+    Store formatting runs {line: [(start, end, style)]} compactly: a header with the size of the text file,
+    then (line delta, start, end, style id) as little-endian 32-bit integers. Removes the sidecar if there are no runs.
+    """
+    path = sidecar_path(filepath)
+    if not runs:
+        remove_file(path)
+        return
+    values, previous = array("I"), 0
+    for line in sorted(runs):
+        for start, end, style in runs[line]:
+            values.extend((line - previous, start, end, STYLES.index(style)))
+            previous = line
+    if sys.byteorder == "big":
+        values.byteswap()
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), delete=False) as file:
+        file.write(SIDECAR_MAGIC + struct.pack("<Q", os.path.getsize(filepath)))
+        file.write(values.tobytes())
+    keep_mode(file.name, path)
+    os.replace(file.name, path)
+
+
+def read_sidecar(filepath):
+    """Formatting runs stored for a text file, or {} if there are none or the file changed since."""
+    try:
+        with open(sidecar_path(filepath), "rb") as file:
+            data = file.read()
+    except OSError:
+        return {}
+    header = len(SIDECAR_MAGIC) + 8
+    if data[:len(SIDECAR_MAGIC)] != SIDECAR_MAGIC or len(data) < header:
+        return {}
+    if struct.unpack("<Q", data[len(SIDECAR_MAGIC):header])[0] != os.path.getsize(filepath):
+        return {}
+    values = array("I")
+    values.frombytes(data[header:len(data) - (len(data) - header) % 16])
+    if sys.byteorder == "big":
+        values.byteswap()
+    runs, line = {}, 0
+    for position in range(0, len(values), 4):
+        delta, start, end, style = values[position:position + 4]
+        line += delta
+        runs.setdefault(line, []).append((start, end, STYLES[style]))
+    return runs
+
+
+class SearchEngine:
+    def __init__(self, on_matches, on_replaced=None):
+        """
+        Find literal or regex matches line by line on a background thread, or rewrite them for a replace-all.
+        :param on_matches: Called from the worker as on_matches(generation, matches, done, error) with
+            matches as sorted (line, start column, end column) tuples.
+        :param on_replaced: Called from the worker as on_replaced(generation, document, result, count, error) with
+            result as (pieces of the rewritten document, its edits as line replacements, the edits undoing them,
+            sorted lines that became several, total lines added up to each of them); see replace_all.
+        """
+        self.on_matches = on_matches
+        self.on_replaced = on_replaced
+        self.generation = 0
+        self.requests = queue.Queue()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    @staticmethod
+    def compile(pattern, regex):
+        return re.compile(pattern if regex else re.escape(pattern))
+
+    def search(self, document, pattern, regex=False):
+        """Start searching a document snapshot, abandoning any running search. Returns the generation."""
+        self.generation += 1
+        self.requests.put((self.generation, document, pattern, regex, None))
+        return self.generation
+
+    def replace(self, document, pattern, regex, replacement):
+        """Start replacing every match in a document snapshot, abandoning any running search. Returns the generation."""
+        self.generation += 1
+        self.requests.put((self.generation, document, pattern, regex, replacement))
+        return self.generation
+
+    def cancel(self):
+        self.generation += 1
+
+    def run(self):
+        while True:
+            generation, document, pattern, regex, replacement = self.requests.get()
+            if generation != self.generation:
+                continue
+            try:
+                compiled = self.compile(pattern, regex)
+            except re.error as e:
+                self.on_matches(generation, [], True, e)
+                continue
+            if replacement is not None:
+                self.replace_all(generation, document, compiled, regex, replacement)
+                continue
+            matches = []
+            for number, line in enumerate(document.iter_lines()):
+                if generation != self.generation:
+                    break
+                matches.extend((number, match.start(), match.end())
+                               for match in compiled.finditer(line) if match.end() > match.start())
+                if len(matches) >= SEARCH_BATCH:
+                    self.on_matches(generation, matches, False, None)
+                    matches = []
+            else:
+                self.on_matches(generation, matches, True, None)
+
+    def replace_all(self, generation, document, compiled, regex, replacement):
+        def expand(match):
+            return match.expand(replacement) if regex else replacement
+
+        changes, count = [], 0
+        try:
+            for number, line in enumerate(document.iter_lines()):
+                if generation != self.generation:
+                    return
+                new_line, replaced = compiled.subn(expand, line)
+                if replaced:
+                    changes.append((number, line, new_line.split("\n")))
+                    count += replaced
+        except (re.error, IndexError) as e:  # Bad group reference in the replacement
+            self.on_replaced(generation, document, None, 0, e)
+            return
+        # Lines after a change that became several lines move down by the extra lines
+        split_lines, shifts, shift = [], [], 0
+        redo_edits, undo_edits = [], []
+        for line, old_line, new_lines in changes:
+            undo_edits.append((line + shift, line + shift + len(new_lines), [old_line]))
+            redo_edits.append((line, line + 1, new_lines))
+            if len(new_lines) > 1:
+                shift += len(new_lines) - 1
+                split_lines.append(line)
+                shifts.append(shift)
+        # Last line first, so every edit applies to the line numbers before it
+        undo_edits.reverse()
+        redo_edits.reverse()
+        result = (document.rewritten(changes), redo_edits, undo_edits, split_lines, shifts)
+        self.on_replaced(generation, document, result, count, None)
+
+
+def write_lines(file, document):
+    """Write the lines of a document to a text file, separated by newlines."""
+    for number, line in enumerate(document.iter_lines()):
+        file.write("\n" if number else "")
+        file.write(line)
+
+
+def keep_mode(temp_path, path):
+    """Give a temp file the mode of the file it replaces (or the umask default), instead of mkstemp's 0600."""
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+    os.chmod(temp_path, mode)
+
+
+def lock_session(file):
+    """Take an exclusive lock on an open file without waiting; False if another process holds it."""
+    try:
+        if msvcrt:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Still mapped by an open document on some platforms; removed with its session
+
+
+class AutosaveJournal:
+    counter = itertools.count()
+
+    def __init__(self, on_error, directory=AUTOSAVE_DIR):
+        """
+        Crash-safe autosave for one editor session. Edits are appended to a JSONL journal as
+        (start, end, lines) replacements on top of a base, which is either the opened file or a snapshot.
+        Once the journal grows past AUTOSAVE_COMPACT_BYTES it is compacted into a new snapshot.
+        Snapshots and journal rewrites go through a temp file and a rename, so a crash leaves either the
+        old or the new state. All writes happen on a background thread. The session holds a lock on its
+        .lock file while it runs, so other editors never recover a live session.
+        :param on_error: Called from the writer thread as on_error(exception).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.on_error = on_error
+        self.name = os.path.join(
+            directory, f"session-{time.strftime('%Y%m%d-%H%M%S')}-{next(self.counter)}-{os.getpid()}")
+        self.journal_path = self.name + ".journal"
+        self.session_lock = open(self.name + ".lock", "a+b")
+        lock_session(self.session_lock)
+        self.source = None
+        self.generation = 0
+        self.journal_bytes = 0
+        self.requests = queue.Queue()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def start(self, source):
+        """Begin a new journal on top of a file on disk, or on an empty document when source is None."""
+        self.requests.put(("base", source))
+
+    def record(self, edits, document):
+        """Append edits; document is a snapshot of the result, used if the journal needs compacting."""
+        self.requests.put(("edits", (edits, document)))
+
+    def compact(self, document, source):
+        """Snapshot the document now, e.g. after it was saved as source."""
+        self.requests.put(("snapshot", (document, source)))
+
+    def remove_session(self, journal_path):
+        """Delete another session's files once everything queued before has been written."""
+        self.requests.put(("remove", journal_path))
+
+    def discard(self):
+        self.requests.put(("remove", self.journal_path))
+
+    def close(self):
+        """Wait until all queued writes are on disk."""
+        self.requests.join()
+
+    def run(self):
+        while True:
+            kind, value = self.requests.get()
+            try:
+                if kind == "base":
+                    self.source = value
+                    self.write_base(value)
+                elif kind == "edits":
+                    edits, document = value
+                    self.append(edits)
+                    if self.journal_bytes > AUTOSAVE_COMPACT_BYTES:
+                        self.write_snapshot(document)
+                elif kind == "snapshot":
+                    document, self.source = value
+                    self.write_snapshot(document)
+                else:
+                    if value == self.journal_path:
+                        self.session_lock.close()  # Windows cannot remove a file that is still open
+                    self.remove_files(value)
+            except OSError as e:
+                self.on_error(e)
+            finally:
+                self.requests.task_done()
+
+    @staticmethod
+    def write_atomic(path, write):
+        """Write a file through a temp file in the same directory and rename it into place."""
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", errors=TEXT_ERRORS, dir=os.path.dirname(path),
+                                         delete=False) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(file.name, path)
+
+    def write_base(self, source, snapshot=None):
+        self.generation += 1
+        header = {"generation": self.generation, "source": source, "snapshot": snapshot}
+        if source and not snapshot:
+            stat = os.stat(source)
+            header.update(mtime=stat.st_mtime, size=stat.st_size)
+        line = json.dumps(header) + "\n"
+        self.write_atomic(self.journal_path, lambda file: file.write(line))
+        self.journal_bytes = len(line)
+
+    def append(self, edits):
+        data = "".join(json.dumps(edit) + "\n" for edit in edits)
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        self.journal_bytes += len(data)
+
+    def write_snapshot(self, document):
+        """Write the whole document to a new snapshot, then point a fresh journal at it."""
+        previous = glob.glob(glob.escape(self.name) + ".*.snapshot")
+        path = f"{self.name}.{self.generation + 1}.snapshot"
+        self.write_atomic(path, lambda file: write_lines(file, document))
+        self.write_base(self.source, snapshot=path)
+        for old in previous:
+            remove_file(old)
+
+    @staticmethod
+    def remove_files(journal_path):
+        name = journal_path[:-len(".journal")]
+        remove_file(journal_path)
+        remove_file(name + ".lock")
+        for path in glob.glob(glob.escape(name) + ".*.snapshot"):
+            remove_file(path)
+
+    @staticmethod
+    def stale_sessions(directory=AUTOSAVE_DIR):
+        """Journals left behind by sessions that are no longer running, newest first."""
+        sessions = []
+        for path in glob.glob(os.path.join(glob.escape(directory), "session-*.journal")):
+            name = path[:-len(".journal")]
+            pid = int(name.rsplit("-", 1)[1])
+            if pid == os.getpid():
+                continue
+            if os.path.exists(name + ".lock"):
+                try:
+                    with open(name + ".lock", "a+b") as file:
+                        if not lock_session(file):
+                            continue  # Another editor is still running with this session
+                except OSError:
+                    continue
+            elif os.name == "posix":  # Sessions from before lock files
+                try:
+                    os.kill(pid, 0)
+                    continue  # Another editor is still running with this session
+                except ProcessLookupError:
+                    pass
+                except PermissionError:
+                    continue
+            sessions.append(path)
+        return sorted(sessions, reverse=True)
+
+    @staticmethod
+    def recover(journal_path):
+        """
+        Rebuild a document from a journal: open its base lazily and replay the edits, so recovery takes
+        time proportional to the journal, not the document. Returns (document, source file or None).
+        """
+        with open(journal_path, encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if not isinstance(header, dict):
+                raise TypeError(f"{os.path.basename(journal_path)} does not start with a header")
+            source = header["source"]
+            if header["snapshot"]:
+                document = PieceTable.open(header["snapshot"])
+            elif source:
+                stat = os.stat(source)
+                if (stat.st_mtime, stat.st_size) != (header["mtime"], header["size"]):
+                    raise ValueError(f"{source} was changed after the autosave started")
+                document = PieceTable.open(source)
+            else:
+                document = PieceTable()
+            for line in file:
+                try:
+                    start, end, lines = json.loads(line)
+                except (ValueError, TypeError):
+                    break  # Torn write at the end of the journal
+                document.replace_lines(start, end, lines)
+        document.edits = []
+        return document, source
+
+
+def styled_segments(line, runs):
+    """Split a line into (text, bold, italic) segments according to (start, end, style) formatting runs."""
+    boundaries = sorted({0, len(line)} | {min(position, len(line)) for start, end, _ in runs for position in (start, end)})
+    segments = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        styles = {style for run_start, run_end, style in runs if run_start <= start and end <= run_end}
+        segments.append((line[start:end], "bold" in styles, "italic" in styles))
+    return segments or [("", False, False)]
+
+
+def export_worker(kind, filepath, temp_path, chunks, progress):
+    """
+    Write a document received in chunks of (line, runs) pairs to a TXT, DOCX or PDF file.
+    The file is written to temp_path next to the target and renamed over it once complete, since the target
+    may be the memory-mapped source; the parent removes temp_path if the worker fails or is terminated.
+    Runs in a separate process; reports ("progress", lines written), then ("done", None) or ("error", message).
+    """
+    try:
+        written = 0
+        if kind == "txt":
+            with open(temp_path, "w", encoding="utf-8", errors=TEXT_ERRORS) as file:
+                for chunk in iter(chunks.get, None):
+                    for line, _ in chunk:
+                        file.write("\n" if written else "")
+                        file.write(line)
+                        written += 1
+                    progress.put(("progress", written))
+        elif kind == "docx":
+            document = Document()
+            for chunk in iter(chunks.get, None):
+                for line, runs in chunk:
+                    paragraph = document.add_paragraph()
+                    for text, bold, italic in styled_segments(line, runs):
+                        run = paragraph.add_run(text)
+                        run.bold, run.italic = bold, italic
+                written += len(chunk)
+                progress.put(("progress", written))
+            document.save(temp_path)
+        else:
+            pdf = FPDF()
+            pdf.add_page()
+            pdf.set_auto_page_break(auto=True, margin=15)
+            for chunk in iter(chunks.get, None):
+                for line, runs in chunk:
+                    for text, bold, italic in styled_segments(line, runs):
+                        pdf.set_font("Arial", style=("B" if bold else "") + ("I" if italic else ""), size=12)
+                        pdf.write(10, text)
+                    pdf.ln(10)
+                written += len(chunk)
+                progress.put(("progress", written))
+            pdf.output(temp_path)
+        keep_mode(temp_path, filepath)
+        os.replace(temp_path, filepath)
+        progress.put(("done", None))
+    except Exception as e:
+        progress.put(("error", str(e)))
+
+
+class DocumentExporter:
+    def __init__(self, kind, filepath, document, runs, on_progress, on_done):
+        """
+        Export a document snapshot through a worker process without blocking the editor.
+        :param runs: Formatting runs as {line: [(start, end, style)]}.
+        :param on_progress: Called from a helper thread as on_progress(lines written, total lines).
+        :param on_done: Called from a helper thread as on_done(error or None); "cancelled" after cancel().
+        """
+        self.kind = kind
+        self.filepath = filepath
+        self.document = document
+        self.runs = runs
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.cancelled = threading.Event()
+        self.context = multiprocessing.get_context("spawn")
+        self.chunks = self.context.Queue(maxsize=4)  # Bounded, so the document is never copied in full
+        self.progress = self.context.Queue()
+        self.temp_path = None
+        self.process = None
+
+    def start(self):
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, self.temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.filepath)}.", suffix=".tmp",
+                                              dir=directory)
+        os.close(fd)
+        self.process = self.context.Process(
+            target=export_worker, args=(self.kind, self.filepath, self.temp_path, self.chunks, self.progress),
+            daemon=True)
+        self.process.start()
+        threading.Thread(target=self.feed, daemon=True).start()
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.chunks.cancel_join_thread()  # Chunks still buffered for the dead worker must not block exit
+        self.process.terminate()
+
+    def feed(self):
+        """Send the document to the worker chunk by chunk."""
+        chunk = []
+        for number, line in enumerate(self.document.iter_lines()):
+            chunk.append((line, self.runs.get(number, [])))
+            if len(chunk) == EXPORT_CHUNK:
+                if not self.send(chunk):
+                    return
+                chunk = []
+        if chunk and not self.send(chunk):
+            return
+        self.send(None)
+
+    def send(self, item):
+        """Put an item on the bounded chunk queue; gives up once the export is cancelled."""
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def watch(self):
+        """Relay progress messages from the worker until it finishes."""
+        total = self.document.line_count()
+        while True:
+            try:
+                kind, value = self.progress.get(timeout=0.2)
+            except queue.Empty:
+                if self.cancelled.is_set() or not self.process.is_alive():
+                    self.finish("cancelled" if self.cancelled.is_set() else "export process stopped")
+                    return
+                continue
+            if kind == "progress":
+                self.on_progress(value, total)
+            else:
+                self.finish(value)
+                return
+
+    def finish(self, error):
+        """Wait for the worker to exit, then remove its temp file unless it was renamed into place."""
+        self.process.join()
+        if error:
+            remove_file(self.temp_path)
+        self.on_done(error)
+
+
+class Buffer:
+    def __init__(self, document, current_file, autosave):
+        """
+        One open document. Only the active buffer is shown in the text area; the others keep their
+        window position, cursor and formatting tags in view until they are selected again.
+        """
+        self.document = document
+        self.current_file = current_file
+        self.autosave = autosave
+        self.window_start = 0
+        self.window_end = 1
+        self.saved_version = 0
+        self.export_version = 0
+        self.runs = {}  # Formatting as {line: [(start, end, style)]}, kept in sync with the window's tags
+        self.highlighter = None
+        self.view = None  # (top line index, insert index) while the buffer is not shown
+        self.tab = None
+        self.spill_files = []
+        # Replace-all edits as (document version after, (pieces, runs) before, (pieces, runs) after);
+        # the text area's own undo stack only covers the window
+        self.replace_undo = []
+        self.replace_redo = []
+
+    def title(self):
+        return os.path.basename(self.current_file) if self.current_file else "Untitled"
+
+    def pristine(self):
+        return self.current_file is None and self.document.version == 0
+
+
+class BufferCache:
+    def __init__(self, on_spilled, limit=BUFFER_CACHE_BYTES):
+        """
+        LRU set of inactive buffers. When the edited lines they hold in memory exceed limit, the least
+        recently used buffers are written to temp files on a background thread and re-opened memory-mapped,
+        so their text is paged in from disk instead of held on the heap.
+        :param on_spilled: Called from the worker as on_spilled(buffer, version, path, error).
+        """
+        self.on_spilled = on_spilled
+        self.limit = limit
+        self.inactive = OrderedDict()  # buffer -> bytes held in memory, least recently used first
+        self.spilling = set()
+        self.requests = queue.Queue()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    @staticmethod
+    def memory(document):
+        """Approximate size of the lines a document holds in memory rather than in a mapped file."""
+        return sum(sum(map(len, source[offset:offset + count])) + count
+                   for source, offset, count in document.pieces if isinstance(source, list))
+
+    def touch(self, buffer):
+        """Mark a buffer as active again."""
+        self.inactive.pop(buffer, None)
+
+    def forget(self, buffer):
+        self.inactive.pop(buffer, None)
+        self.spilling.discard(buffer)
+
+    def release(self, buffer):
+        """Add a buffer that is no longer shown, spilling buffers until the cache is within its limit."""
+        self.inactive[buffer] = self.memory(buffer.document)
+        self.inactive.move_to_end(buffer)
+        total = sum(self.inactive.values())
+        for other, size in self.inactive.items():
+            if total <= self.limit:
+                break
+            if size and other not in self.spilling:
+                self.spilling.add(other)
+                self.requests.put((other, other.document.snapshot()))
+                total -= size
+
+    def spilled(self, buffer):
+        """Record that a spill finished and the buffer now reads its text from disk."""
+        self.spilling.discard(buffer)
+        if buffer in self.inactive:
+            self.inactive[buffer] = 0
+
+    def run(self):
+        while True:
+            buffer, document = self.requests.get()
+            try:
+                fd, path = tempfile.mkstemp(prefix="notepad-", suffix=".spill")
+                with os.fdopen(fd, "w", encoding="utf-8", errors=TEXT_ERRORS) as file:
+                    write_lines(file, document)
+                self.on_spilled(buffer, document.version, path, None)
+            except OSError as e:
+                self.on_spilled(buffer, document.version, None, e)
+
+
+def buffer_attribute(name):
+    """Property forwarding to the active buffer, so editor methods work on whichever tab is selected."""
+    return property(lambda self: getattr(self.buffer, name),
+                    lambda self, value: setattr(self.buffer, name, value))
+
+
 class AdvancedNotepadApp:
-    def __init__(self, root):
+    document = buffer_attribute("document")
+    current_file = buffer_attribute("current_file")
+    autosave = buffer_attribute("autosave")
+    window_start = buffer_attribute("window_start")
+    window_end = buffer_attribute("window_end")
+    saved_version = buffer_attribute("saved_version")
+    export_version = buffer_attribute("export_version")
+
+    def __init__(self, root, autosave_dir=AUTOSAVE_DIR):
         self.root = root
+        self.autosave_dir = autosave_dir
         self.root.title("Notepad App")
         self.root.geometry("1000x700")
         
@@ -32,7 +968,8 @@ class AdvancedNotepadApp:
         self.file_menu.add_command(label="Save As (DOCX)", command=self.save_file_as_docx)
         self.file_menu.add_command(label="Save As (PDF)", command=self.save_file_as_pdf)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Exit", command=self.root.quit)
+        self.file_menu.add_command(label="Close Tab", command=self.close_tab)
+        self.file_menu.add_command(label="Exit", command=self.exit_app)
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
 
         self.edit_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -58,22 +995,72 @@ class AdvancedNotepadApp:
         self.search_replace_btn = ttk.Button(self.toolbar, text="Search/Replace", command=self.toggle_search_replace)
         self.search_replace_btn.pack(side=tk.LEFT, padx=2)
         
-        # Text Editor
-        self.text_area = ScrolledText(self.main_frame, wrap=tk.WORD, font=("Helvetica", 12))
-        self.text_area.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.main_frame.rowconfigure(1, weight=1)
+        self.position_label = ttk.Label(self.toolbar, text="")
+        self.position_label.pack(side=tk.RIGHT, padx=2)
+
+        self.cancel_export_btn = ttk.Button(self.toolbar, text="Cancel Export", command=self.cancel_export, state=tk.DISABLED)
+        self.cancel_export_btn.pack(side=tk.RIGHT, padx=2)
+        self.export_label = ttk.Label(self.toolbar, text="")
+        self.export_label.pack(side=tk.RIGHT, padx=2)
+        self.exporter = None
+
+        # Tabs; the notebook only selects the buffer shown in the single text area
+        self.notebook = ttk.Notebook(self.main_frame)
+        self.notebook.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Text Editor, showing a window of the active document's lines
+        self.text_area = ScrolledText(self.main_frame, wrap=tk.WORD, font=("Helvetica", 12), undo=True)
+        self.text_area.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.text_area.configure(yscrollcommand=self.on_text_scroll)
+        self.shifting_window = False
+        self.main_frame.rowconfigure(2, weight=1)
         self.main_frame.columnconfigure(0, weight=1)
 
         # Notifications Panel
         self.notifications_panel = tk.Text(self.main_frame, height=5, wrap=tk.WORD, state=tk.DISABLED, bg="#f5f5f5")
-        self.notifications_panel.grid(row=3, column=0, sticky=(tk.W, tk.E))
+        self.notifications_panel.grid(row=4, column=0, sticky=(tk.W, tk.E))
 
         # AZD Label
         self.azd_label = ttk.Label(self.main_frame, text="AZD", anchor=tk.CENTER, font=("Helvetica", 10))
-        self.azd_label.grid(row=4, column=0, sticky=(tk.W, tk.E))
+        self.azd_label.grid(row=5, column=0, sticky=(tk.W, tk.E))
+
+        # Search state; worker threads hand results to the Tk thread through ui_queue
+        self.ui_queue = queue.Queue()
+        self.search_engine = SearchEngine(lambda *result: self.call_in_ui(self.add_matches, *result),
+                                          lambda *result: self.call_in_ui(self.finish_replace, *result))
+        self.replace_request = None  # (generation, buffer, word, replacement) of the running replace-all
+        self.search_generation = 0
+        self.search_matches = []
+        self.search_word = ""
+        self.search_incremental = False
+        self.search_done = True
+        self.search_after_id = None
+        self.regex_var = tk.BooleanVar(value=False)
+        self.highlight_after_id = None
+        self.highlight_window = None
+        self.text_area.tag_config("keyword", foreground="#0033b3")
+        self.text_area.tag_config("string", foreground="#067d17")
+        self.text_area.tag_config("comment", foreground="#8c8c8c")
+        self.text_area.tag_config("number", foreground="#1750eb")
+        self.text_area.tag_config("bold", font=("Helvetica", 12, "bold"))
+        self.text_area.tag_config("italic", font=("Helvetica", 12, "italic"))
+        self.text_area.tag_config("search", background="yellow")
+
+        # Autosave: edits are journaled once typing pauses; unsaved work survives a crash
+        self.autosave_after_id = None
+        self.text_area.bind("<<Modified>>", self.on_text_modified)
+        self.text_area.bind("<KeyRelease>", self.schedule_autosave)
+        self.text_area.bind("<KeyRelease>", self.schedule_highlight, add="+")
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
 
-        # Variables
-        self.current_file = None
+        # Open documents; inactive ones are handed to the buffer cache
+        self.buffer = None
+        self.tab_buffers = {}
+        self.buffer_cache = BufferCache(lambda *result: self.call_in_ui(self.finish_spill, *result))
+        self.add_buffer(PieceTable(), None)
+        self.process_ui_queue()
+        self.root.after_idle(self.recover_autosave)
 
     def toggle_search_replace(self):
         if self.search_replace_panel:
@@ -81,7 +1068,7 @@ class AdvancedNotepadApp:
             self.search_replace_panel = None
         else:
             self.search_replace_panel = ttk.Frame(self.main_frame)
-            self.search_replace_panel.grid(row=2, column=0, sticky=(tk.W, tk.E))
+            self.search_replace_panel.grid(row=3, column=0, sticky=(tk.W, tk.E))
 
             ttk.Label(self.search_replace_panel, text="Search:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
             search_entry = ttk.Entry(self.search_replace_panel)
@@ -93,10 +1080,28 @@ class AdvancedNotepadApp:
 
             search_btn = ttk.Button(self.search_replace_panel, text="Search", command=lambda: self.search_text(search_entry.get()))
             search_btn.grid(row=0, column=2, padx=5, pady=5)
+            search_entry.bind("<KeyRelease>", lambda event: self.schedule_search(search_entry.get()))
+
+            regex_check = ttk.Checkbutton(self.search_replace_panel, text="Regex", variable=self.regex_var)
+            regex_check.grid(row=0, column=3, padx=5, pady=5)
 
             replace_btn = ttk.Button(self.search_replace_panel, text="Replace", command=lambda: self.replace_text(search_entry.get(), replace_entry.get()))
             replace_btn.grid(row=1, column=2, padx=5, pady=5)
 
+    def call_in_ui(self, func, *args):
+        """Schedule func(*args) on the Tk thread; safe to call from worker threads."""
+        self.ui_queue.put((func, args))
+
+    def process_ui_queue(self):
+        """Run callbacks posted by worker threads, then reschedule itself."""
+        try:
+            for _ in range(50):
+                func, args = self.ui_queue.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        self.root.after(20, self.process_ui_queue)
+
     def log_message(self, message):
         """Logs messages to the notifications panel."""
         self.notifications_panel.config(state=tk.NORMAL)
@@ -105,73 +1110,402 @@ class AdvancedNotepadApp:
         self.notifications_panel.config(state=tk.DISABLED)
         self.notifications_panel.see(tk.END)
 
-    def new_file(self):
-        """Clears the text area for a new file."""
+    def add_buffer(self, document, current_file, recovered=False):
+        """Open a document in a new tab and show it. A pristine untitled tab is replaced."""
+        replaced = self.buffer if self.buffer and self.buffer.pristine() else None
+        buffer = Buffer(document, current_file,
+                        AutosaveJournal(lambda e: self.call_in_ui(self.log_message, f"Autosave failed: {e}"),
+                                        self.autosave_dir))
+        if recovered:
+            buffer.saved_version = None
+            buffer.autosave.compact(document.snapshot(), current_file)
+        else:
+            buffer.autosave.start(current_file)
+            if current_file:
+                buffer.runs = read_sidecar(current_file)
+        self.attach_highlighter(buffer)
+        tab = ttk.Frame(self.notebook, height=0)
+        buffer.tab = str(tab)
+        self.tab_buffers[buffer.tab] = buffer
+        self.notebook.add(tab, text=buffer.title())
+        if buffer is not self.buffer:
+            self.show_buffer(buffer)
+        if replaced:
+            self.remove_buffer(replaced)
+        return buffer
+
+    def on_tab_changed(self, event=None):
+        buffer = self.tab_buffers.get(self.notebook.select())
+        if buffer and buffer is not self.buffer:
+            self.show_buffer(buffer)
+
+    def show_buffer(self, buffer):
+        """Stash the active buffer and load another one into the text area."""
+        if self.buffer:
+            self.autosave_document()
+            self.buffer.view = (self.text_area.index("@0,0"), self.text_area.index(tk.INSERT))
+            self.buffer_cache.release(self.buffer)
+        self.buffer = buffer
+        self.buffer_cache.touch(buffer)
+        self.search_engine.cancel()
+        self.search_generation = None
+        self.search_matches = []
+        self.load_window(buffer.window_start, flush=False)
+        if buffer.view:
+            top, insert = buffer.view
+            self.text_area.mark_set(tk.INSERT, insert)
+            self.text_area.yview(top)
+            buffer.view = None
+        self.notebook.select(buffer.tab)
+
+    def remove_buffer(self, buffer):
+        """Drop a buffer and its tab, its autosave journal and spill files."""
+        buffer.autosave.discard()
+        self.buffer_cache.forget(buffer)
+        del self.tab_buffers[buffer.tab]
+        if buffer is self.buffer:
+            self.buffer = None
+            self.text_area.edit_modified(False)
+        self.notebook.forget(buffer.tab)
+        for path in buffer.spill_files:
+            remove_file(path)
+        if not self.tab_buffers:
+            self.add_buffer(PieceTable(), None)
+        elif self.buffer is None:
+            self.show_buffer(self.tab_buffers[self.notebook.select()])
+
+    def close_tab(self):
+        self.flush_window()
+        if self.document.version != self.saved_version and not askyesno("Close", "Discard unsaved changes?"):
+            return
+        self.log_message(f"Closed {self.buffer.title()}.")
+        self.remove_buffer(self.buffer)
+
+    def finish_spill(self, buffer, version, path, error):
+        """Switch a buffer to read from its spill file, unless it was edited or closed meanwhile."""
+        self.buffer_cache.spilled(buffer)
+        if error:
+            self.log_message(f"Could not move {buffer.title()} to disk: {error}")
+            return
+        if buffer.tab not in self.tab_buffers or buffer.document.version != version:
+            remove_file(path)
+            return
+        buffer.document.pieces = PieceTable.open(path).pieces
+        buffer.spill_files.append(path)
+
+    def load_window(self, start, flush=True):
+        """
+        Show the document lines starting at start in the text area, keeping edits of the old window.
+        flush is False when the text area still holds another buffer's window.
+        """
+        if flush:
+            self.flush_window()
+        start = max(0, start)
+        lines = self.document.get_lines(start, start + WINDOW_LINES)
+        if not lines and start > 0:
+            return
+        self.shifting_window = True
         self.text_area.delete(1.0, tk.END)
-        self.current_file = None
+        self.text_area.insert(tk.END, "\n".join(lines))
+        self.window_start, self.window_end = start, start + len(lines)
+        for line in range(start, self.window_end):
+            for first, last, style in self.buffer.runs.get(line, ()):
+                self.text_area.tag_add(style, f"{line - start + 1}.{first}", f"{line - start + 1}.{last}")
+        self.text_area.edit_reset()
+        self.text_area.edit_modified(False)
+        self.shifting_window = False
+        self.update_position_label()
+        self.schedule_highlight()
+
+    def flush_window(self):
+        """
+        Write edits made in the text area back into the document, replacing only the changed lines,
+        and its formatting tags into the buffer's runs.
+        """
+        old_end = self.window_end
+        if self.text_area.edit_modified():
+            self.flush_lines()
+        self.sync_runs(old_end)
+
+    def flush_lines(self):
+        new = self.text_area.get(1.0, "end-1c").split("\n")
+        old = self.document.get_lines(self.window_start, self.window_end)
+        prefix = 0
+        while prefix < min(len(old), len(new)) and old[prefix] == new[prefix]:
+            prefix += 1
+        if prefix == len(old) == len(new):
+            self.text_area.edit_modified(False)
+            return
+        suffix = 0
+        while suffix < min(len(old), len(new)) - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+        self.document.replace_lines(self.window_start + prefix, self.window_end - suffix,
+                                    new[prefix:len(new) - suffix])
+        if self.buffer.highlighter:
+            self.buffer.highlighter.edited(self.window_start + prefix)
+        self.window_end = self.window_start + len(new)
+        self.text_area.edit_modified(False)
+
+    def sync_runs(self, old_end):
+        """Replace the runs of the window's old lines by its current tags, shifting the runs after it."""
+        delta = self.window_end - old_end
+        runs = {}
+        for line, line_runs in self.buffer.runs.items():
+            if line < self.window_start:
+                runs[line] = line_runs
+            elif line >= old_end:
+                runs[line + delta] = line_runs
+        runs.update(self.format_runs())
+        self.buffer.runs = runs
+
+    def on_text_scroll(self, first, last):
+        """Update the scrollbar and slide the window when the user scrolls to one of its ends."""
+        self.text_area.vbar.set(first, last)
+        if self.shifting_window:
+            return
+        self.highlight_visible_matches()
+        self.schedule_highlight()
+        if float(last) >= 1.0 and self.document.get_lines(self.window_end, self.window_end + 1):
+            self.shifting_window = True
+            self.root.after_idle(self.shift_window, WINDOW_LINES // 2)
+        elif float(first) <= 0.0 and self.window_start > 0:
+            self.shifting_window = True
+            self.root.after_idle(self.shift_window, -(WINDOW_LINES // 2))
+
+    def shift_window(self, delta):
+        """Move the window by delta lines, keeping the line at the top of the view in place."""
+        top_line = self.window_start + int(self.text_area.index("@0,0").split(".")[0]) - 1
+        self.load_window(self.window_start + delta)
+        self.text_area.yview(f"{top_line - self.window_start + 1}.0")
+        self.shifting_window = False
+
+    def on_text_modified(self, event=None):
+        if self.text_area.edit_modified():
+            self.schedule_autosave()
+
+    def schedule_autosave(self, event=None):
+        """Journal the edits once the user pauses; every new edit restarts the timer."""
+        if self.autosave_after_id:
+            self.root.after_cancel(self.autosave_after_id)
+        self.autosave_after_id = self.root.after(AUTOSAVE_DELAY, self.autosave_document)
+
+    def autosave_document(self):
+        """Hand the line replacements made since the last autosave to the journal thread."""
+        self.autosave_after_id = None
+        self.flush_window()
+        self.journal_edits(self.buffer)
+
+    @staticmethod
+    def journal_edits(buffer):
+        edits, buffer.document.edits = buffer.document.edits, []
+        if edits:
+            buffer.autosave.record(edits, buffer.document.snapshot())
+
+    def recover_autosave(self):
+        """Offer to restore the documents of sessions that ended without saving their changes."""
+        sessions = AutosaveJournal.stale_sessions(self.autosave_dir)
+        if not sessions:
+            return
+        if not askyesno("Recover", f"The editor did not exit cleanly. Recover {len(sessions)} unsaved document(s)?"):
+            for journal_path in sessions:
+                AutosaveJournal.remove_files(journal_path)
+            return
+        for journal_path in sessions:
+            try:
+                document, source = AutosaveJournal.recover(journal_path)
+            except (OSError, ValueError) as e:
+                self.log_message(f"Could not recover unsaved changes: {e}")
+                continue
+            except (KeyError, TypeError) as e:  # Not a journal this editor wrote; it will never recover
+                self.log_message(f"Discarding unrecoverable autosave {os.path.basename(journal_path)}: {e}")
+                AutosaveJournal.remove_files(journal_path)
+                continue
+            buffer = self.add_buffer(document, source if source and os.path.exists(source) else None, recovered=True)
+            # The recovered state is snapshotted into the new journal before the old files are removed
+            buffer.autosave.remove_session(journal_path)
+            self.log_message(f"Recovered unsaved changes: {buffer.title()}")
+
+    def exit_app(self):
+        """Keep journals only for documents with unsaved changes, then quit once they are written."""
+        self.flush_window()
+        for buffer in self.tab_buffers.values():
+            if buffer.document.version == buffer.saved_version:
+                buffer.autosave.discard()
+            else:
+                self.journal_edits(buffer)
+        for buffer in self.tab_buffers.values():
+            buffer.autosave.close()
+            for path in buffer.spill_files:
+                remove_file(path)
+        self.root.quit()
+
+    def update_position_label(self):
+        index = self.document.pieces[-1][0]
+        total = "..." if isinstance(index, LineIndex) and not index.complete else self.document.line_count()
+        self.position_label.config(text=f"Lines {self.window_start + 1}-{self.window_end} of {total}")
+
+    def attach_highlighter(self, buffer):
+        """Give a buffer a highlighter for its file type, if there is a lexer for it."""
+        lexer = LEXERS.get(os.path.splitext(buffer.current_file or "")[1].lower())
+        if (type(buffer.highlighter.lexer) if buffer.highlighter else None) is lexer:
+            return
+        buffer.highlighter = None
+        if lexer:
+            highlighter = Highlighter(lexer(), lambda *result: self.call_in_ui(self.apply_tokens, highlighter, *result))
+            buffer.highlighter = highlighter
+        if buffer is self.buffer:
+            for tag in SYNTAX_TAGS:
+                self.text_area.tag_remove(tag, 1.0, tk.END)
+            self.schedule_highlight()
+
+    def schedule_highlight(self, event=None):
+        """Re-highlight the viewport once editing or scrolling pauses."""
+        if self.highlight_after_id:
+            self.root.after_cancel(self.highlight_after_id)
+        self.highlight_after_id = self.root.after(HIGHLIGHT_DELAY, self.highlight_viewport)
+
+    def highlight_viewport(self):
+        """Ask the buffer's highlighter for the tokens of the visible lines."""
+        self.highlight_after_id = None
+        if not self.buffer.highlighter:
+            return
+        self.flush_window()
+        top = int(self.text_area.index("@0,0").split(".")[0])
+        bottom = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        self.highlight_window = self.window_start
+        self.buffer.highlighter.request(self.document.snapshot(), self.window_start + top - 1,
+                                        self.window_start + bottom)
+
+    def apply_tokens(self, highlighter, generation, first, tokens):
+        """Tag the tokens of the visible lines, unless the document changed since they were requested."""
+        if (highlighter is not self.buffer.highlighter or generation != highlighter.generation
+                or self.highlight_window != self.window_start):
+            return
+        first_row = first - self.window_start + 1
+        last_row = first_row + len(tokens) - 1
+        if first_row < 1 or not tokens:
+            return
+        for tag in SYNTAX_TAGS:
+            self.text_area.tag_remove(tag, f"{first_row}.0", f"{last_row}.end")
+        for row, line_tokens in enumerate(tokens, first_row):
+            for start, end, tag in line_tokens:
+                self.text_area.tag_add(tag, f"{row}.{start}", f"{row}.{end}")
+
+    def format_runs(self):
+        """Return the bold/italic tag ranges of the text area as {document line: [(start, end, style)]}."""
+        runs = {}
+        for style in STYLES:
+            ranges = self.text_area.tag_ranges(style)
+            for start, end in zip(ranges[0::2], ranges[1::2]):
+                start_row, start_column = map(int, str(start).split("."))
+                end_row, end_column = map(int, str(end).split("."))
+                for row in range(start_row, end_row + 1):
+                    first = start_column if row == start_row else 0
+                    last = end_column if row == end_row else len(self.text_area.get(f"{row}.0", f"{row}.end"))
+                    runs.setdefault(self.window_start + row - 1, []).append((first, last, style))
+        return runs
+
+    def export_document(self, kind, filepath):
+        """Export a snapshot of the document in the background; editing continues meanwhile."""
+        if self.exporter:
+            self.log_message("An export is already running.")
+            return
+        self.flush_window()
+        self.export_version = self.document.version
+        buffer, runs = self.buffer, self.buffer.runs
+        exporter = DocumentExporter(
+            kind, filepath, self.document.snapshot(), runs,
+            on_progress=lambda written, total: self.call_in_ui(self.show_export_progress, written, total),
+            on_done=lambda error: self.call_in_ui(self.finish_export, buffer, kind, filepath, runs, error))
+        try:
+            exporter.start()
+        except OSError as e:
+            self.log_message(f"Export of {os.path.basename(filepath)} failed: {e}")
+            return
+        self.exporter = exporter
+        self.cancel_export_btn.config(state=tk.NORMAL)
+        self.export_label.config(text=f"Exporting {os.path.basename(filepath)}...")
+
+    def show_export_progress(self, written, total):
+        self.export_label.config(text=f"Exporting: {written * 100 // max(total, 1)}%")
+
+    def cancel_export(self):
+        if self.exporter:
+            self.exporter.cancel()
+
+    def finish_export(self, buffer, kind, filepath, runs, error):
+        self.exporter = None
+        self.cancel_export_btn.config(state=tk.DISABLED)
+        self.export_label.config(text="")
+        if error:
+            self.log_message(f"Export of {os.path.basename(filepath)} failed: {error}")
+            return
+        if kind == "txt":
+            try:
+                write_sidecar(filepath, runs)
+            except OSError as e:
+                self.log_message(f"Could not save formatting of {os.path.basename(filepath)}: {e}")
+        if kind == "txt" and buffer.tab in self.tab_buffers:
+            buffer.current_file = filepath
+            buffer.saved_version = buffer.export_version
+            if buffer is self.buffer:
+                self.flush_window()
+            buffer.document.edits = []
+            buffer.autosave.compact(buffer.document.snapshot(), filepath)
+            self.notebook.tab(buffer.tab, text=buffer.title())
+            self.attach_highlighter(buffer)
+        self.log_message(f"File saved as: {os.path.basename(filepath)}")
+
+    def new_file(self):
+        """Opens an empty document in a new tab."""
+        self.add_buffer(PieceTable(), None)
         self.log_message("Started a new file.")
 
     def open_file(self):
-        """Opens a file asynchronously."""
+        """Opens a file in a new tab by memory-mapping it; only the first window of lines is read."""
         from tkinter.filedialog import askopenfilename
 
-        def load_file(filepath):
-            with open(filepath, 'r') as file:
-                content = file.read()
-                self.text_area.delete(1.0, tk.END)
-                self.text_area.insert(tk.END, content)
-                self.current_file = filepath
+        filepath = askopenfilename()
+        if filepath:
+            try:
+                document = PieceTable.open(filepath)
+            except OSError as e:
+                self.log_message(f"Could not open file: {e}")
+                return
+            self.add_buffer(document, filepath)
             self.log_message(f"File opened: {os.path.basename(filepath)}")
 
-        async def async_open_file():
-            filepath = askopenfilename()
-            if filepath:
-                load_file(filepath)
-        
-        threading.Thread(target=lambda: asyncio.run(async_open_file())).start()
-
     def save_file_as_txt(self):
         """Saves the current content to a new TXT file."""
         filepath = asksaveasfilename(defaultextension=".txt",
                                       filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
         if filepath:
-            with open(filepath, 'w') as file:
-                file.write(self.text_area.get(1.0, tk.END).strip())
-            self.current_file = filepath
-            self.log_message(f"File saved as: {os.path.basename(filepath)}")
+            self.export_document("txt", filepath)
 
     def save_file_as_docx(self):
         """Saves the current content to a DOCX file."""
         filepath = asksaveasfilename(defaultextension=".docx",
                                       filetypes=[("Word Documents", "*.docx"), ("All files", "*.*")])
         if filepath:
-            document = Document()
-            document.add_paragraph(self.text_area.get(1.0, tk.END).strip())
-            document.save(filepath)
-            self.log_message(f"File saved as: {os.path.basename(filepath)}")
+            self.export_document("docx", filepath)
 
     def save_file_as_pdf(self):
         """Saves the current content to a PDF file."""
         filepath = asksaveasfilename(defaultextension=".pdf",
                                       filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")])
         if filepath:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.set_font("Arial", size=12)
-            content = self.text_area.get(1.0, tk.END).strip()
-            for line in content.split("\n"):
-                pdf.cell(200, 10, txt=line, ln=True)
-            pdf.output(filepath)
-            self.log_message(f"File saved as: {os.path.basename(filepath)}")
+            self.export_document("pdf", filepath)
 
     def undo(self):
-        """Undo the last operation."""
+        """Undo the last operation; past the text area's own undo stack, undo the last replace-all."""
         try:
             self.text_area.edit_undo()
             self.log_message("Undo action performed.")
         except tk.TclError:
-            self.log_message("Nothing to undo.")
+            if self.swap_replace(self.buffer.replace_undo, self.buffer.replace_redo):
+                self.log_message("Undo action performed.")
+            else:
+                self.log_message("Nothing to undo.")
 
     def redo(self):
         """Redo the last undone operation."""
@@ -179,7 +1513,39 @@ class AdvancedNotepadApp:
             self.text_area.edit_redo()
             self.log_message("Redo action performed.")
         except tk.TclError:
-            self.log_message("Nothing to redo.")
+            if self.swap_replace(self.buffer.replace_redo, self.buffer.replace_undo):
+                self.log_message("Redo action performed.")
+            else:
+                self.log_message("Nothing to redo.")
+
+    def swap_replace(self, stack, other):
+        """
+        Move the last replace-all from stack to other, restoring the document it replaced.
+        Only possible while the document is unchanged since; any later edit forgets both stacks.
+        """
+        self.flush_window()
+        if not stack or stack[-1][0] != self.document.version:
+            self.buffer.replace_undo, self.buffer.replace_redo = [], []
+            return False
+        _, state, restored = stack.pop()
+        self.set_document(*state)
+        other.append((self.document.version, restored, state))
+        return True
+
+    def set_document(self, pieces, runs, edits, window_start):
+        """
+        Swap in the pieces of a replace-all or its undo as one edit. edits are the same change as line
+        replacements for the autosave journal, last line first so each applies to the lines before it.
+        """
+        buffer = self.buffer
+        buffer.document.pieces = list(pieces)
+        buffer.document.version += 1
+        buffer.document.edits.extend(edits)
+        buffer.runs = runs
+        if buffer.highlighter:
+            buffer.highlighter.edited(edits[-1][0] if edits else 0)
+        self.load_window(window_start, flush=False)
+        self.schedule_autosave()
 
     def cut_text(self):
         """Cuts the selected text."""
@@ -208,7 +1574,6 @@ class AdvancedNotepadApp:
     def make_bold(self):
         """Makes selected text bold."""
         try:
-            self.text_area.tag_configure("bold", font=("Helvetica", 12, "bold"))
             current_tags = self.text_area.tag_names(tk.SEL_FIRST)
             if "bold" in current_tags:
                 self.text_area.tag_remove("bold", tk.SEL_FIRST, tk.SEL_LAST)
@@ -221,7 +1586,6 @@ class AdvancedNotepadApp:
     def make_italic(self):
         """Makes selected text italic."""
         try:
-            self.text_area.tag_configure("italic", font=("Helvetica", 12, "italic"))
             current_tags = self.text_area.tag_names(tk.SEL_FIRST)
             if "italic" in current_tags:
                 self.text_area.tag_remove("italic", tk.SEL_FIRST, tk.SEL_LAST)
@@ -231,29 +1595,103 @@ class AdvancedNotepadApp:
         except tk.TclError:
             self.log_message("No text selected to apply italic.")
 
-    def search_text(self, word):
-        """Search for a specific word in the text area."""
+    def schedule_search(self, word):
+        """Search incrementally once the user pauses typing."""
+        if self.search_after_id:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DELAY, self.search_text, word, True)
+
+    def search_text(self, word, incremental=False):
+        """Search the whole document in the background; matches are highlighted as they come in."""
+        self.search_after_id = None
         self.text_area.tag_remove("search", 1.0, tk.END)
-        if word:
-            start_pos = 1.0
-            while True:
-                start_pos = self.text_area.search(word, start_pos, stopindex=tk.END)
-                if not start_pos:
-                    break
-                end_pos = f"{start_pos}+{len(word)}c"
-                self.text_area.tag_add("search", start_pos, end_pos)
-                start_pos = end_pos
-            self.text_area.tag_config("search", background="yellow")
-            self.log_message(f"Search completed for: {word}")
+        self.search_matches = []
+        self.search_word = word
+        self.search_incremental = incremental
+        self.search_done = False
+        if not word:
+            self.search_engine.cancel()
+            return
+        self.flush_window()
+        self.search_generation = self.search_engine.search(self.document.snapshot(), word, self.regex_var.get())
+
+    def add_matches(self, generation, matches, done, error):
+        """Collect a batch of matches from the search thread."""
+        if generation != self.search_generation:
+            return
+        self.search_done = done
+        if error:
+            self.log_message(f"Invalid search pattern: {error}")
+            return
+        self.search_matches.extend(matches)
+        self.highlight_visible_matches()
+        if done and not self.search_incremental:
+            self.log_message(f"Search completed for: {self.search_word} ({len(self.search_matches)} matches)")
+
+    def highlight_visible_matches(self):
+        """Tag only the matches inside the visible part of the text area."""
+        if not self.search_matches:
+            return
+        top = int(self.text_area.index("@0,0").split(".")[0])
+        bottom = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        self.text_area.tag_remove("search", 1.0, tk.END)
+        first_line = self.window_start + top - 1
+        start = bisect.bisect_left(self.search_matches, (first_line, -1, -1))
+        end = bisect.bisect_left(self.search_matches, (self.window_start + bottom, -1, -1))
+        for line, start_column, end_column in self.search_matches[start:end]:
+            row = line - self.window_start + 1
+            self.text_area.tag_add("search", f"{row}.{start_column}", f"{row}.{end_column}")
 
     def replace_text(self, word, replacement):
-        """Replace a specific word in the text area."""
+        """
+        Replace every match in the background. The rewritten document shares the pieces of unchanged lines,
+        so only changed lines take memory; the whole replace is one step for Undo and formatting runs stay
+        on their lines.
+        """
         if word and replacement:
-            content = self.text_area.get(1.0, tk.END)
-            new_content = content.replace(word, replacement)
-            self.text_area.delete(1.0, tk.END)
-            self.text_area.insert(tk.END, new_content)
-            self.log_message(f"Replaced '{word}' with '{replacement}'.")
+            regex = self.regex_var.get()
+            try:
+                SearchEngine.compile(word, regex)
+            except re.error as e:
+                self.log_message(f"Invalid search pattern: {e}")
+                return
+            self.search_generation = None
+            self.search_matches = []
+            self.text_area.tag_remove("search", 1.0, tk.END)
+            self.flush_window()
+            generation = self.search_engine.replace(self.document.snapshot(), word, regex, replacement)
+            self.replace_request = (generation, self.buffer, word, replacement)
+            self.log_message(f"Replacing '{word}' with '{replacement}'...")
+
+    def finish_replace(self, generation, document, result, count, error):
+        """Apply a replace-all computed on a snapshot, unless the document changed meanwhile."""
+        if not self.replace_request or self.replace_request[0] != generation:
+            return
+        _, buffer, word, replacement = self.replace_request
+        self.replace_request = None
+        if error:
+            self.log_message(f"Invalid replacement: {error}")
+            return
+        if buffer is not self.buffer:
+            return
+        self.flush_window()
+        if self.document.version != document.version:
+            self.log_message("The document was edited during the replace; nothing was replaced.")
+            return
+        if count:
+            pieces, redo_edits, undo_edits, split_lines, shifts = result
+
+            def moved(line):
+                index = bisect.bisect_left(split_lines, line)
+                return line + (shifts[index - 1] if index else 0)
+
+            before = (list(self.document.pieces), self.buffer.runs, undo_edits, self.window_start)
+            after = (pieces, {moved(line): line_runs for line, line_runs in self.buffer.runs.items()}, redo_edits,
+                     moved(self.window_start))
+            self.set_document(*after)
+            self.buffer.replace_undo.append((self.document.version, before, after))
+            self.buffer.replace_redo = []
+        self.log_message(f"Replaced '{word}' with '{replacement}' ({count} occurrences).")
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+from notepad_app import AdvancedNotepadApp, PieceTable
+
+SIZES = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+LOG_LINES = [
+    "2024-05-17 12:00:{second:02d} INFO worker-{worker} request {number} served in {millis} ms",
+    "2024-05-17 12:00:{second:02d} DEBUG worker-{worker} cache hit for key user:{number}",
+    "2024-05-17 12:00:{second:02d} ERROR worker-{worker} request {number} failed: timeout after {millis} ms",
+]
+
+
+def parse_size(text):
+    """Parse sizes like 1KB, 10MB or 1GB into bytes."""
+    text = text.strip().upper()
+    for suffix, factor in SIZES.items():
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def generate_log(path, size):
+    """Write a log-like text file of about size bytes; every third line contains ERROR."""
+    lines = [LOG_LINES[number % 3].format(second=number % 60, worker=number % 8, number=number,
+                                          millis=number % 997) for number in range(20000)]
+    block = "\n".join(lines) + "\n"
+    with open(path, "w", encoding="utf-8") as file:
+        written = 0
+        while written < size:
+            chunk = block[:size - written]
+            file.write(chunk)
+            written += len(chunk)
+
+
+def percentiles(samples):
+    """Nearest-rank p50/p95/p99 of a list of samples."""
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "mean": sum(ordered) / len(ordered),
+            "samples": len(ordered)}
+
+
+class NotepadBenchmark:
+    def __init__(self, workdir, runs, keystrokes, export_limit):
+        """
+        Drive an AdvancedNotepadApp with Tk withdrawn (or under Xvfb) and time its operations.
+        :param export_limit: Largest file size exported as DOCX and PDF; TXT is always exported.
+        """
+        self.workdir = workdir
+        self.runs = runs
+        self.keystrokes = keystrokes
+        self.export_limit = export_limit
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.app = AdvancedNotepadApp(self.root, autosave_dir=os.path.join(workdir, "autosave"))
+
+    def pump(self, until, timeout=3600):
+        """Run the Tk event loop until until() is true."""
+        deadline = time.perf_counter() + timeout
+        while not until():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("benchmark step did not finish")
+            self.root.update()
+            time.sleep(0.001)
+
+    def open(self, path):
+        start = time.perf_counter()
+        self.app.add_buffer(PieceTable.open(path), path)
+        self.root.update_idletasks()
+        return time.perf_counter() - start
+
+    def close(self):
+        self.app.remove_buffer(self.app.buffer)
+
+    def measure(self, path):
+        size = os.path.getsize(path)
+        samples = {"open_s": [], "keystroke_ms": [], "search_mb_s": [], "replace_mb_s": []}
+        for _ in range(self.runs):
+            samples["open_s"].append(self.open(path))
+            text_area = self.app.text_area
+            text_area.mark_set(tk.INSERT, "1.0")
+            for _ in range(self.keystrokes):
+                start = time.perf_counter()
+                text_area.insert(tk.INSERT, "x")
+                text_area.event_generate("<KeyRelease>")
+                self.root.update_idletasks()
+                samples["keystroke_ms"].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            self.app.search_text("ERROR")
+            self.pump(lambda: self.app.search_done)
+            samples["search_mb_s"].append(size / (1 << 20) / (time.perf_counter() - start))
+
+            start = time.perf_counter()
+            self.app.replace_text("ERROR", "FAILURE")
+            samples["replace_mb_s"].append(size / (1 << 20) / (time.perf_counter() - start))
+
+            for kind in ("txt", "docx", "pdf"):
+                if kind != "txt" and size > self.export_limit:
+                    continue
+                target = os.path.join(self.workdir, f"export.{kind}")
+                start = time.perf_counter()
+                self.app.export_document(kind, target)
+                self.pump(lambda: self.app.exporter is None)
+                samples.setdefault(f"export_{kind}_s", []).append(time.perf_counter() - start)
+                os.remove(target)
+            self.close()
+        return {metric: percentiles(values) for metric, values in samples.items()}
+
+    def shutdown(self):
+        for buffer in self.app.tab_buffers.values():
+            buffer.autosave.discard()
+            buffer.autosave.close()
+        self.root.destroy()
+
+
+def compare(results, baseline, tolerance):
+    """Return (size, metric, baseline p50, p50, ratio) for every metric that got worse by more than tolerance."""
+    regressions = []
+    for size, metrics in results.items():
+        for metric, values in metrics.items():
+            reference = baseline.get(size, {}).get(metric)
+            if not reference or not reference["p50"]:
+                continue
+            # Throughputs regress when they drop, times when they grow
+            ratio = (reference["p50"] / values["p50"] if metric.endswith("_mb_s")
+                     else values["p50"] / reference["p50"])
+            if ratio > 1 + tolerance:
+                regressions.append((size, metric, reference["p50"], values["p50"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the notepad on generated log files.")
+    parser.add_argument("--sizes", default="1KB,1MB,100MB", help="Comma-separated file sizes, e.g. 1KB,1MB,1GB")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keystrokes", type=int, default=200, help="Keystrokes timed per run")
+    parser.add_argument("--export-limit", default="10MB", help="Largest file exported as DOCX and PDF")
+    parser.add_argument("--output", default="notepad_benchmark.json")
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed slowdown before failing")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="notepad-benchmark-")
+    try:
+        benchmark = NotepadBenchmark(workdir, args.runs, args.keystrokes, parse_size(args.export_limit))
+        results = {}
+        for label in args.sizes.split(","):
+            path = os.path.join(workdir, f"log-{label.strip()}.txt")
+            generate_log(path, parse_size(label))
+            print(f"Benchmarking {label.strip()}...")
+            results[label.strip()] = benchmark.measure(path)
+            os.remove(path)
+        benchmark.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for size, metric, reference, value, ratio in regressions:
+            print(f"REGRESSION {size} {metric}: {reference:.4g} -> {value:.4g} ({ratio:.2f}x worse)")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
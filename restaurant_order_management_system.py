@@ -1,10 +1,40 @@
 import tkinter as tk
 from tkinter import ttk
+from tkinter.messagebox import showerror
 from threading import Thread
+import argparse
 import asyncio
-from datetime import datetime
+import bisect
+import heapq
+import hmac
+import itertools
+import json
+import os
+import queue
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
 
-# Mock database for menu items and orders
+ORDERS_PATH = os.path.join(os.path.expanduser("~"), ".restaurant_orders.sqlite3")
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_TOKEN_PATH = os.path.join(os.path.expanduser("~"), ".restaurant_service_token")  # Owner-only shared secret
+BATCH_SIZE = 200  # Orders committed in one transaction at most
+BATCH_DELAY = 0.02  # Seconds the committer waits for more orders before committing a batch
+SUBSCRIBER_BUFFER = 1 << 20  # Unsent bytes after which a subscriber that stopped reading is dropped
+RECONNECT_DELAY = 1000  # Milliseconds before an app reconnects after losing the service
+LEDGER_FETCH = 10000  # Order rows read from the database at a time when the ledger catches up
+REPORT_TOP = 20  # Customers listed in a report
+PICKER_ROWS = 4  # Rows of menu item cells that exist in the order screen; scrolling rebinds them
+PICKER_COLUMNS = 5
+KITCHEN_POLICY = "spt"  # Order in which each kitchen station takes its tickets, see POLICIES
+SIMULATION_SPEED = 10  # How much faster than recorded a simulated service is replayed
+
+# Default menu, stored in the order database on first run
 menu_items = {
     "Pizza": 10.99,
     "Burger": 7.99,
@@ -13,26 +43,978 @@ menu_items = {
     "Soda": 1.99
 }
 
-orders = []  # List to store orders
+# Kitchen station of each menu item; items added later go to the default station
+stations = {
+    "Pizza": "oven",
+    "Burger": "grill",
+    "Pasta": "stove",
+    "Salad": "cold",
+    "Soda": "bar"
+}
+default_station = "kitchen"
+# Prep seconds assumed per unit of an item until it has a prep history
+station_prep = {"oven": 600, "grill": 420, "stove": 480, "cold": 180, "bar": 30, "kitchen": 300}
+
+# Heap keys of a ticket's station tasks from its arrival time and estimated prep time (that of its slowest
+# station); the smallest key is served first. Every station orders tickets the same way, so a ticket's items
+# are prepared around the same time.
+POLICIES = {
+    "fifo": lambda arrival, estimate: arrival,
+    "spt": lambda arrival, estimate: estimate,  # Shortest ticket first, which minimizes the mean wait
+    "balanced": lambda arrival, estimate: arrival + estimate,  # Earliest finish had it started on arrival
+}
 
 # Discount and Tax Settings
 discount_rate = 0.1  # 10% discount
 tax_rate = 0.07  # 7% tax
 
+# Pricing rules of bills; reports use the discount and tax rates above only
+tax_classes = {"Soda": "beverage"}  # Items not listed are taxed as standard
+tax_rates = {"standard": tax_rate, "beverage": 0.05}
+happy_hours = [(17, 19, {"Soda": 0.5, "Pizza": 0.2})]  # (first hour, end hour, {item: discount rate})
+combos = [({"Burger": 1, "Soda": 1}, 1.50), ({"Pizza": 1, "Salad": 1}, 2.00)]  # ({item: count}, amount off)
+
+
+def discount_and_tax(amount):
+    """Return (discount, tax, net total) for an amount; linear, so it applies to sums as well as to lines."""
+    discount = amount * discount_rate
+    tax = (amount - discount) * tax_rate
+    return discount, tax, amount - discount + tax
+
+
+class OrderStore:
+    def __init__(self, path=ORDERS_PATH):
+        """
+        Persistent SQLite store of the menu and order lines. Orders stay open until reset; running totals of
+        the open orders are kept per customer and updated in the same transaction as the orders, so totals
+        never need a scan of the order history and survive a restart.
+        :param path: Location of the database.
+        """
+        self.path = path
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS menu (item TEXT PRIMARY KEY, price REAL)")
+            connection.execute("""CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY, customer TEXT, item TEXT, quantity INTEGER, total REAL,
+                created REAL, open INTEGER DEFAULT 1)""")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS running_totals (customer TEXT PRIMARY KEY, total REAL, lines INTEGER)")
+            connection.execute("CREATE INDEX IF NOT EXISTS orders_customer ON orders (customer)")
+            connection.execute("CREATE INDEX IF NOT EXISTS orders_item ON orders (item)")
+            connection.execute("CREATE INDEX IF NOT EXISTS orders_created ON orders (created)")
+            connection.execute("CREATE INDEX IF NOT EXISTS orders_open ON orders (id) WHERE open = 1")
+            # Kitchen history: station seconds spent on a line and when its ticket was ready
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(orders)")}
+            for column in ("prep", "ready"):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE orders ADD COLUMN {column} REAL")
+            if not connection.execute("SELECT 1 FROM menu LIMIT 1").fetchone():
+                connection.executemany("INSERT INTO menu VALUES (?, ?)", menu_items.items())
+            self.menu_items = dict(connection.execute("SELECT item, price FROM menu ORDER BY rowid"))
+            self.grand_total = connection.execute("SELECT COALESCE(SUM(total), 0) FROM running_totals").fetchone()[0]
+
+    def connect(self):
+        """Open a new connection; each thread uses its own."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def set_price(self, item, price):
+        with self.connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO menu VALUES (?, ?)", (item, price))
+        self.menu_items[item] = price
+
+    def add_orders(self, customer, lines):
+        """
+        Store (item, quantity) lines for a customer in one transaction.
+        :return: The stored lines as (id, customer, item, quantity, total, created) tuples.
+        """
+        return self.add_batch([(customer, lines)])[0]
+
+    def add_batch(self, orders):
+        """
+        Store several (customer, [(item, quantity)]) orders in one transaction.
+        :return: The stored lines of each order, as lists of (id, customer, item, quantity, total, created) tuples.
+        """
+        created = time.time()
+        results, added = [], 0
+        with self.connect() as connection:
+            for customer, lines in orders:
+                rows = []
+                for item, quantity in lines:
+                    total = self.menu_items[item] * quantity
+                    cursor = connection.execute(
+                        "INSERT INTO orders (customer, item, quantity, total, created) VALUES (?, ?, ?, ?, ?)",
+                        (customer, item, quantity, total, created))
+                    rows.append((cursor.lastrowid, customer, item, quantity, total, created))
+                if rows:
+                    subtotal = sum(row[4] for row in rows)
+                    connection.execute("""INSERT INTO running_totals VALUES (?, ?, ?) ON CONFLICT (customer)
+                        DO UPDATE SET total = total + excluded.total, lines = lines + excluded.lines""",
+                                       (customer, subtotal, len(rows)))
+                    added += subtotal
+                results.append(rows)
+        self.grand_total += added
+        return results
+
+    def open_orders(self):
+        """Open order lines as (id, customer, item, quantity, total, created) tuples, oldest first."""
+        with self.connect() as connection:
+            return connection.execute(
+                "SELECT id, customer, item, quantity, total, created FROM orders WHERE open = 1 ORDER BY id").fetchall()
+
+    def refresh(self):
+        """Reload the menu and grand total, e.g. after missing updates made by other processes."""
+        with self.connect() as connection:
+            self.menu_items = dict(connection.execute("SELECT item, price FROM menu ORDER BY rowid"))
+            self.grand_total = connection.execute("SELECT COALESCE(SUM(total), 0) FROM running_totals").fetchone()[0]
+
+    def kitchen_lines(self):
+        """Open order lines the kitchen has not finished, as (id, customer, item, quantity, created) tuples."""
+        with self.connect() as connection:
+            return connection.execute("SELECT id, customer, item, quantity, created FROM orders "
+                                      "WHERE open = 1 AND ready IS NULL ORDER BY id").fetchall()
+
+    def record_prep(self, rows):
+        """Store (prep, ready, id) rows of finished kitchen tasks."""
+        with self.connect() as connection:
+            connection.executemany("UPDATE orders SET prep = ?, ready = ? WHERE id = ?", rows)
+
+    def prep_estimates(self):
+        """Mean recorded prep seconds per unit of each item as {item: (mean, samples)}."""
+        with self.connect() as connection:
+            return {item: (mean, samples) for item, mean, samples in connection.execute(
+                "SELECT item, SUM(prep) / SUM(quantity), COUNT(prep) FROM orders "
+                "WHERE prep IS NOT NULL AND quantity > 0 GROUP BY item")}
+
+    def service_tickets(self, since, until):
+        """
+        The orders created in [since, until) as kitchen tickets, for replaying a service.
+        :return: [(arrival, ticket, customer, [(id, item, quantity)])] in arrival order and {id: recorded prep}.
+        """
+        tickets, recorded = [], {}
+        with self.connect() as connection:
+            rows = connection.execute("SELECT id, customer, item, quantity, created, prep FROM orders "
+                                      "WHERE created >= ? AND created < ? ORDER BY id", (since, until))
+            for order_id, customer, item, quantity, created, prep in rows:
+                if not tickets or tickets[-1][0] != created or tickets[-1][2] != customer:
+                    tickets.append((created, order_id, customer, []))
+                tickets[-1][3].append((order_id, item, quantity))
+                if prep is not None:
+                    recorded[order_id] = prep
+        return tickets, recorded
+
+    def customer_totals(self):
+        """Running totals of the open orders as {customer: total}."""
+        with self.connect() as connection:
+            return dict(connection.execute("SELECT customer, total FROM running_totals"))
+
+    def reset(self):
+        """Close all open orders; they stay in the history."""
+        with self.connect() as connection:
+            connection.execute("UPDATE orders SET open = 0 WHERE open = 1")
+            connection.execute("DELETE FROM running_totals")
+        self.grand_total = 0
+
+
+class PricingEngine:
+    def __init__(self, menu):
+        """
+        Bills open orders grouped by customer. The pricing rules are compiled per item into a tax rate and an
+        hourly happy-hour rate, and combos into per-item shares of their discount, so a customer is priced in
+        one pass over their lines. Priced customers are cached until they order again.
+        :param menu: {item: price}, used to share combo discounts between their items.
+        """
+        self.lines = {}  # customer -> [(item, quantity, total, created)]
+        self.bills = {}  # customer -> priced bill of the customer's lines
+        self.compile(menu)
+
+    def compile(self, menu):
+        """Compile the pricing rules for a menu; call again when prices change."""
+        self.default_rule = (tax_rates["standard"], [0.0] * 24)
+        self.rules = {}
+        for item in menu:
+            happy = [0.0] * 24
+            for first, end, rates in happy_hours:
+                for hour in range(first, end):
+                    happy[hour] = max(happy[hour], rates.get(item, 0.0))
+            self.rules[item] = (tax_rates[tax_classes.get(item, "standard")], happy)
+        self.combos = []  # ([(item, count)], [(item, tax rate, share of the amount off)])
+        for counts, amount in combos:
+            if not all(item in menu for item in counts):
+                continue
+            value = sum(menu[item] * count for item, count in counts.items())
+            self.combos.append((list(counts.items()),
+                                [(item, self.rules[item][0], amount * menu[item] * count / value)
+                                 for item, count in counts.items()]))
+        self.bills.clear()
+
+    def load(self, rows):
+        """Replace the billed lines by (id, customer, item, quantity, total, created) rows."""
+        self.clear()
+        self.add_lines(rows)
+
+    def add_lines(self, rows):
+        for _, customer, item, quantity, total, created in rows:
+            self.lines.setdefault(customer, []).append((item, quantity, total, created))
+            self.bills.pop(customer, None)
+
+    def clear(self):
+        self.lines.clear()
+        self.bills.clear()
+
+    def customer_bill(self, customer):
+        bill = self.bills.get(customer)
+        if bill is None:
+            bill = self.bills[customer] = self.price(customer, self.lines[customer])
+        return bill
+
+    def price(self, customer, lines):
+        gross = happy_off = combo_off = 0.0
+        counts = {}
+        taxable = {}  # tax rate -> amount after line discounts
+        text = [f"{customer}:"]
+        for item, quantity, total, created in lines:
+            rate, happy = self.rules.get(item, self.default_rule)
+            off = total * happy[time.localtime(created).tm_hour]
+            gross += total
+            happy_off += off
+            counts[item] = counts.get(item, 0) + quantity
+            taxable[rate] = taxable.get(rate, 0.0) + total - off
+            text.append(f"  {quantity} x {item} @ ${total / quantity:.2f} = ${total:.2f}")
+        for parts, shares in self.combos:
+            times = min(counts.get(item, 0) // count for item, count in parts)
+            if not times:
+                continue
+            for item, count in parts:
+                counts[item] -= count * times
+            for item, rate, share in shares:
+                taxable[rate] -= share * times
+                combo_off += share * times
+        discount = (gross - happy_off - combo_off) * discount_rate
+        tax = sum(amount * (1 - discount_rate) * rate for rate, amount in taxable.items())
+        net = gross - happy_off - combo_off - discount + tax
+        if happy_off:
+            text.append(f"  Happy hour: -${happy_off:.2f}")
+        if combo_off:
+            text.append(f"  Combos: -${combo_off:.2f}")
+        text.append(f"  Total: ${net:.2f}")
+        return {"gross": gross, "happy": happy_off, "combo": combo_off, "discount": discount, "tax": tax,
+                "net": net, "text": "\n".join(text)}
+
+    def bill(self):
+        """The bill of all open orders, with a section per customer."""
+        parts = ["Bill Details:", ""]
+        totals = dict.fromkeys(("gross", "happy", "combo", "discount", "tax", "net"), 0.0)
+        for customer in self.lines:
+            bill = self.customer_bill(customer)
+            parts.append(bill["text"])
+            parts.append("")
+            for key in totals:
+                totals[key] += bill[key]
+        parts.append(f"Subtotal: ${totals['gross']:.2f}")
+        if totals["happy"]:
+            parts.append(f"Happy hour: -${totals['happy']:.2f}")
+        if totals["combo"]:
+            parts.append(f"Combos: -${totals['combo']:.2f}")
+        parts.append(f"Discount: -${totals['discount']:.2f}")
+        parts.append(f"Tax: +${totals['tax']:.2f}")
+        parts.append("")
+        parts.append(f"Grand Total: ${totals['net']:.2f}")
+        return "\n".join(parts) + "\n"
+
+
+class OrderLedger:
+    def __init__(self, store):
+        """
+        Columnar in-memory copy of the order history for reporting. Every column is a typed array and names
+        are interned to ids, so a month of order lines takes a few megabytes. Rows are appended in id order,
+        which keeps creation times sorted and lets a period be found by bisection.
+        """
+        self.store = store
+        self.last_id = 0
+        self.customers, self.customer_ids = [], {}
+        self.items, self.item_ids = [], {}
+        self.customer = array("I")
+        self.item = array("I")
+        self.quantity = array("I")
+        self.total = array("d")
+        self.created = array("d")
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def intern(names, ids, name):
+        number = ids.get(name)
+        if number is None:
+            number = ids[name] = len(names)
+            names.append(name)
+        return number
+
+    def refresh(self):
+        """Append the order lines stored since the last refresh."""
+        with self.store.connect() as connection:
+            cursor = connection.execute(
+                "SELECT id, customer, item, quantity, total, created FROM orders WHERE id > ? ORDER BY id",
+                (self.last_id,))
+            for rows in iter(lambda: cursor.fetchmany(LEDGER_FETCH), []):
+                for _, customer, item, quantity, total, created in rows:
+                    self.customer.append(self.intern(self.customers, self.customer_ids, customer))
+                    self.item.append(self.intern(self.items, self.item_ids, item))
+                    self.quantity.append(quantity)
+                    self.total.append(total)
+                    self.created.append(max(created, self.created[-1]) if self.created else created)
+                self.last_id = rows[-1][0]
+
+    def report(self, since, until):
+        """
+        Aggregate the order lines created in [since, until) by item, hour of day and customer.
+        Discount and tax are applied to the aggregated sums.
+        """
+        with self.lock:
+            self.refresh()
+            start = bisect.bisect_left(self.created, since)
+            end = bisect.bisect_left(self.created, until)
+            item_revenue = [0.0] * len(self.items)
+            item_quantity = [0] * len(self.items)
+            customer_revenue = [0.0] * len(self.customers)
+            hour_revenue = [0.0] * 24
+            hour, hour_end = 0, float("-inf")  # Local hour of the current order and when it ends; created is sorted
+            for item, customer, quantity, total, created in zip(
+                    self.item[start:end], self.customer[start:end], self.quantity[start:end],
+                    self.total[start:end], self.created[start:end]):
+                item_revenue[item] += total
+                item_quantity[item] += quantity
+                customer_revenue[customer] += total
+                if created >= hour_end:
+                    local = time.localtime(created)  # Per hour, so the UTC offset follows DST changes
+                    hour = local.tm_hour
+                    hour_end = int(created) - local.tm_min * 60 - local.tm_sec + 3600
+                hour_revenue[hour] += total
+            items, customers = list(self.items), list(self.customers)
+        gross = sum(item_revenue)
+        by_item = sorted(((name, item_quantity[number], item_revenue[number])
+                          for number, name in enumerate(items) if item_quantity[number]),
+                         key=lambda row: -row[2])
+        by_customer = sorted(((name, customer_revenue[number]) for number, name in enumerate(customers)
+                              if customer_revenue[number]), key=lambda row: -row[1])[:REPORT_TOP]
+        return {"lines": end - start, "gross": gross, "amounts": discount_and_tax(gross), "by_item": by_item,
+                "by_hour": [(hour, revenue) for hour, revenue in enumerate(hour_revenue) if revenue],
+                "by_customer": by_customer}
+
+
+def station_of(item):
+    return stations.get(item, default_station)
+
+
+def group_tickets(rows):
+    """
+    Group (id, customer, item, quantity, ..., created) order lines into (ticket, customer, lines) like
+    OrderStore.service_tickets: consecutive lines are one order when they share customer and creation time.
+    """
+    tickets, previous = [], None
+    for order_id, customer, item, quantity, *_, created in rows:
+        if (created, customer) != previous:
+            tickets.append((order_id, customer, []))
+            previous = (created, customer)
+        tickets[-1][2].append((order_id, item, quantity))
+    return tickets
+
+
+class KitchenScheduler:
+    def __init__(self, estimates, policy=KITCHEN_POLICY, cooks=None):
+        """
+        Kitchen tickets split into one task per station, holding the ticket's lines for that station so they
+        are prepared together. Each station takes its waiting tasks from a heap ordered by the policy; a ticket
+        is complete when all its tasks are. Prep estimates start from the order history and learn from every
+        finished task.
+        :param estimates: {item: (mean prep seconds per unit, samples)}, see OrderStore.prep_estimates.
+        :param policy: Key of POLICIES.
+        :param cooks: {station: tasks prepared at the same time}, 1 where missing.
+        """
+        self.estimates = dict(estimates)
+        self.key = POLICIES[policy]
+        self.cooks = cooks or {}
+        self.queues = {}  # station -> heap of (key, sequence, task)
+        self.cooking = {}  # station -> started tasks
+        self.open_tasks = {}  # ticket -> unfinished tasks
+        self.sequence = itertools.count()
+
+    def estimate(self, item, quantity=1):
+        mean = self.estimates.get(item, (None, 0))[0]
+        unit = station_prep.get(station_of(item), station_prep[default_station]) if mean is None else mean
+        return unit * quantity
+
+    def learn(self, item, quantity, prep):
+        """Fold the prep seconds of an order line into the per-unit estimate of its item."""
+        mean, samples = self.estimates.get(item, (0.0, 0))
+        self.estimates[item] = ((mean * samples + prep / quantity) / (samples + 1), samples + 1)
+
+    def add_ticket(self, ticket, customer, lines, arrival):
+        """
+        Queue the (id, item, quantity) lines of an order.
+        :return: The stations that got a task.
+        """
+        by_station = {}
+        for line in lines:
+            by_station.setdefault(station_of(line[1]), []).append(line)
+        estimates = {station: sum(self.estimate(item, quantity) for _, item, quantity in station_lines)
+                     for station, station_lines in by_station.items()}
+        key = self.key(arrival, max(estimates.values(), default=0))
+        for station, station_lines in by_station.items():
+            task = {"ticket": ticket, "customer": customer, "station": station, "lines": station_lines,
+                    "estimate": estimates[station], "arrival": arrival, "started": None}
+            heapq.heappush(self.queues.setdefault(station, []), (key, next(self.sequence), task))
+        self.open_tasks[ticket] = len(by_station)
+        return list(by_station)
+
+    def start_next(self, station, now):
+        """Start the next waiting task of a station if it has a free cook; returns the task or None."""
+        cooking = self.cooking.setdefault(station, [])
+        waiting = self.queues.get(station)
+        if not waiting or len(cooking) >= self.cooks.get(station, 1):
+            return None
+        task = heapq.heappop(waiting)[2]
+        task["started"] = now
+        cooking.append(task)
+        return task
+
+    def finish(self, task, now):
+        """
+        Finish a started task. Its prep time is apportioned to its lines by their estimates.
+        :return: (prep, ready, id) rows for OrderStore.record_prep, and whether the ticket is complete.
+        """
+        self.cooking[task["station"]].remove(task)
+        prep = now - task["started"]
+        weights = [self.estimate(item, quantity) for _, item, quantity in task["lines"]]
+        total = sum(weights)
+        rows = []
+        for (line_id, item, _), weight in zip(task["lines"], weights):
+            share = prep * weight / total if total else prep / len(weights)
+            rows.append((share, now, line_id))
+        for (_, item, quantity), (share, _, _) in zip(task["lines"], rows):
+            if quantity > 0:
+                self.learn(item, quantity, share)
+        self.open_tasks[task["ticket"]] -= 1
+        done = not self.open_tasks[task["ticket"]]
+        if done:
+            del self.open_tasks[task["ticket"]]
+        return rows, done
+
+    def waiting(self, station):
+        """Waiting tasks of a station in the order they will be served."""
+        return [entry[2] for entry in sorted(self.queues.get(station, []), key=lambda entry: entry[:2])]
+
+    def clear(self):
+        self.queues.clear()
+        self.cooking.clear()
+        self.open_tasks.clear()
+
+
+def simulate(tickets, recorded, estimates, policies, speed=SIMULATION_SPEED, cooks=None):
+    """
+    Replay recorded tickets against one KitchenScheduler per policy in a single event loop, so every policy
+    sees the same arrivals at the same pace. A task takes the recorded prep time of its lines, or the
+    history estimate for lines without one.
+    :param tickets: [(arrival, ticket, customer, lines)] as returned by OrderStore.service_tickets.
+    :param speed: Replay speed relative to the recorded service; 0 replays as fast as possible.
+    :return: {policy: {"tickets", "mean_wait", "p95_wait", "max_wait", "schedule_us"}} with waits in seconds
+        from a ticket's arrival until all its lines are ready.
+    """
+    schedulers = {policy: KitchenScheduler(estimates, policy, cooks) for policy in policies}
+    reference = KitchenScheduler(estimates)
+    waits = {policy: [] for policy in policies}
+    spent = dict.fromkeys(policies, 0.0)
+    sequence = itertools.count()
+    events = [(ticket[0], next(sequence), policy, None, ticket) for ticket in tickets for policy in policies]
+    heapq.heapify(events)
+    first, wall = (tickets[0][0] if tickets else 0), time.perf_counter()
+    while events:
+        now, _, policy, task, ticket = heapq.heappop(events)
+        if speed:
+            delay = wall + (now - first) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        scheduler = schedulers[policy]
+        clock = time.perf_counter()
+        if task is None:
+            arrival, number, customer, lines = ticket
+            affected = scheduler.add_ticket(number, customer, lines, arrival)
+        else:
+            if scheduler.finish(task, now)[1]:
+                waits[policy].append(now - task["arrival"])
+            affected = [task["station"]]
+        started = []
+        for station in affected:
+            for started_task in iter(lambda: scheduler.start_next(station, now), None):
+                started.append(started_task)
+        spent[policy] += time.perf_counter() - clock
+        for started_task in started:
+            duration = sum(recorded.get(line_id, reference.estimate(item, quantity))
+                           for line_id, item, quantity in started_task["lines"])
+            heapq.heappush(events, (now + duration, next(sequence), policy, started_task, None))
+
+    results = {}
+    for policy, samples in waits.items():
+        samples.sort()
+        results[policy] = {
+            "tickets": len(samples),
+            "mean_wait": sum(samples) / len(samples) if samples else 0.0,
+            "p95_wait": samples[max(0, int(round(0.95 * len(samples))) - 1)] if samples else 0.0,
+            "max_wait": samples[-1] if samples else 0.0,
+            "schedule_us": spent[policy] / max(1, len(samples)) * 1e6,
+        }
+    return results
+
+
+def run_simulation(store, day, speed):
+    """Replay the orders of a day (YYYY-MM-DD) under every policy and print how long tickets waited."""
+    since = datetime.strptime(day, "%Y-%m-%d")
+    tickets, recorded = store.service_tickets(since.timestamp(), (since + timedelta(days=1)).timestamp())
+    if not tickets:
+        print(f"No orders recorded on {day}.")
+        return
+    print(f"Replaying {len(tickets)} tickets of {day} at {speed:g}x..." if speed
+          else f"Replaying {len(tickets)} tickets of {day}...")
+    results = simulate(tickets, recorded, store.prep_estimates(), list(POLICIES), speed)
+    print(f"{'Policy':<10}{'Tickets':>8}{'Mean wait':>12}{'p95 wait':>12}{'Max wait':>12}{'us/ticket':>11}")
+    for policy, result in sorted(results.items(), key=lambda entry: entry[1]["mean_wait"]):
+        print(f"{policy:<10}{result['tickets']:>8}{result['mean_wait'] / 60:>10.1f} m"
+              f"{result['p95_wait'] / 60:>10.1f} m{result['max_wait'] / 60:>10.1f} m{result['schedule_us']:>11.1f}")
+
+
+def service_token(path=SERVICE_TOKEN_PATH):
+    """Read the token clients must send to the order service, creating it readable by this user only."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(50):
+            with open(path, encoding="ascii") as file:
+                token = file.read().strip()
+            if token:
+                return token
+            time.sleep(0.01)  # Another process is writing it
+        raise OSError(f"empty service token in {path}")
+    token = secrets.token_hex(32)
+    with os.fdopen(fd, "w", encoding="ascii") as file:
+        file.write(token)
+    return token
+
+
+class OrderService:
+    def __init__(self, store, host=SERVICE_HOST, port=SERVICE_PORT, token=None):
+        """
+        Local order-ingestion service for POS terminals, kitchen displays and RestaurantApp windows.
+        Every message carries "token": the contents of SERVICE_TOKEN_PATH, so only processes of the user
+        running the service can place orders, change prices or reset the day; others get
+        {"type": "error", "error": "unauthorized"}. Clients exchange newline-delimited JSON over TCP:
+            {"type": "order", "id": ..., "customer": ..., "lines": [[item, quantity], ...]}
+                -> {"type": "ack", "id": ..., "rows": [...]} or {"type": "error", "id": ..., "error": ...}
+            {"type": "menu", "item": ..., "price": ...}
+            {"type": "reset"}
+            {"type": "subscribe"} -> pushes {"type": "orders", "rows": [...], "grand_total": ...},
+                {"type": "menu", "item": ..., "price": ...} and {"type": "reset"}
+        Orders from all connections are committed in batches by a single writer task.
+        """
+        self.store = store
+        self.host = host
+        self.port = port
+        self.token = token or service_token()
+        self.pending = None
+        self.subscribers = set()
+
+    async def start(self):
+        """Bind the server and start the committer; raises OSError if the port is taken."""
+        self.pending = asyncio.Queue()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.committer = asyncio.ensure_future(self.commit_batches())
+
+    async def serve(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_in_thread(self):
+        """Run the service on its own event loop thread; raises OSError if the port is taken."""
+        started = queue.Queue()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start())
+            except OSError as e:
+                started.put(e)
+                return
+            started.put(None)
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        error = started.get()
+        if error:
+            raise error
+
+    async def handle(self, reader, writer):
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    self.send(writer, {"type": "error", "error": "malformed message"})
+                    continue
+                token = message.get("token")
+                if not isinstance(token, str) or not hmac.compare_digest(token.encode(), self.token.encode()):
+                    self.send(writer, {"type": "error", "id": message.get("id"), "error": "unauthorized"})
+                    continue
+                if kind == "subscribe":
+                    self.subscribers.add(writer)
+                elif kind == "order":
+                    error = self.validate(message)
+                    if error:
+                        self.send(writer, {"type": "error", "id": message.get("id"), "error": error})
+                        continue
+                    lines = [(item, quantity) for item, quantity in message["lines"]]
+                    await self.pending.put(("order", (message["customer"], lines), (writer, message.get("id"))))
+                elif kind in ("menu", "reset"):
+                    await self.pending.put((kind, message, None))
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def validate(self, message):
+        customer, lines = message.get("customer"), message.get("lines")
+        if not isinstance(customer, str) or not customer.strip() or not isinstance(lines, list) or not lines:
+            return "an order needs a customer and lines"
+        for line in lines:
+            if not isinstance(line, list) or len(line) != 2:
+                return "order lines are [item, quantity] pairs"
+            item, quantity = line
+            if item not in self.store.menu_items:
+                return f"unknown item: {item}"
+            if not isinstance(quantity, int) or quantity <= 0:
+                return f"invalid quantity for {item}"
+        return None
+
+    @staticmethod
+    def send(writer, message):
+        writer.write((json.dumps(message) + "\n").encode())
+
+    def broadcast(self, message):
+        data = (json.dumps(message) + "\n").encode()
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER:
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+    async def commit_batches(self):
+        """Single writer: commit queued orders in batches, then apply menu changes and resets in order."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            while len(batch) < BATCH_SIZE and batch[-1][0] == "order":
+                try:
+                    batch.append(await asyncio.wait_for(self.pending.get(), BATCH_DELAY))
+                except asyncio.TimeoutError:
+                    break
+            orders = [entry for entry in batch if entry[0] == "order"]
+            if orders:
+                await self.commit_orders(loop, orders)
+            kind, message, _ = batch[-1]
+            try:
+                if kind == "menu":
+                    await loop.run_in_executor(None, self.store.set_price, message["item"], float(message["price"]))
+                    self.broadcast({"type": "menu", "item": message["item"], "price": float(message["price"])})
+                elif kind == "reset":
+                    await loop.run_in_executor(None, self.store.reset)
+                    self.broadcast({"type": "reset"})
+            except (sqlite3.Error, KeyError, TypeError, ValueError):
+                pass
+
+    async def commit_orders(self, loop, orders):
+        try:
+            results = await loop.run_in_executor(None, self.store.add_batch, [payload for _, payload, _ in orders])
+        except sqlite3.Error as e:
+            for _, _, (writer, order_id) in orders:
+                if not writer.is_closing():
+                    self.send(writer, {"type": "error", "id": order_id, "error": str(e)})
+            return
+        for (_, _, (writer, order_id)), rows in zip(orders, results):
+            if not writer.is_closing():
+                self.send(writer, {"type": "ack", "id": order_id, "rows": rows})
+        self.broadcast({"type": "orders", "rows": [row for rows in results for row in rows],
+                        "grand_total": self.store.grand_total})
+
+
+class OrderClient:
+    def __init__(self, on_message, host=SERVICE_HOST, port=SERVICE_PORT):
+        """
+        Connection of a RestaurantApp to the order service. Sends are small writes from the Tk thread;
+        pushed messages are read on a background thread and passed to on_message, with
+        {"type": "disconnected"} once the connection is lost. Raises OSError if the service is not running.
+        """
+        self.on_message = on_message
+        self.token = service_token()
+        self.sock = socket.create_connection((host, port), timeout=2)
+        self.sock.settimeout(None)
+        self.lock = threading.Lock()
+        self.send({"type": "subscribe"})
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def send(self, message):
+        with self.lock:
+            self.sock.sendall((json.dumps(dict(message, token=self.token)) + "\n").encode())
+
+    def read(self):
+        try:
+            with self.sock.makefile("r", encoding="utf-8") as file:
+                for line in file:
+                    self.on_message(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self.on_message({"type": "disconnected"})
+
+    def close(self):
+        self.sock.close()
+
+
+class MenuPicker(tk.Frame):
+    def __init__(self, parent, rows=PICKER_ROWS, columns=PICKER_COLUMNS):
+        """
+        Virtualized grid of menu item checkboxes with quantity entries. Only rows x columns cells exist;
+        scrolling rebinds them to other items and selections are kept per item, so a menu of thousands of
+        items costs no more widgets than a screenful.
+        """
+        super().__init__(parent)
+        self.rows = rows
+        self.columns = columns
+        self.items = []  # (item, price) in menu order
+        self.positions = {}
+        self.checked = {}
+        self.quantities = {}
+        self.first_row = 0
+        self.binding = False
+        self.cells = []
+
+        grid = tk.Frame(self)
+        grid.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for index in range(rows * columns):
+            frame = tk.Frame(grid, relief=tk.GROOVE, borderwidth=1)
+            frame.grid(row=index // columns, column=index % columns, padx=5, pady=5, sticky="nsew")
+            checked, quantity = tk.IntVar(), tk.StringVar()
+            check = tk.Checkbutton(frame, variable=checked, font=("Helvetica", 12), anchor="w")
+            check.pack(anchor="w", padx=5, pady=5)
+            entry = tk.Entry(frame, textvariable=quantity, font=("Helvetica", 10))
+            entry.pack(anchor="w", padx=5, pady=2)
+            checked.trace_add("write", lambda *_, index=index: self.store_cell(index))
+            quantity.trace_add("write", lambda *_, index=index: self.store_cell(index))
+            for widget in (frame, check, entry):
+                widget.bind("<MouseWheel>", self.wheel)
+                widget.bind("<Button-4>", self.wheel)
+                widget.bind("<Button-5>", self.wheel)
+            self.cells.append([frame, check, checked, quantity, None])
+        for column in range(columns):
+            grid.columnconfigure(column, weight=1)
+
+    def set_items(self, menu_items):
+        """Add new items and update changed prices; only the visible cells are touched."""
+        changed = False
+        for item, price in menu_items.items():
+            position = self.positions.get(item)
+            if position is None:
+                self.positions[item] = len(self.items)
+                self.items.append((item, price))
+                changed = True
+            elif self.items[position][1] != price:
+                self.items[position] = (item, price)
+                changed = True
+        if changed or not self.items:
+            self.render()
+
+    def render(self):
+        self.binding = True
+        for index, cell in enumerate(self.cells):
+            frame, check, checked, quantity, _ = cell
+            position = self.first_row * self.columns + index
+            if position < len(self.items):
+                item, price = self.items[position]
+                cell[4] = item
+                check.config(text=f"{item} - ${price:.2f}")
+                checked.set(self.checked.get(item, 0))
+                quantity.set(self.quantities.get(item, "1"))
+                frame.grid()
+            else:
+                cell[4] = None
+                frame.grid_remove()
+        self.binding = False
+        total_rows = max(1, -(-len(self.items) // self.columns))
+        self.scrollbar.set(self.first_row / total_rows, min(1.0, (self.first_row + self.rows) / total_rows))
+
+    def store_cell(self, index):
+        _, _, checked, quantity, item = self.cells[index]
+        if self.binding or item is None:
+            return
+        self.checked[item] = checked.get()
+        self.quantities[item] = quantity.get()
+
+    def scroll(self, *args):
+        total_rows = -(-len(self.items) // self.columns)
+        if args[0] == "moveto":
+            first = int(float(args[1]) * total_rows)
+        else:
+            first = self.first_row + int(args[1]) * (self.rows if args[2] == "pages" else 1)
+        self.first_row = max(0, min(first, total_rows - self.rows))
+        self.render()
+
+    def wheel(self, event):
+        self.scroll("scroll", -1 if event.num == 4 or event.delta > 0 else 1, "units")
+
+    def selection(self):
+        """Checked items with their quantity text, in the order they were checked."""
+        return [(item, self.quantities.get(item, "1")) for item, checked in self.checked.items() if checked]
+
+
 class RestaurantApp:
-    def __init__(self, root):
+    def __init__(self, root, store=None):
         self.root = root
         self.root.title("Restaurant Order Management System")
         self.root.geometry("1000x700")
 
+        self.store = store or OrderStore()
+        self.grand_total = self.store.grand_total
+        self.ledger = OrderLedger(self.store)
+        self.pricing = PricingEngine(self.store.menu_items)
+        self.pricing.load(self.store.open_orders())
+        self.kitchen = KitchenScheduler(self.store.prep_estimates())
+        self.kitchen_lists = {}  # station -> Listbox of the kitchen screen
+        rows = self.store.kitchen_lines()
+        created = {row[0]: row[4] for row in rows}
+        for ticket, customer, lines in group_tickets(rows):
+            self.kitchen.add_ticket(ticket, customer, lines, created[ticket])
+        for station in self.kitchen.queues:
+            self.start_station(station)
+
+        # Orders go through the order service; its pushes reach the Tk thread through ui_queue
+        self.ui_queue = queue.Queue()
+        self.client = None
+        self.offline = False  # Whether the local state was loaded for working without the service
+        self.screen = None
+        self.screens = {}  # Screens are built once and kept; updates are applied to them as diffs
+        self.process_ui_queue()
+
         self.active_frame = None
         self.show_main_menu()
+        self.connect_service()
 
-    def show_main_menu(self):
+    def call_in_ui(self, func, *args):
+        """Schedule func(*args) on the Tk thread; safe to call from worker threads."""
+        self.ui_queue.put((func, args))
+
+    def process_ui_queue(self):
+        """Run callbacks posted by worker threads, then reschedule itself."""
+        try:
+            for _ in range(50):
+                func, args = self.ui_queue.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        self.root.after(20, self.process_ui_queue)
+
+    def connect_client(self):
+        self.client = OrderClient(lambda message: self.call_in_ui(self.on_service_message, message))
+
+    def connect_service(self):
+        """
+        Connect to the order service, starting one in this process if none is running.
+        Retries every RECONNECT_DELAY while neither works; orders are written to the store directly meanwhile.
+        The local state is reloaded once when falling back and once after connecting, not on every retry.
+        """
+        try:
+            self.connect_client()
+        except OSError:
+            try:
+                OrderService(OrderStore(self.store.path)).start_in_thread()
+            except OSError:
+                pass  # Another window started it meanwhile
+            try:
+                self.connect_client()
+            except OSError:
+                self.client = None
+                self.root.after(RECONNECT_DELAY, self.connect_service)
+                if self.offline:
+                    return
+        self.offline = self.client is None
+        self.sync_with_store()
+
+    def sync_with_store(self):
+        """Catch up with changes made while no updates were pushed to this window."""
+        self.store.refresh()
+        self.grand_total = self.store.grand_total
+        self.update_menu_views()
+        rows = self.store.open_orders()
+        self.pricing.compile(self.store.menu_items)
+        self.pricing.load(rows)
+        if "orders" in self.screens:
+            self.sync_order_rows(rows)
+            self.update_grand_total()
+
+    def on_service_message(self, message):
+        """Apply an update pushed by the order service."""
+        kind = message["type"]
+        if kind == "orders":
+            self.grand_total = message["grand_total"]
+            if "orders" in self.screens:
+                self.insert_order_rows(message["rows"])
+                self.update_grand_total()
+            self.queue_tickets(message["rows"])
+            self.pricing.add_lines(message["rows"])
+        elif kind == "reset":
+            self.grand_total = 0
+            self.clear_kitchen()
+            self.pricing.clear()
+            if "orders" in self.screens:
+                self.order_tree.delete(*self.order_tree.get_children())
+                self.update_grand_total()
+        elif kind == "menu":
+            self.store.menu_items[message["item"]] = message["price"]
+            self.pricing.compile(self.store.menu_items)
+            self.update_menu_views()
+        elif kind == "error":
+            showerror("Order rejected", message["error"])
+        elif kind == "disconnected":
+            self.client = None
+            self.root.after(RECONNECT_DELAY, self.connect_service)
+
+    def send_to_service(self, message):
+        """Send a message to the order service; returns False when there is no connection."""
+        if not self.client:
+            return False
+        try:
+            self.client.send(message)
+            return True
+        except OSError:
+            self.client.close()
+            self.client = None
+            return False
+
+    def show_cached(self, screen):
+        """Hide the current screen and show screen if it was built before; returns False if it must be built."""
         if self.active_frame:
-            self.active_frame.destroy()
+            self.active_frame.pack_forget()
+        self.screen = screen
+        self.active_frame = self.screens.get(screen)
+        if self.active_frame is None:
+            return False
+        self.active_frame.pack(fill=tk.BOTH, expand=True)
+        return True
+
+    def show_main_menu(self):
+        if self.show_cached("main"):
+            return
 
-        self.active_frame = tk.Frame(self.root)
+        self.active_frame = self.screens["main"] = tk.Frame(self.root)
         self.active_frame.pack(fill=tk.BOTH, expand=True)
 
         header = tk.Label(self.active_frame, text="Welcome to Restaurant Order Management System", font=("Helvetica", 18, "bold"), bg="blue", fg="white")
@@ -44,14 +1026,20 @@ class RestaurantApp:
         order_button = tk.Button(self.active_frame, text="Order Management", font=("Helvetica", 14), command=self.show_order_management)
         order_button.pack(pady=20)
 
+        kitchen_button = tk.Button(self.active_frame, text="Kitchen", font=("Helvetica", 14), command=self.show_kitchen)
+        kitchen_button.pack(pady=20)
+
+        reports_button = tk.Button(self.active_frame, text="Reports", font=("Helvetica", 14), command=self.show_reports)
+        reports_button.pack(pady=20)
+
         footer = tk.Label(self.active_frame, text="AZD", font=("Helvetica", 10, "italic"), bg="blue", fg="white")
         footer.pack(side=tk.BOTTOM, fill=tk.X)
 
     def show_menu_management(self):
-        if self.active_frame:
-            self.active_frame.destroy()
+        if self.show_cached("menu"):
+            return
 
-        self.active_frame = tk.Frame(self.root, bg="lightgray")
+        self.active_frame = self.screens["menu"] = tk.Frame(self.root, bg="lightgray")
         self.active_frame.pack(fill=tk.BOTH, expand=True)
 
         header = tk.Label(self.active_frame, text="Menu Management", font=("Helvetica", 16, "bold"), bg="blue", fg="white")
@@ -60,9 +1048,9 @@ class RestaurantApp:
         tk.Label(self.active_frame, text="Menu Items", font=("Helvetica", 14), bg="lightgray").pack(anchor="w", padx=10)
 
         self.menu_listbox = tk.Listbox(self.active_frame, font=("Helvetica", 12), height=10)
-        for item, price in menu_items.items():
-            self.menu_listbox.insert(tk.END, f"{item} - ${price:.2f}")
+        self.menu_listbox_prices = {}  # item -> (row, price) of the listbox entries
         self.menu_listbox.pack(fill=tk.X, padx=10, pady=5)
+        self.update_menu_views()
 
         tk.Label(self.active_frame, text="New Item Name:", font=("Helvetica", 12), bg="lightgray").pack(anchor="w", padx=10)
         self.new_item_name_entry = tk.Entry(self.active_frame, font=("Helvetica", 12))
@@ -89,15 +1077,34 @@ class RestaurantApp:
         if not item_price.replace('.', '', 1).isdigit():
             return
 
-        menu_items[item_name] = float(item_price)
+        if not self.send_to_service({"type": "menu", "item": item_name, "price": float(item_price)}):
+            self.store.set_price(item_name, float(item_price))
+            self.pricing.compile(self.store.menu_items)
+            self.update_menu_views()
 
         self.show_order_management()
 
+    def update_menu_views(self):
+        """Apply menu changes to the screens that were built, inserting or updating only changed entries."""
+        if "menu" in self.screens:
+            for item, price in self.store.menu_items.items():
+                row, shown = self.menu_listbox_prices.get(item, (None, None))
+                if shown == price:
+                    continue
+                if row is None:
+                    row = self.menu_listbox.size()
+                else:
+                    self.menu_listbox.delete(row)
+                self.menu_listbox.insert(row, f"{item} - ${price:.2f}")
+                self.menu_listbox_prices[item] = (row, price)
+        if "orders" in self.screens:
+            self.menu_picker.set_items(self.store.menu_items)
+
     def show_order_management(self):
-        if self.active_frame:
-            self.active_frame.destroy()
+        if self.show_cached("orders"):
+            return
 
-        self.active_frame = tk.Frame(self.root, bg="white")
+        self.active_frame = self.screens["orders"] = tk.Frame(self.root, bg="white")
         self.active_frame.pack(fill=tk.BOTH, expand=True)
 
         header = tk.Label(self.active_frame, text="Order Management", font=("Helvetica", 16, "bold"), bg="blue", fg="white")
@@ -116,10 +1123,9 @@ class RestaurantApp:
 
         tk.Label(self.active_frame, text="Select Menu Items:", font=("Helvetica", 12)).pack(anchor="w", padx=10, pady=5)
 
-        self.items_frame = tk.Frame(self.active_frame)
-        self.items_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-        self.render_menu_items()
+        self.menu_picker = MenuPicker(self.active_frame)
+        self.menu_picker.pack(fill=tk.X, padx=10, pady=5)
+        self.menu_picker.set_items(self.store.menu_items)
 
         # Footer for billing and grand total
         footer_frame = tk.Frame(self.active_frame, bg="white")
@@ -144,6 +1150,8 @@ class RestaurantApp:
         self.order_tree.heading("Quantity", text="Quantity")
         self.order_tree.heading("Total", text="Total")
         self.order_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.insert_order_rows(self.store.open_orders())
+        self.update_grand_total()
 
         # Billing section
         self.bill_text = tk.Text(self.active_frame, font=("Helvetica", 12), height=10, state="normal", bg="lightyellow")
@@ -151,35 +1159,133 @@ class RestaurantApp:
         self.bill_text.pack(fill=tk.X, padx=10, pady=5)
         self.bill_text.config(state="disabled")
 
-    def render_menu_items(self):
-        for widget in self.items_frame.winfo_children():
-            widget.destroy()
+    def show_kitchen(self):
+        if self.show_cached("kitchen"):
+            return
 
-        num_columns = 5
-        current_row = 0
-        current_column = 0
+        self.active_frame = self.screens["kitchen"] = tk.Frame(self.root, bg="white")
+        self.active_frame.pack(fill=tk.BOTH, expand=True)
+
+        header = tk.Label(self.active_frame, text="Kitchen", font=("Helvetica", 16, "bold"), bg="blue", fg="white")
+        header.pack(fill=tk.X)
 
-        self.menu_item_checkboxes = {}
-        self.menu_item_quantities = {}
+        stations_frame = tk.Frame(self.active_frame, bg="white")
+        stations_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        for column, station in enumerate(dict.fromkeys([*stations.values(), default_station])):
+            station_frame = tk.LabelFrame(stations_frame, text=station.title(), font=("Helvetica", 12, "bold"), bg="white")
+            station_frame.grid(row=0, column=column, sticky="nsew", padx=5)
+            stations_frame.columnconfigure(column, weight=1)
+            self.kitchen_lists[station] = tk.Listbox(station_frame, font=("Helvetica", 11), height=20)
+            self.kitchen_lists[station].pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            ready_button = tk.Button(station_frame, text="Ready", font=("Helvetica", 12),
+                                     command=lambda station=station: self.finish_station(station))
+            ready_button.pack(pady=5)
+            self.show_station(station)
+        stations_frame.rowconfigure(0, weight=1)
 
-        for item, price in menu_items.items():
-            frame = tk.Frame(self.items_frame, relief=tk.GROOVE, borderwidth=1)
-            frame.grid(row=current_row, column=current_column, padx=5, pady=5, sticky="nsew")
+        back_button = tk.Button(self.active_frame, text="Back to Main Menu", font=("Helvetica", 12), command=self.show_main_menu)
+        back_button.pack(pady=5)
+
+    def queue_tickets(self, rows):
+        """Give newly stored (id, customer, item, quantity, total, created) order lines to the kitchen."""
+        now = time.time()
+        for ticket, customer, lines in group_tickets(rows):
+            for station in self.kitchen.add_ticket(ticket, customer, lines, now):
+                self.start_station(station)
+
+    def start_station(self, station):
+        while self.kitchen.start_next(station, time.time()):
+            pass
+        self.show_station(station)
+
+    def finish_station(self, station):
+        """Mark the oldest task being prepared at a station as ready and record its prep time."""
+        cooking = self.kitchen.cooking.get(station)
+        if not cooking:
+            return
+        rows, _ = self.kitchen.finish(cooking[0], time.time())
+        self.store.record_prep(rows)
+        self.start_station(station)
+
+    def clear_kitchen(self):
+        self.kitchen.clear()
+        for station in self.kitchen_lists:
+            self.show_station(station)
+
+    def show_station(self, station):
+        listbox = self.kitchen_lists.get(station)
+        if listbox is None:
+            return
+        listbox.delete(0, tk.END)
+        for prefix, tasks in (("NOW ", self.kitchen.cooking.get(station, [])), ("", self.kitchen.waiting(station))):
+            for task in tasks:
+                items = ", ".join(f"{quantity} {item}" for _, item, quantity in task["lines"])
+                listbox.insert(tk.END, f"{prefix}{task['customer']}: {items} (~{task['estimate'] / 60:.0f} min)")
+
+    def show_reports(self):
+        if self.show_cached("reports"):
+            self.run_report(*self.report_periods()[0])
+            return
+
+        self.active_frame = self.screens["reports"] = tk.Frame(self.root, bg="white")
+        self.active_frame.pack(fill=tk.BOTH, expand=True)
+
+        header = tk.Label(self.active_frame, text="Reports", font=("Helvetica", 16, "bold"), bg="blue", fg="white")
+        header.pack(fill=tk.X)
+
+        period_frame = tk.Frame(self.active_frame, bg="white")
+        period_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        for index, period in enumerate(self.report_periods()):
+            tk.Button(period_frame, text=period[0], font=("Helvetica", 12),
+                      command=lambda index=index: self.run_report(*self.report_periods()[index])
+                      ).pack(side=tk.LEFT, padx=5)
+
+        back_button = tk.Button(period_frame, text="Back to Main Menu", font=("Helvetica", 12), command=self.show_main_menu)
+        back_button.pack(side=tk.RIGHT, padx=5)
 
-            var = tk.IntVar()
-            cb = tk.Checkbutton(frame, text=f"{item} - ${price:.2f}", variable=var, font=("Helvetica", 12), anchor="w")
-            cb.pack(anchor="w", padx=5, pady=5)
-            self.menu_item_checkboxes[item] = var
+        self.report_text = tk.Text(self.active_frame, font=("Courier", 11), state="disabled", bg="lightyellow")
+        self.report_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.run_report(*self.report_periods()[0])
 
-            qty_entry = tk.Entry(frame, font=("Helvetica", 10))
-            qty_entry.insert(0, "1")
-            qty_entry.pack(anchor="w", padx=5, pady=2)
-            self.menu_item_quantities[item] = qty_entry
+    def report_periods(self):
+        """(label, since, until) of the report periods, computed on use since the screen outlives the day."""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return [("End of Day", today, today + timedelta(days=1)),
+                ("Last 7 Days", today - timedelta(days=6), today + timedelta(days=1)),
+                ("This Month", today.replace(day=1), today + timedelta(days=1))]
 
-            current_column += 1
-            if current_column == num_columns:
-                current_column = 0
-                current_row += 1
+    def run_report(self, label, since, until):
+        """Aggregate the ledger on a worker thread; the first report also loads the order history."""
+        self.set_report_text(f"Preparing {label} report...")
+
+        def work():
+            started = time.perf_counter()
+            report = self.ledger.report(since.timestamp(), until.timestamp())
+            self.call_in_ui(self.show_report, label, since, until, report, time.perf_counter() - started)
+
+        Thread(target=work, daemon=True).start()
+
+    def show_report(self, label, since, until, report, seconds):
+        if self.screen != "reports":
+            return
+        discount, tax, net = report["amounts"]
+        lines = [f"{label}: {since:%Y-%m-%d} to {until - timedelta(days=1):%Y-%m-%d}",
+                 f"{report['lines']} order lines, aggregated in {seconds * 1000:.0f} ms", "",
+                 f"Gross revenue: ${report['gross']:.2f}", f"Discount:      -${discount:.2f}",
+                 f"Tax:           +${tax:.2f}", f"Net revenue:   ${net:.2f}", "", "Revenue by item:"]
+        lines.extend(f"  {item:<24} {quantity:>8} x  ${revenue:>12.2f}" for item, quantity, revenue in report["by_item"])
+        lines.extend(["", "Revenue by hour:"])
+        lines.extend(f"  {hour:02d}:00-{hour:02d}:59  ${revenue:>12.2f}" for hour, revenue in report["by_hour"])
+        lines.extend(["", f"Top {REPORT_TOP} customers:"])
+        lines.extend(f"  {customer:<24} ${revenue:>12.2f}" for customer, revenue in report["by_customer"])
+        self.set_report_text("\n".join(lines))
+
+    def set_report_text(self, text):
+        self.report_text.config(state="normal")
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(tk.END, text)
+        self.report_text.config(state="disabled")
 
     def add_order(self):
         """Add a new order based on selected items and quantities."""
@@ -188,31 +1294,48 @@ class RestaurantApp:
         if not customer_name:
             return
 
-        for item, var in self.menu_item_checkboxes.items():
-            if var.get() == 1:
-                quantity = self.menu_item_quantities[item].get().strip()
-                if not quantity.isdigit() or int(quantity) <= 0:
-                    continue
+        lines = []
+        for item, quantity in self.menu_picker.selection():
+            quantity = quantity.strip()
+            if not quantity.isdigit() or int(quantity) <= 0:
+                continue
+            lines.append((item, int(quantity)))
 
-                quantity = int(quantity)
-                total = menu_items[item] * quantity
+        if not lines or self.send_to_service({"type": "order", "customer": customer_name, "lines": lines}):
+            return  # The service pushes the stored rows to every window
+        rows = self.store.add_orders(customer_name, lines)
+        self.insert_order_rows(rows)
+        self.queue_tickets(rows)
+        self.pricing.add_lines(rows)
+        self.grand_total = self.store.grand_total
+        self.update_grand_total()
 
-                orders.append({"customer": customer_name, "item": item, "quantity": quantity, "total": total})
-                self.order_tree.insert("", tk.END, values=(customer_name, item, quantity, f"${total:.2f}"))
+    def insert_order_rows(self, rows):
+        for order_id, customer, item, quantity, total, _ in rows:
+            if not self.order_tree.exists(order_id):
+                self.order_tree.insert("", tk.END, iid=order_id, values=(customer, item, quantity, f"${total:.2f}"))
 
-        self.update_grand_total()
+    def sync_order_rows(self, rows):
+        """Make the order list show exactly rows, removing and inserting only the rows that differ."""
+        wanted = {str(row[0]) for row in rows}
+        stale = [iid for iid in self.order_tree.get_children() if iid not in wanted]
+        if stale:
+            self.order_tree.delete(*stale)
+        self.insert_order_rows(rows)
 
     def update_grand_total(self):
-        """Calculate and display the grand total for all orders."""
-        grand_total = sum(order["total"] for order in orders)
-        self.grand_total_label.config(text=f"Grand Total: ${grand_total:.2f}")
+        """Display the grand total of the open orders, kept as a running total by the store."""
+        self.grand_total_label.config(text=f"Grand Total: ${self.grand_total:.2f}")
 
     def reset_orders(self):
         """Reset all orders and clear the interface for a new session."""
-        global orders
-        orders = []
-        self.order_tree.delete(*self.order_tree.get_children())
-        self.update_grand_total()
+        if not self.send_to_service({"type": "reset"}):
+            self.store.reset()
+            self.grand_total = 0
+            self.clear_kitchen()
+            self.pricing.clear()
+            self.order_tree.delete(*self.order_tree.get_children())
+            self.update_grand_total()
         self.bill_text.config(state="normal")
         self.bill_text.delete(1.0, tk.END)
         self.bill_text.insert(tk.END, "Bill Details will be displayed here\n")
@@ -223,22 +1346,23 @@ class RestaurantApp:
         """Generate the detailed bill for all orders."""
         self.bill_text.config(state="normal")
         self.bill_text.delete(1.0, tk.END)
-        total_cost = sum(order["total"] for order in orders)
-        discount = total_cost * discount_rate
-        tax = (total_cost - discount) * tax_rate
-
-        bill_details = "Bill Details:\n\n"
-        for order in orders:
-            bill_details += f"{order['quantity']} x {order['item']} @ ${menu_items[order['item']]:.2f} = ${order['total']:.2f}\n"
-        bill_details += f"Discount: -${discount:.2f}\n"
-        bill_details += f"Tax: +${tax:.2f}\n\n"
-        bill_details += f"Grand Total: ${total_cost:.2f}\n"
-
-        self.bill_text.insert(tk.END, bill_details)
+        self.bill_text.insert(tk.END, self.pricing.bill())
         self.bill_text.config(state="disabled")
 
 # Run the application
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = RestaurantApp(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Restaurant Order Management System")
+    parser.add_argument("--serve", action="store_true", help="Run only the order service, without a window")
+    parser.add_argument("--simulate", nargs="?", const=datetime.now().strftime("%Y-%m-%d"), metavar="DAY",
+                        help="Replay the orders of a day (YYYY-MM-DD, default today) to compare kitchen policies")
+    parser.add_argument("--speed", type=float, default=SIMULATION_SPEED,
+                        help="Replay speed of --simulate relative to the recorded service; 0 for as fast as possible")
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(OrderService(OrderStore()).serve())
+    elif args.simulate:
+        run_simulation(OrderStore(), args.simulate, args.speed)
+    else:
+        root = tk.Tk()
+        app = RestaurantApp(root)
+        root.mainloop()
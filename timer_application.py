@@ -1,27 +1,538 @@
 import tkinter as tk
 from tkinter import ttk
-import time
+import heapq
+import itertools
+import json
+import math
+import os
+import queue
+import shutil
+import subprocess
+import sys
 import threading
-from datetime import timedelta
-import winsound  # For alarm sound
+import time
+import wave
+from array import array
+
+try:
+    import winsound  # For alarm sound on Windows
+except ImportError:
+    winsound = None
+
+TICK_RESOLUTION = 0.1  # Seconds shown by the display; it is updated exactly when this digit changes
+VISIBLE_TIMERS = 8  # Rows of the timer list; scrolling rebinds them to other timers
+JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".timer_application.jsonl")
+JOURNAL_SYNC_DELAY = 0.5  # Seconds events wait to share one fsync
+JOURNAL_SNAPSHOT_ENTRIES = 10000  # Entries after which the live timers are snapshotted and the journal rolls over
+JOURNAL_KEEP_ENTRIES = 1000  # Entries before a snapshot that the rolled-over journal keeps for the log panel
+LOG_PAGE = 8  # Journal entries shown by the log panel at a time
+UI_POLL_INTERVAL = 0.02  # Seconds between checks for expired timers while no deadline is closer
+if sys.platform == "win32":
+    CACHE_DIR = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+elif sys.platform == "darwin":
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+else:
+    CACHE_DIR = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+ALARM_PATH = os.path.join(CACHE_DIR, "timer_application", "alarm.wav")  # Per user, not in the shared temp dir
+ALARM_BEEPS = 5
+ALARM_TONE = (1000, 0.5, 0.1)  # Frequency in Hz, seconds of tone and seconds of silence of each beep
+ALARM_RATE = 22050  # Samples per second of the rendered alarm
+
+
+def render_alarm(path=ALARM_PATH):
+    """Render the alarm beeps once into a 16-bit mono WAV file that audio backends play from."""
+    frequency, tone, silence = ALARM_TONE
+    fade = int(ALARM_RATE * 0.005)  # Ramps at both ends of a tone avoid clicks
+    beep = array("h")
+    for sample in range(int(ALARM_RATE * tone)):
+        ramp = min(1.0, sample / fade, (int(ALARM_RATE * tone) - sample) / fade)
+        beep.append(int(16000 * ramp * math.sin(2 * math.pi * frequency * sample / ALARM_RATE)))
+    beep.extend([0] * int(ALARM_RATE * silence))
+    if sys.byteorder == "big":
+        beep.byteswap()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with wave.open(temporary, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(ALARM_RATE)
+        file.writeframes(beep.tobytes() * ALARM_BEEPS)
+    os.replace(temporary, path)
+    return path
+
+
+class WinsoundAlarm:
+    def available(self):
+        return winsound is not None
+
+    def play(self, path, on_failure):
+        try:
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+        except RuntimeError:
+            on_failure()
+
+
+class CommandAlarm:
+    def __init__(self, command):
+        """
+        Plays the alarm with a command-line player such as paplay or aplay, which fails without an audio device.
+        Alarms while one is still playing are coalesced into it, so a burst of expiries starts one player.
+        """
+        self.command = command
+        self.process = None
+        self.lock = threading.Lock()
+
+    def available(self):
+        return shutil.which(self.command) is not None
+
+    def play(self, path, on_failure):
+        with self.lock:
+            if self.process is not None and self.process.poll() is None:
+                return
+            try:
+                process = self.process = subprocess.Popen([self.command, path], stdin=subprocess.DEVNULL,
+                                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError:
+                process = None
+        if process is None:
+            on_failure()
+            return
+        threading.Thread(target=lambda: process.wait() and on_failure(), daemon=True).start()
+
+
+class BellAlarm:
+    def available(self):
+        return sys.stderr is not None and sys.stderr.isatty()
+
+    def play(self, path, on_failure):
+        sys.stderr.write("\a")
+        sys.stderr.flush()
+
+
+class SilentAlarm:
+    def available(self):
+        return True
+
+    def play(self, path, on_failure):
+        pass  # Expiry is in the log already
+
+
+class Alarm:
+    def __init__(self, backends=None):
+        """
+        Plays the alarm without blocking the caller, on the first available backend. The waveform is rendered
+        once, on first use, and each play only starts the backend. A backend that fails when playing, e.g. for
+        lack of an audio device, is dropped and the alarm falls back to the next one, ending at SilentAlarm.
+        :param backends: Backends in order of preference; by default the platform's players, then the terminal bell.
+        """
+        if backends is None:
+            backends = [WinsoundAlarm(), CommandAlarm("paplay"), CommandAlarm("aplay"), CommandAlarm("afplay"),
+                        BellAlarm()]
+        self.backends = [backend for backend in backends if backend.available()] + [SilentAlarm()]
+        self.path = None
+        self.lock = threading.Lock()
+
+    def play(self):
+        with self.lock:
+            backend = self.backends[0]
+            if self.path is None and not isinstance(backend, (BellAlarm, SilentAlarm)):
+                try:
+                    self.path = render_alarm()
+                except OSError:
+                    self.backends = [backend for backend in self.backends
+                                     if isinstance(backend, (BellAlarm, SilentAlarm))]
+                    backend = self.backends[0]
+        backend.play(self.path, lambda: self.failed(backend))
+
+    def failed(self, backend):
+        """Drop a backend that could not play and play on the next one; may be called from any thread."""
+        with self.lock:
+            if backend not in self.backends[:-1]:
+                return
+            self.backends.remove(backend)
+        self.play()
+
+
+class TimerJournal:
+    def __init__(self, path=JOURNAL_PATH):
+        """
+        Append-only JSON-lines journal of timer events and log messages. Appends are written immediately and
+        synced to disk by a background thread at most every JOURNAL_SYNC_DELAY, so a burst of events costs one
+        fsync. The byte offset of every entry is indexed so the log can be read a page at a time.
+        A "snapshot" entry holds all live timers; once it is synced the journal is rewritten to start
+        JOURNAL_KEEP_ENTRIES before it, so neither the file nor the replay on startup grows without bound.
+        Entries are numbered from the first one loaded; self.first is the number of the oldest one still kept.
+        """
+        self.path = path
+        self.offsets = array("Q")
+        self.first = 0
+        self.snapshot_at = 0  # Number of the newest snapshot entry
+        self.rollover = None  # Number of the entry the next sync rolls the journal over to
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.closing = threading.Event()
+        self.file = open(path, "ab+")
+        self.size = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def load(self):
+        """
+        Index the journal and return its entries. An unreadable last line was torn by a crash and is cut off;
+        an unreadable line before it is skipped, so the entries after it still count.
+        """
+        entries = []
+        with self.lock:
+            end = os.fstat(self.file.fileno()).st_size
+            self.file.seek(0)
+            for line in self.file:
+                entry = parse_entry(line) if line.endswith(b"\n") else None
+                if entry is None and self.size + len(line) >= end:
+                    break
+                if entry is not None:
+                    if entry.get("event") == "snapshot":
+                        self.snapshot_at = len(self.offsets)
+                    self.offsets.append(self.size)
+                    entries.append(entry)
+                self.size += len(line)
+            self.file.truncate(self.size)
+        return entries
+
+    def needs_snapshot(self):
+        return len(self) - self.snapshot_at >= JOURNAL_SNAPSHOT_ENTRIES
+
+    def append(self, entry):
+        data = (json.dumps(entry) + "\n").encode()
+        with self.lock:
+            if entry.get("event") == "snapshot":
+                self.snapshot_at = self.first + len(self.offsets)
+                self.rollover = max(self.first, self.snapshot_at - JOURNAL_KEEP_ENTRIES)
+            self.offsets.append(self.size)
+            self.file.write(data)
+            self.file.flush()
+            self.size += len(data)
+        self.dirty.set()
+
+    def read(self, first, count):
+        """Entries first to first + count - 1, of those still kept."""
+        with self.lock:
+            first = max(0, first - self.first)
+            if first >= len(self.offsets):
+                return []
+            start = self.offsets[first]
+            end = self.offsets[first + count] if first + count < len(self.offsets) else self.size
+            self.file.seek(start)
+            data = self.file.read(end - start)
+        return [entry for entry in map(parse_entry, data.splitlines()) if entry is not None]
+
+    def __len__(self):
+        with self.lock:
+            return self.first + len(self.offsets)
+
+    def run(self):
+        while True:
+            self.dirty.wait()
+            self.closing.wait(JOURNAL_SYNC_DELAY)  # Let a burst of appends share the sync
+            self.dirty.clear()
+            with self.lock:
+                fd = os.dup(self.file.fileno())  # Appends go on while the sync waits for the disk
+                rollover, self.rollover = self.rollover, None
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            if rollover is not None:
+                try:
+                    self.roll_over(rollover)
+                except OSError:
+                    pass  # The journal keeps all entries until the next snapshot
+            if self.closing.is_set():
+                return
+
+    def roll_over(self, first):
+        """
+        Replace the journal by the entries from number first on. The copy is written and synced beside the
+        journal without holding the lock; only entries appended meanwhile are copied under it before the rename.
+        """
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with self.lock:
+            start, copied = self.offsets[first - self.first], self.size
+            self.file.seek(start)
+            data = self.file.read(copied - start)
+        try:
+            with open(temporary, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            with self.lock:
+                self.file.seek(copied)
+                tail = self.file.read(self.size - copied)
+                with open(temporary, "ab") as file:
+                    file.write(tail)
+                self.file.close()
+                try:
+                    os.replace(temporary, self.path)
+                finally:
+                    self.file = open(self.path, "ab+")
+                self.offsets = array("Q", (offset - start for offset in self.offsets[first - self.first:]))
+                self.size -= start
+                self.first = first
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        if tail:
+            self.dirty.set()  # Synced with the next batch
+
+    def close(self):
+        self.closing.set()
+        self.dirty.set()
+        self.thread.join()
+        self.file.close()
+
+
+def parse_entry(line):
+    """A journal entry, or None for a line that is not one."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def replay(entries):
+    """
+    Fold journal entries into the timers they describe; a snapshot replaces everything before it.
+    :return: {name: {"duration", "deadline", "remaining", "state"}} with deadlines as time.time() values.
+    """
+    timers = {}
+    for entry in entries:
+        name, event = entry.get("name"), entry.get("event")
+        if event == "snapshot":
+            timers = {name: dict(timer) for name, timer in entry["timers"].items()}
+        elif event == "start":
+            timers[name] = {"duration": entry["duration"], "deadline": entry["deadline"],
+                            "remaining": entry["duration"], "state": "running"}
+        elif name not in timers:
+            continue
+        elif event == "resume":
+            timers[name].update(deadline=entry["deadline"], state="running")
+        elif event == "pause":
+            timers[name].update(deadline=None, remaining=entry["remaining"], state="paused")
+        elif event == "expire":
+            timers[name].update(deadline=None, remaining=0.0, state="done")
+        elif event == "reset":
+            del timers[name]
+    return timers
+
+
+class TimerScheduler:
+    def __init__(self, on_expire):
+        """
+        Countdowns of any number of named timers on a single thread. Running timers are kept in a min-heap of
+        time.monotonic() deadlines and the thread sleeps until the earliest one, so starting, pausing and
+        cancelling are O(log n) and waiting timers cost no CPU. Paused and cancelled timers leave their heap
+        entries behind; those are skipped when they surface and dropped once they outnumber the running ones.
+        :param on_expire: Called with the name of an expired timer on the scheduler thread; must not block.
+        """
+        self.on_expire = on_expire
+        self.timers = {}  # name -> {"name", "duration", "deadline", "remaining", "state"}
+        self.heap = []  # (deadline, sequence, name)
+        self.running = 0
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def start(self, name, duration, remaining=None, state="running"):
+        """Start a timer, replacing any timer of the same name; remaining and state restore a saved timer."""
+        with self.condition:
+            self.remove(name)
+            timer = self.timers[name] = {"name": name, "duration": duration, "deadline": None,
+                                         "remaining": duration if remaining is None else remaining,
+                                         "state": "paused" if state == "running" else state}
+            if state == "running":
+                self.resume_timer(timer)
+
+    def resume(self, name):
+        with self.condition:
+            timer = self.timers.get(name)
+            if timer and timer["state"] == "paused":
+                self.resume_timer(timer)
+
+    def resume_timer(self, timer):
+        timer["deadline"] = time.monotonic() + timer["remaining"]
+        timer["state"] = "running"
+        self.running += 1
+        sequence = next(self.sequence)
+        heapq.heappush(self.heap, (timer["deadline"], sequence, timer["name"]))
+        if self.heap[0][1] == sequence:
+            self.condition.notify()  # The scheduler thread sleeps until a later deadline
+
+    def pause(self, name):
+        with self.condition:
+            timer = self.timers.get(name)
+            if timer and timer["state"] == "running":
+                timer["remaining"] = max(0.0, timer["deadline"] - time.monotonic())
+                timer["deadline"] = None
+                timer["state"] = "paused"
+                self.running -= 1
+                self.compact()
+
+    def cancel(self, name):
+        with self.condition:
+            self.remove(name)
+
+    def remove(self, name):
+        timer = self.timers.pop(name, None)
+        if timer and timer["state"] == "running":
+            self.running -= 1
+            self.compact()
+
+    def valid(self, entry):
+        timer = self.timers.get(entry[2])
+        return timer is not None and timer["state"] == "running" and timer["deadline"] == entry[0]
+
+    def compact(self):
+        if len(self.heap) > 2 * self.running + 64:
+            self.heap = [entry for entry in self.heap if self.valid(entry)]
+            heapq.heapify(self.heap)
+
+    def run(self):
+        with self.condition:
+            while not self.closed:
+                now = time.monotonic()
+                while self.heap and (self.heap[0][0] <= now or not self.valid(self.heap[0])):
+                    entry = heapq.heappop(self.heap)
+                    if self.valid(entry):
+                        timer = self.timers[entry[2]]
+                        timer["remaining"] = 0.0
+                        timer["deadline"] = None
+                        timer["state"] = "done"
+                        self.running -= 1
+                        self.on_expire(timer["name"])
+                self.condition.wait(self.heap[0][0] - now if self.heap else None)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def snapshot(self):
+        """All timers as replay() returns them, with deadlines converted to time.time() values."""
+        with self.condition:
+            offset = time.time() - time.monotonic()
+            return {name: {"duration": timer["duration"],
+                           "deadline": timer["deadline"] + offset if timer["state"] == "running" else None,
+                           "remaining": timer["remaining"], "state": timer["state"]}
+                    for name, timer in self.timers.items()}
+
+    def next_deadline(self):
+        """time.monotonic() of the earliest heap entry, or None; may be a paused timer's, which only costs a wakeup."""
+        with self.condition:
+            return self.heap[0][0] if self.heap else None
+
+    def remaining(self, name):
+        """(Seconds left, state) of a timer, or (0, None) if there is no such timer."""
+        with self.condition:
+            timer = self.timers.get(name)
+            if timer is None:
+                return 0.0, None
+            if timer["state"] == "running":
+                return max(0.0, timer["deadline"] - time.monotonic()), "running"
+            return timer["remaining"], timer["state"]
+
+    def page(self, first, count):
+        """(Number of timers, [(name, seconds left, state)] of count timers from the first) in start order."""
+        with self.condition:
+            now = time.monotonic()
+            return len(self.timers), [
+                (timer["name"], max(0.0, timer["deadline"] - now) if timer["state"] == "running"
+                 else timer["remaining"], timer["state"])
+                for timer in itertools.islice(self.timers.values(), first, first + count)]
+
+
+class TimerList(tk.Frame):
+    def __init__(self, parent, on_select, on_scroll, rows=VISIBLE_TIMERS):
+        """
+        Virtualized list of timers: a fixed number of row labels rebound to other timers when scrolling, so
+        thousands of timers cost no more widgets or redraws than a screenful.
+        """
+        super().__init__(parent, bg="#1F1F1F")
+        self.rows = rows
+        self.first = 0
+        self.total = 0
+        self.on_scroll = on_scroll
+        self.names = [None] * rows
+        self.labels = []
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        for index in range(rows):
+            label = tk.Label(self, anchor="w", font=("Consolas", 12), fg="#FFFFFF", bg="#2B2B2B")
+            label.pack(fill="x")
+            label.bind("<Button-1>", lambda event, index=index: self.names[index] and on_select(self.names[index]))
+            label.bind("<MouseWheel>", self.wheel)
+            label.bind("<Button-4>", self.wheel)
+            label.bind("<Button-5>", self.wheel)
+            self.labels.append(label)
+
+    def show(self, total, rows, selected, format_time):
+        """Bind the row labels to (name, seconds left, state) rows starting at self.first."""
+        self.total = total
+        for index, label in enumerate(self.labels):
+            if index < len(rows):
+                name, remaining, state = rows[index]
+                self.names[index] = name
+                label.config(text=f"{name:<30.30} {format_time(remaining):>12}  {state}",
+                             bg="#444444" if name == selected else "#2B2B2B")
+            else:
+                self.names[index] = None
+                label.config(text="", bg="#2B2B2B")
+        self.scrollbar.set(self.first / max(1, total), min(1.0, (self.first + self.rows) / max(1, total)))
+
+    def scroll(self, *args):
+        if args[0] == "moveto":
+            first = int(float(args[1]) * self.total)
+        else:
+            first = self.first + int(args[1]) * (self.rows if args[2] == "pages" else 1)
+        self.first = max(0, min(first, self.total - self.rows))
+        self.on_scroll()
+
+    def wheel(self, event):
+        self.scroll("scroll", -1 if event.num == 4 or event.delta > 0 else 1, "units")
+
 
 # Define the TimerApplication class
 class TimerApplication(tk.Tk):
-    def __init__(self):
+    def __init__(self, journal_path=JOURNAL_PATH):
         super().__init__()
 
         # Configure the main window
         self.title("Advanced Timer Application")
-        self.geometry("700x650")
+        self.geometry("700x850")
         self.configure(bg="#1F1F1F")
 
         # Initialize variables
-        self.timer_running = False
-        self.remaining_time = 0
-        self.timer_thread = None
+        self.selected = None  # Name of the timer shown in the display
+        self.after_id = None
+        self.timer_count = 0
+
+        # Timers expire on the scheduler thread; expiries reach the Tk thread through ui_queue
+        self.ui_queue = queue.Queue()
+        self.scheduler = TimerScheduler(lambda name: self.ui_queue.put(name))
+        self.alarm = Alarm()
+
+        # Timer events are journaled so timers and the log survive restarts; the log panel shows a page of it
+        self.journal = TimerJournal(journal_path)
+        self.log_first = None  # First journal entry shown, None to follow the newest
 
         # Create GUI components
         self.create_widgets()
+        self.restore_timers(self.journal.load())
+        self.process_ui_queue()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def create_widgets(self):
         # Title label
@@ -32,9 +543,9 @@ class TimerApplication(tk.Tk):
 
         # Timer display
         self.timer_display = tk.Label(
-            self, text="00:00:00", font=("Helvetica", 60, "bold"), fg="#00FFFF", bg="#1F1F1F"
+            self, text="0:00:00.0", font=("Helvetica", 60, "bold"), fg="#00FFFF", bg="#1F1F1F"
         )
-        self.timer_display.pack(pady=20)
+        self.timer_display.pack(pady=10)
 
         # Advanced time entry section
         self.time_entry_label = tk.Label(
@@ -45,21 +556,24 @@ class TimerApplication(tk.Tk):
         entry_frame = tk.Frame(self, bg="#1F1F1F")
         entry_frame.pack(pady=10)
 
+        self.name_entry = ttk.Entry(entry_frame, width=20, font=("Helvetica", 14))
+        self.name_entry.grid(row=0, column=0, padx=10)
+
         self.hour_entry = ttk.Entry(entry_frame, width=5, font=("Helvetica", 14), justify="center")
         self.hour_entry.insert(0, "00")
-        self.hour_entry.grid(row=0, column=0, padx=5)
+        self.hour_entry.grid(row=0, column=1, padx=5)
 
-        tk.Label(entry_frame, text=":", font=("Helvetica", 16), fg="#FFFFFF", bg="#1F1F1F").grid(row=0, column=1)
+        tk.Label(entry_frame, text=":", font=("Helvetica", 16), fg="#FFFFFF", bg="#1F1F1F").grid(row=0, column=2)
 
         self.minute_entry = ttk.Entry(entry_frame, width=5, font=("Helvetica", 14), justify="center")
         self.minute_entry.insert(0, "00")
-        self.minute_entry.grid(row=0, column=2, padx=5)
+        self.minute_entry.grid(row=0, column=3, padx=5)
 
-        tk.Label(entry_frame, text=":", font=("Helvetica", 16), fg="#FFFFFF", bg="#1F1F1F").grid(row=0, column=3)
+        tk.Label(entry_frame, text=":", font=("Helvetica", 16), fg="#FFFFFF", bg="#1F1F1F").grid(row=0, column=4)
 
         self.second_entry = ttk.Entry(entry_frame, width=5, font=("Helvetica", 14), justify="center")
         self.second_entry.insert(0, "00")
-        self.second_entry.grid(row=0, column=4, padx=5)
+        self.second_entry.grid(row=0, column=5, padx=5)
 
         # Control buttons
         button_frame = tk.Frame(self, bg="#1F1F1F")
@@ -74,9 +588,20 @@ class TimerApplication(tk.Tk):
         self.reset_button = ttk.Button(button_frame, text="Reset", command=self.reset_timer)
         self.reset_button.grid(row=0, column=2, padx=10)
 
+        # Active timers
+        self.timer_list = TimerList(self, self.select_timer, self.refresh_timers)
+        self.timer_list.pack(fill="x", padx=20, pady=10)
+
         # Log panel
-        self.log_panel = tk.Text(self, height=10, width=60, state="disabled", bg="#2B2B2B", fg="#FFFFFF", font=("Consolas", 12))
-        self.log_panel.pack(pady=15)
+        self.log_panel = tk.Text(self, height=LOG_PAGE, width=60, state="disabled", bg="#2B2B2B", fg="#FFFFFF", font=("Consolas", 12))
+        self.log_panel.pack(pady=(15, 5))
+
+        log_frame = tk.Frame(self, bg="#1F1F1F")
+        log_frame.pack()
+        ttk.Button(log_frame, text="Older", command=lambda: self.page_log(-LOG_PAGE)).grid(row=0, column=0, padx=5)
+        self.log_position = tk.Label(log_frame, font=("Helvetica", 10), fg="#AAAAAA", bg="#1F1F1F")
+        self.log_position.grid(row=0, column=1, padx=5)
+        ttk.Button(log_frame, text="Newer", command=lambda: self.page_log(LOG_PAGE)).grid(row=0, column=2, padx=5)
 
         # Footer
         self.footer_label = tk.Label(
@@ -84,79 +609,179 @@ class TimerApplication(tk.Tk):
         )
         self.footer_label.pack(side="bottom", pady=5)
 
-    def log_message(self, message):
-        """Logs a message to the log panel."""
+    def log_message(self, message, **event):
+        """Logs a message, with the timer event it describes, to the journal shown by the log panel."""
+        self.journal.append({"time": time.time(), "message": message, **event})
+        if self.journal.needs_snapshot():
+            timers = self.scheduler.snapshot()
+            self.journal.append({"time": time.time(), "message": f"Saved {len(timers)} timers.", "event": "snapshot",
+                                 "timers": timers})
+        if self.log_first is None:
+            self.show_log()
+
+    def page_log(self, offset):
+        """Moves the log panel offset entries through the journal; paging past the newest follows it."""
+        last = max(self.journal.first, len(self.journal) - LOG_PAGE)
+        first = (last if self.log_first is None else self.log_first) + offset
+        self.log_first = max(self.journal.first, first) if first < last else None
+        self.show_log()
+
+    def show_log(self):
+        count = len(self.journal)
+        first = max(self.journal.first, count - LOG_PAGE if self.log_first is None else self.log_first)
+        lines = [f"{time.strftime('%H:%M:%S', time.localtime(entry['time']))} {entry['message']}"
+                 for entry in self.journal.read(first, LOG_PAGE)]
         self.log_panel.config(state="normal")
-        self.log_panel.insert("end", message + "\n")
-        self.log_panel.see("end")
+        self.log_panel.delete("1.0", "end")
+        self.log_panel.insert("end", "\n".join(lines))
         self.log_panel.config(state="disabled")
+        self.log_position.config(text=f"{first + 1 if count else 0}-{first + len(lines)} of {count}")
+
+    def restore_timers(self, entries):
+        """Restarts the journaled timers from their absolute deadlines."""
+        now = time.time()
+        for name, timer in replay(entries).items():
+            if timer["state"] == "running" and timer["deadline"] <= now:
+                self.scheduler.start(name, timer["duration"], 0.0, "done")
+                self.log_message(f"Time is up: {name}! (while closed)", event="expire", name=name)
+            elif timer["state"] == "running":
+                self.scheduler.start(name, timer["duration"], timer["deadline"] - now)
+            else:
+                self.scheduler.start(name, timer["duration"], timer["remaining"], timer["state"])
+            if name.startswith("Timer ") and name[6:].isdigit():
+                self.timer_count = max(self.timer_count, int(name[6:]))
+        self.show_log()
+        self.restart_tick()
 
     def format_time(self, seconds):
-        """Formats seconds into HH:MM:SS."""
-        return str(timedelta(seconds=seconds))
+        """Formats seconds into H:MM:SS.t, rounding up so the display reaches zero at the deadline."""
+        tenths = math.ceil(round(seconds * 10, 6))
+        return f"{tenths // 36000}:{tenths // 600 % 60:02d}:{tenths // 10 % 60:02d}.{tenths % 10}"
+
+    def process_ui_queue(self):
+        """
+        Handles timers expired on the scheduler thread, then reschedules itself: every UI_POLL_INTERVAL, or at
+        the next deadline when that is sooner, so an expiry is handled within a millisecond of its deadline.
+        """
+        try:
+            while True:
+                name = self.ui_queue.get_nowait()
+                self.log_message(f"Time is up: {name}!", event="expire", name=name)
+                self.trigger_alarm()
+                self.restart_tick()
+        except queue.Empty:
+            pass
+        delay = UI_POLL_INTERVAL
+        deadline = self.scheduler.next_deadline()
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline - time.monotonic()))
+        self.after(max(1, math.ceil(delay * 1000)), self.process_ui_queue)
+
+    def select_timer(self, name):
+        """Shows a timer in the display and puts its name in the entry so the buttons act on it."""
+        self.selected = name
+        self.name_entry.delete(0, "end")
+        self.name_entry.insert(0, name)
+        self.restart_tick()
 
     def start_timer(self):
-        """Starts the timer."""
-        if self.timer_running:
-            self.log_message("Timer is already running.")
+        """Starts the named timer, or resumes it if it is paused."""
+        name = self.name_entry.get().strip()
+        _, state = self.scheduler.remaining(name)
+        if state == "running":
+            self.log_message(f"{name} is already running.")
+            return
+        if state == "paused":
+            self.scheduler.resume(name)
+            self.log_message(f"{name} resumed.", event="resume", name=name,
+                             deadline=time.time() + self.scheduler.remaining(name)[0])
+            self.select_timer(name)
             return
 
         try:
             hours = int(self.hour_entry.get())
             minutes = int(self.minute_entry.get())
-            seconds = int(self.second_entry.get())
-            self.remaining_time = hours * 3600 + minutes * 60 + seconds
+            seconds = float(self.second_entry.get())
+            duration = hours * 3600 + minutes * 60 + seconds
+            if not math.isfinite(duration):
+                raise ValueError(f"not a finite duration: {duration}")
         except ValueError:
             self.log_message("Invalid time input. Please enter valid numbers.")
             return
 
-        if self.remaining_time <= 0:
+        if duration <= 0:
             self.log_message("Please set a time greater than 0.")
             return
 
-        self.timer_running = True
-        self.timer_thread = threading.Thread(target=self.run_timer)
-        self.timer_thread.daemon = True  # Daemon thread stops when the main program exits
-        self.timer_thread.start()
-        self.log_message(f"Timer started: {self.format_time(self.remaining_time)}")
+        if not name:
+            self.timer_count += 1
+            name = f"Timer {self.timer_count}"
+        self.scheduler.start(name, duration)
+        self.log_message(f"{name} started: {self.format_time(duration)}", event="start", name=name,
+                         duration=duration, deadline=time.time() + duration)
+        self.select_timer(name)
 
     def run_timer(self):
-        """Runs the timer in a separate thread."""
-        while self.timer_running and self.remaining_time > 0:
-            time.sleep(1)
-            self.remaining_time -= 1
-            self.update_timer_display()
-
-        if self.remaining_time == 0:
-            self.timer_running = False
-            self.log_message("Time is up!")
-            self.trigger_alarm()
-
-    def update_timer_display(self):
+        """
+        Redraws the display and the visible timers on the Tk thread. Each redraw is scheduled for the moment the
+        selected timer's display changes next, so late callbacks never accumulate into drift; expiry itself is
+        timed by the scheduler thread. Redrawing stops while no timer runs.
+        """
+        self.after_id = None
+        remaining, state = self.scheduler.remaining(self.selected)
+        self.update_timer_display(remaining)
+        self.refresh_timers()
+        if not self.scheduler.running:
+            return
+        delay = state == "running" and remaining % TICK_RESOLUTION or TICK_RESOLUTION
+        self.after_id = self.after(max(1, math.ceil(delay * 1000)), self.run_timer)
+
+    def restart_tick(self):
+        if self.after_id is not None:
+            self.after_cancel(self.after_id)
+        self.run_timer()
+
+    def refresh_timers(self):
+        total, rows = self.scheduler.page(self.timer_list.first, self.timer_list.rows)
+        self.timer_list.show(total, rows, self.selected, self.format_time)
+
+    def update_timer_display(self, remaining):
         """Updates the timer display in the GUI."""
-        formatted_time = self.format_time(self.remaining_time)
+        formatted_time = self.format_time(remaining)
         self.timer_display.config(text=formatted_time)
 
     def trigger_alarm(self):
-        """Triggers an alarm when the timer reaches zero."""
-        for _ in range(5):  # Beep 5 times
-            winsound.Beep(1000, 500)  # 1000 Hz frequency, 500 ms duration
+        """Triggers an alarm when the timer reaches zero; returns at once while it plays."""
+        self.alarm.play()
 
     def pause_timer(self):
-        """Pauses the timer."""
-        if not self.timer_running:
+        """Pauses the named timer."""
+        name = self.name_entry.get().strip()
+        if self.scheduler.remaining(name)[1] != "running":
             self.log_message("Timer is not running.")
             return
 
-        self.timer_running = False
-        self.log_message("Timer paused.")
+        self.scheduler.pause(name)
+        self.log_message(f"{name} paused.", event="pause", name=name, remaining=self.scheduler.remaining(name)[0])
+        self.restart_tick()
 
     def reset_timer(self):
-        """Resets the timer."""
-        self.timer_running = False
-        self.remaining_time = 0
-        self.update_timer_display()
-        self.log_message("Timer reset.")
+        """Resets the named timer and removes it from the list."""
+        name = self.name_entry.get().strip()
+        if self.scheduler.remaining(name)[1] is None:
+            self.log_message("No such timer.")
+            return
+
+        self.scheduler.cancel(name)
+        if name == self.selected:
+            self.selected = None
+        self.log_message(f"{name} reset.", event="reset", name=name)
+        self.restart_tick()
+
+    def on_close(self):
+        self.scheduler.close()
+        self.journal.close()
+        self.destroy()
 
 # Run the application
 if __name__ == "__main__":